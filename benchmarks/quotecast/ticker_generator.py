@@ -0,0 +1,154 @@
+import random
+from datetime import datetime, timedelta
+
+from orjson import dumps
+
+from degiro_connector.quotecast.models.ticker import Ticker
+
+BASE_METRIC_NAME_LIST = ["LastDate", "LastTime", "LastPrice", "LastVolume"]
+PRODUCT_ID_START = 360000000
+
+
+class TickerGenerator:
+    """Generate synthetic quotecast payloads.
+
+    The first `Ticker` registers all the metrics with their initial value,
+    the following ones only update a fraction of them.
+
+    Example :
+        ticker_generator = TickerGenerator(product_count=1000, depth=10)
+        ticker_registration = ticker_generator.build_registration()
+        ticker_update_list = ticker_generator.build_update_list(count=100)
+    """
+
+    @staticmethod
+    def build_metric_name_list(depth: int) -> list[str]:
+        """Metrics of a product with `depth` levels of order book.
+
+        Example with depth=1 :
+            LastDate, LastTime, LastPrice, LastVolume,
+            A1Price, A1Volume, A1Orders, B1Price, B1Volume, B1Orders
+        """
+
+        if not 0 <= depth <= 10:
+            raise ValueError(f"`depth` must be between 0 and 10 : {depth}")
+
+        return BASE_METRIC_NAME_LIST + [
+            f"{side}{level}{field}"
+            for side in ["A", "B"]
+            for level in range(1, depth + 1)
+            for field in ["Price", "Volume", "Orders"]
+        ]
+
+    def __init__(
+        self,
+        product_count: int,
+        depth: int = 0,
+        sparsity: float = 0.1,
+        seed: int | None = 0,
+    ):
+        """
+        Args:
+            product_count (int):
+                Amount of products subscribed.
+            depth (int, optional):
+                Levels of order book subscribed for each product, from 0
+                to 10.
+                Defaults to 0.
+            sparsity (float, optional):
+                Fraction of the metrics updated by each `Ticker`.
+                Defaults to 0.1.
+            seed (int, optional):
+                Seed of the random values.
+                Defaults to 0.
+        """
+
+        if not 0 < sparsity <= 1:
+            raise ValueError(f"`sparsity` must be in ]0, 1] : {sparsity}")
+
+        self.__depth = depth
+        self.__metric_name_list = self.build_metric_name_list(depth=depth)
+        self.__product_count = product_count
+        self.__random = random.Random(seed)
+        self.__response_datetime = datetime(2024, 1, 5, 9, 0, 0)
+        self.__sparsity = sparsity
+        self.__reference_list = [
+            (str(PRODUCT_ID_START + index), metric_name)
+            for index in range(product_count)
+            for metric_name in self.__metric_name_list
+        ]
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    @property
+    def metric_count(self) -> int:
+        """Amount of metrics subscribed."""
+
+        return len(self.__reference_list)
+
+    @property
+    def product_count(self) -> int:
+        return self.__product_count
+
+    @property
+    def sparsity(self) -> float:
+        return self.__sparsity
+
+    @property
+    def update_size(self) -> int:
+        """Amount of metrics inside each update."""
+
+        return max(1, int(len(self.__reference_list) * self.__sparsity))
+
+    def build_message(self, reference: int, metric_name: str) -> dict:
+        rand = self.__random
+        response_datetime = self.__response_datetime
+
+        if metric_name == "LastDate":
+            return {"m": "us", "v": [reference, response_datetime.strftime("%Y-%m-%d")]}
+        elif metric_name == "LastTime":
+            return {"m": "us", "v": [reference, response_datetime.strftime("%H:%M:%S")]}
+        elif metric_name.endswith("Price"):
+            return {"m": "un", "v": [reference, round(rand.uniform(1, 500), 4)]}
+        else:
+            return {"m": "un", "v": [reference, rand.randint(1, 10000)]}
+
+    def build_ticker(self, message_list: list[dict]) -> Ticker:
+        self.__response_datetime += timedelta(seconds=1)
+
+        return Ticker(
+            json_text=dumps(message_list).decode(),
+            response_datetime=self.__response_datetime,
+            request_duration=timedelta(milliseconds=self.__random.randint(1, 2000)),
+        )
+
+    def build_registration(self) -> Ticker:
+        message_list = []
+
+        for index, (product_id, metric_name) in enumerate(self.__reference_list):
+            reference = index + 1
+            message_list.append(
+                {"m": "a_req", "v": [f"{product_id}.{metric_name}", reference]}
+            )
+            message_list.append(
+                self.build_message(reference=reference, metric_name=metric_name)
+            )
+
+        return self.build_ticker(message_list=message_list)
+
+    def build_update(self) -> Ticker:
+        reference_list = self.__reference_list
+        index_list = sorted(
+            self.__random.sample(range(len(reference_list)), k=self.update_size)
+        )
+        message_list = [
+            self.build_message(reference=index + 1, metric_name=reference_list[index][1])
+            for index in index_list
+        ]
+
+        return self.build_ticker(message_list=message_list)
+
+    def build_update_list(self, count: int) -> list[Ticker]:
+        return [self.build_update() for _ in range(count)]
@@ -0,0 +1,480 @@
+"""Benchmark of the quotecast parsing pipeline.
+
+Each stage of the pipeline is timed on synthetic payloads, see
+`TickerGenerator`. For each scenario and stage it reports :
+    * throughput : metrics processed per second
+    * latency percentiles : p50, p90, p99 of a single call
+    * peak memory : allocated during a single call, using tracemalloc
+      (memory allocated by polars outside of Python is not traced)
+
+Usage (from the root of the repository) :
+    # RUN THE DEFAULT SCENARIOS
+    python -m benchmarks.quotecast.ticker_pipeline
+
+    # CUSTOM SCENARIOS
+    python -m benchmarks.quotecast.ticker_pipeline \\
+        --product-count 10 100 10000 --depth 0 10 --sparsity 0.01 1.0
+
+    # STORE THE BASELINE
+    python -m benchmarks.quotecast.ticker_pipeline --save
+
+    # COMPARE WITH THE BASELINE, EXITS WITH 1 IF A STAGE REGRESSED
+    python -m benchmarks.quotecast.ticker_pipeline --compare
+
+It runs offline : no credentials nor network are required.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import polars as pl
+
+from benchmarks.quotecast.ticker_generator import TickerGenerator
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.order_book import OrderBook
+from degiro_connector.quotecast.tools.ticker_to_df import (
+    TickerToDF,
+    TickerToDFIncremental,
+)
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_DEPTH_LIST = [0, 10]
+DEFAULT_PRODUCT_COUNT_LIST = [10, 100, 1000]
+DEFAULT_SPARSITY_LIST = [0.1]
+DEFAULT_TOLERANCE = 0.25
+
+# A stage is built from the generator and returns :
+#   * the function to benchmark, called once per update
+#   * the amount of metrics processed by each call
+Stage = Callable[[TickerGenerator, list[Ticker]], tuple[Callable[[int], object], int]]
+
+
+def build_parse(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_metric_list = TickerToMetricList()
+    ticker_to_metric_list.parse(ticker=ticker_generator.build_registration())
+
+    return (
+        lambda index: ticker_to_metric_list.parse(ticker=ticker_list[index]),
+        ticker_generator.update_size,
+    )
+
+
+def build_parse_batch(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_metric_list = TickerToMetricList()
+    ticker_to_metric_list.parse_batch(ticker=ticker_generator.build_registration())
+
+    return (
+        lambda index: ticker_to_metric_list.parse_batch(ticker=ticker_list[index]),
+        ticker_generator.update_size,
+    )
+
+
+def build_parse_code_batch(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_metric_list = TickerToMetricList()
+    ticker_to_metric_list.parse_code_batch(
+        ticker=ticker_generator.build_registration()
+    )
+
+    return (
+        lambda index: ticker_to_metric_list.parse_code_batch(
+            ticker=ticker_list[index]
+        ),
+        ticker_generator.update_size,
+    )
+
+
+def build_merge_metric_list(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_metric_list = TickerToMetricList()
+    current_data = ticker_to_metric_list.parse(
+        ticker=ticker_generator.build_registration()
+    )
+    new_data_list = [
+        ticker_to_metric_list.parse(ticker=ticker) for ticker in ticker_list
+    ]
+
+    return (
+        lambda index: TickerToDF.merge_metric_list(
+            current_data=current_data,
+            new_data=new_data_list[index],
+        ),
+        ticker_generator.metric_count,
+    )
+
+
+def build_build_df(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    metric_list = TickerToMetricList().parse(
+        ticker=ticker_generator.build_registration()
+    )
+
+    return (
+        lambda index: TickerToDF.build_df(metric_list=metric_list),
+        ticker_generator.metric_count,
+    )
+
+
+def build_add_column(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+    column: str,
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_df = TickerToDF()
+    ticker_to_metric_list = TickerToMetricList()
+    registration = ticker_generator.build_registration()
+    df = TickerToDF.build_df(
+        metric_list=ticker_to_metric_list.parse(ticker=registration)
+    )
+    last_metric_list_list = [
+        ticker_to_metric_list.parse(ticker=ticker) for ticker in ticker_list
+    ]
+    add_column = getattr(ticker_to_df, f"add_{column}_column")
+
+    return (
+        lambda index: add_column(
+            df=df,
+            last_metric_list=last_metric_list_list[index],
+            ticker=ticker_list[index],
+        ),
+        ticker_generator.product_count,
+    )
+
+
+def build_add_request_duration_column(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    return build_add_column(
+        ticker_generator=ticker_generator,
+        ticker_list=ticker_list,
+        column="request_duration",
+    )
+
+
+def build_add_response_datetime_column(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    return build_add_column(
+        ticker_generator=ticker_generator,
+        ticker_list=ticker_list,
+        column="response_datetime",
+    )
+
+
+def build_ticker_to_df(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_df = TickerToDF()
+    ticker_to_df.parse(ticker=ticker_generator.build_registration())
+
+    return (
+        lambda index: ticker_to_df.parse(ticker=ticker_list[index]),
+        ticker_generator.update_size,
+    )
+
+
+def build_ticker_to_df_incremental(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    ticker_to_df = TickerToDFIncremental()
+    ticker_to_df.parse(ticker=ticker_generator.build_registration())
+
+    def run(index: int) -> pl.DataFrame | None:
+        ticker_to_df.parse(ticker=ticker_list[index])
+        return ticker_to_df.build_df()
+
+    return run, ticker_generator.update_size
+
+
+def build_order_book(
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+) -> tuple[Callable[[int], object], int]:
+    order_book = OrderBook()
+    order_book.parse(ticker=ticker_generator.build_registration())
+
+    def run(index: int) -> pl.DataFrame:
+        order_book.parse(ticker=ticker_list[index])
+        return order_book.build_df()
+
+    return run, ticker_generator.update_size
+
+
+STAGE_MAP: dict[str, Stage] = {
+    "TickerToMetricList.parse": build_parse,
+    "TickerToMetricList.parse_batch": build_parse_batch,
+    "TickerToMetricList.parse_code_batch": build_parse_code_batch,
+    "TickerToDF.merge_metric_list": build_merge_metric_list,
+    "TickerToDF.build_df": build_build_df,
+    "TickerToDF.add_request_duration_column": build_add_request_duration_column,
+    "TickerToDF.add_response_datetime_column": build_add_response_datetime_column,
+    "TickerToDF.parse": build_ticker_to_df,
+    "TickerToDFIncremental.parse+build_df": build_ticker_to_df_incremental,
+    "OrderBook.parse+build_df": build_order_book,
+}
+
+
+def percentile(sorted_list: list[float], fraction: float) -> float:
+    index = min(len(sorted_list) - 1, int(round(fraction * (len(sorted_list) - 1))))
+
+    return sorted_list[index]
+
+
+def run_stage(
+    stage: Stage,
+    ticker_generator: TickerGenerator,
+    ticker_list: list[Ticker],
+    max_time: float,
+) -> dict:
+    """Time a stage on each update, then measure its peak memory.
+
+    The calls stop once `max_time` seconds are spent, at least one call is
+    done.
+    """
+
+    run, metric_count = stage(ticker_generator, ticker_list)
+    duration_list = []
+    start = time.perf_counter()
+
+    gc.collect()
+    for index in range(len(ticker_list)):
+        call_start = time.perf_counter_ns()
+        run(index)
+        duration_list.append((time.perf_counter_ns() - call_start) / 1e9)
+
+        if time.perf_counter() - start > max_time:
+            break
+
+    tracemalloc.start()
+    run(0)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    duration_list.sort()
+    total = sum(duration_list)
+
+    return {
+        "call_count": len(duration_list),
+        "metric_count": metric_count,
+        "throughput": metric_count * len(duration_list) / total if total else None,
+        "p50_ms": percentile(duration_list, 0.50) * 1e3,
+        "p90_ms": percentile(duration_list, 0.90) * 1e3,
+        "p99_ms": percentile(duration_list, 0.99) * 1e3,
+        "peak_kib": peak / 1024,
+    }
+
+
+def build_scenario_name(product_count: int, depth: int, sparsity: float) -> str:
+    return f"products={product_count} depth={depth} sparsity={sparsity}"
+
+
+def run(
+    product_count_list: list[int],
+    depth_list: list[int],
+    sparsity_list: list[float],
+    stage_name_list: list[str],
+    update_count: int,
+    max_time: float,
+) -> dict[str, dict[str, dict]]:
+    result_map: dict[str, dict[str, dict]] = {}
+
+    for product_count, depth, sparsity in itertools.product(
+        product_count_list,
+        depth_list,
+        sparsity_list,
+    ):
+        ticker_generator = TickerGenerator(
+            product_count=product_count,
+            depth=depth,
+            sparsity=sparsity,
+        )
+        ticker_list = ticker_generator.build_update_list(count=update_count)
+        scenario_name = build_scenario_name(
+            product_count=product_count,
+            depth=depth,
+            sparsity=sparsity,
+        )
+        scenario_map = result_map.setdefault(scenario_name, {})
+
+        for stage_name in stage_name_list:
+            scenario_map[stage_name] = result = run_stage(
+                stage=STAGE_MAP[stage_name],
+                ticker_generator=ticker_generator,
+                ticker_list=ticker_list,
+                max_time=max_time,
+            )
+            print_result(
+                scenario_name=scenario_name,
+                stage_name=stage_name,
+                result=result,
+            )
+
+    return result_map
+
+
+def print_result(scenario_name: str, stage_name: str, result: dict) -> None:
+    throughput = result["throughput"]
+    throughput_text = "-" if throughput is None else f"{throughput:,.0f}"
+
+    print(
+        f"{scenario_name:<40} {stage_name:<42} "
+        f"{throughput_text:>14} metrics/s "
+        f"p50={result['p50_ms']:9.3f}ms "
+        f"p90={result['p90_ms']:9.3f}ms "
+        f"p99={result['p99_ms']:9.3f}ms "
+        f"peak={result['peak_kib']:10.1f}KiB"
+    )
+
+
+def compare(
+    result_map: dict[str, dict[str, dict]],
+    baseline_map: dict[str, dict[str, dict]],
+    tolerance: float,
+) -> list[str]:
+    """Compare the median latencies against the baseline.
+
+    Returns:
+        list[str]: Description of each stage slower than the tolerance.
+    """
+
+    regression_list = []
+
+    for scenario_name, scenario_map in result_map.items():
+        for stage_name, result in scenario_map.items():
+            baseline = baseline_map.get(scenario_name, {}).get(stage_name)
+
+            if baseline is None or not baseline["p50_ms"]:
+                continue
+
+            ratio = result["p50_ms"] / baseline["p50_ms"]
+            print(f"{scenario_name:<40} {stage_name:<42} x{ratio:.2f}")
+
+            if ratio > 1 + tolerance:
+                regression_list.append(
+                    f"{scenario_name} {stage_name} : "
+                    f"{baseline['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms"
+                )
+
+    return regression_list
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--product-count",
+        default=DEFAULT_PRODUCT_COUNT_LIST,
+        nargs="+",
+        type=int,
+    )
+    parser.add_argument("--depth", default=DEFAULT_DEPTH_LIST, nargs="+", type=int)
+    parser.add_argument(
+        "--sparsity",
+        default=DEFAULT_SPARSITY_LIST,
+        nargs="+",
+        type=float,
+    )
+    parser.add_argument(
+        "--stage",
+        choices=list(STAGE_MAP),
+        default=list(STAGE_MAP),
+        nargs="+",
+    )
+    parser.add_argument(
+        "--update-count",
+        default=50,
+        help="Amount of updates generated per scenario.",
+        type=int,
+    )
+    parser.add_argument(
+        "--max-time",
+        default=2.0,
+        help="Seconds spent at most on each stage of each scenario.",
+        type=float,
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, type=Path)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Store the results as the new baseline.",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare the results with the baseline.",
+    )
+    parser.add_argument("--tolerance", default=DEFAULT_TOLERANCE, type=float)
+
+    return parser
+
+
+def main(argument_list: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argument_list)
+
+    result_map = run(
+        product_count_list=args.product_count,
+        depth_list=args.depth,
+        sparsity_list=args.sparsity,
+        stage_name_list=args.stage,
+        update_count=args.update_count,
+        max_time=args.max_time,
+    )
+
+    if args.save:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "machine": platform.platform(),
+                    "python": platform.python_version(),
+                    "polars": pl.__version__,
+                    "result_map": result_map,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baseline stored : {args.baseline}")
+
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())
+        regression_list = compare(
+            result_map=result_map,
+            baseline_map=baseline["result_map"],
+            tolerance=args.tolerance,
+        )
+
+        for regression in regression_list:
+            print(f"REGRESSION : {regression}")
+
+        if regression_list:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -83,9 +83,113 @@ class MetricType(str, Enum):
     AbsoluteDifference = "AbsoluteDifference"
 
 
+# CODE OF EACH `MetricType` : ITS POSITION IN THE ENUM
+METRIC_TYPE_LIST: list[MetricType] = list(MetricType)
+METRIC_CODE_MAP: dict[MetricType, int] = {
+    metric_type: code for code, metric_type in enumerate(METRIC_TYPE_LIST)
+}
+
+
 class Metric(BaseModel):
     """Depicts one metric from a specific product: price, volume, ask, bid..."""
 
     metric_type: MetricType
     product_id: str
     value: str | float
+
+
+class MetricBatch:
+    """Metrics stored as parallel lists : no object is built per metric.
+
+    The metric at position `i` is made of :
+        * product_id_list[i]
+        * metric_type_list[i]
+        * value_list[i]
+    """
+
+    __slots__ = ("product_id_list", "metric_type_list", "value_list")
+
+    product_id_list: list[str]
+    metric_type_list: list[MetricType]
+    value_list: list[str | float]
+
+    def __init__(
+        self,
+        product_id_list: list[str] | None = None,
+        metric_type_list: list[MetricType] | None = None,
+        value_list: list[str | float] | None = None,
+    ):
+        self.product_id_list = product_id_list or []
+        self.metric_type_list = metric_type_list or []
+        self.value_list = value_list or []
+
+    def __len__(self) -> int:
+        return len(self.value_list)
+
+    def __repr__(self) -> str:
+        return f"MetricBatch(size={len(self)})"
+
+    @classmethod
+    def from_metric_list(cls, metric_list: list[Metric]) -> "MetricBatch":
+        return cls(
+            product_id_list=[metric.product_id for metric in metric_list],
+            metric_type_list=[metric.metric_type for metric in metric_list],
+            value_list=[metric.value for metric in metric_list],
+        )
+
+    def to_metric_list(self) -> list[Metric]:
+        return [
+            Metric(product_id=product_id, metric_type=metric_type, value=value)
+            for product_id, metric_type, value in zip(
+                self.product_id_list,
+                self.metric_type_list,
+                self.value_list,
+            )
+        ]
+
+
+class MetricCodeBatch:
+    """Metrics stored as parallel lists of integer codes.
+
+    The metric at position `i` is made of :
+        * product_code_list[i] : code from an `Interner` of product ids
+        * metric_code_list[i] : position inside `METRIC_TYPE_LIST`
+        * value_list[i]
+    """
+
+    __slots__ = ("product_code_list", "metric_code_list", "value_list")
+
+    product_code_list: list[int]
+    metric_code_list: list[int]
+    value_list: list[str | float]
+
+    def __init__(
+        self,
+        product_code_list: list[int] | None = None,
+        metric_code_list: list[int] | None = None,
+        value_list: list[str | float] | None = None,
+    ):
+        self.product_code_list = product_code_list or []
+        self.metric_code_list = metric_code_list or []
+        self.value_list = value_list or []
+
+    def __len__(self) -> int:
+        return len(self.value_list)
+
+    def __repr__(self) -> str:
+        return f"MetricCodeBatch(size={len(self)})"
+
+    def to_metric_batch(self, product_id_list: list[str]) -> MetricBatch:
+        """Decode the codes.
+        Args:
+            product_id_list (list[str]):
+                Product id of each code, see `Interner.name_list`.
+        Returns:
+            MetricBatch: Same metrics, with names instead of codes.
+        """
+
+        return MetricBatch(
+            product_id_list=[product_id_list[code] for code in self.product_code_list],
+            metric_type_list=[METRIC_TYPE_LIST[code] for code in self.metric_code_list],
+            value_list=list(self.value_list),
+        )
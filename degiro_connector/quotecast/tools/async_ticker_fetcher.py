@@ -0,0 +1,258 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from orjson import loads
+
+from degiro_connector.core.constants.urls import (
+    QUOTECAST,
+    QUOTECAST_VERSION,
+)
+from degiro_connector.core.constants.headers import HEADERS as HEADER_MAP
+from degiro_connector.quotecast.models.ticker import Ticker, TickerRequest
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
+from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
+
+
+class AsyncTickerFetcher:
+    """Asyncio version of `TickerFetcher`.
+
+    Same protocol than `TickerFetcher` : the long-poll requests are
+    awaited instead of blocking a thread. A single `httpx.AsyncClient`
+    can be shared between many quotecast sessions.
+    """
+
+    QUOTECAST_TIMEOUT = 15
+
+    @staticmethod
+    def build_logger() -> logging.Logger:
+        return logging.getLogger(__name__)
+
+    @classmethod
+    def build_client(
+        cls,
+        headers: dict | None = None,
+        timeout: float | None = None,
+    ) -> httpx.AsyncClient:
+        """Setup a "httpx.AsyncClient" object.
+        Args:
+            headers (dict, optional):
+                Headers to used for the Client.
+                Defaults to None.
+            timeout (float, optional):
+                Timeout of the requests in seconds, it must be greater than
+                the heartbeat period of the long-poll.
+                Defaults to None.
+
+        Returns:
+            httpx.AsyncClient:
+                Client object with the right headers.
+        """
+
+        if not isinstance(headers, dict):
+            headers = HEADER_MAP
+
+        if timeout is None:
+            timeout = cls.QUOTECAST_TIMEOUT
+
+        return httpx.AsyncClient(headers=headers, timeout=timeout)
+
+    @classmethod
+    async def get_session_id(
+        cls,
+        user_token: int,
+        client: httpx.AsyncClient,
+        logger: logging.Logger | None = None,
+        quotecast_url: str | None = None,
+    ) -> str | None:
+        """Retrieves the "session_id" necessary to access the data-stream.
+        Args:
+            user_token (int):
+                User identifier in Degiro's API.
+            client (httpx.AsyncClient):
+                Client used to send the request.
+            logger (logging.Logger, optional):
+                This object will be generated if None.
+                Defaults to None.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
+        Returns:
+            str: Session id
+        """
+
+        if quotecast_url is None:
+            quotecast_url = QUOTECAST
+
+        if logger is None:
+            logger = cls.build_logger()
+
+        url = f"{quotecast_url}/request_session"
+        parameters = {"version": QUOTECAST_VERSION, "userToken": user_token}
+        data = '{"referrer":"https://trader.degiro.nl"}'
+
+        try:
+            response = await client.post(url=url, content=data, params=parameters)
+            response_dict = loads(response.text)
+        except Exception as e:
+            logger.fatal(e)
+            return None
+
+        logger.info("get_session_id:response_dict: %s", response_dict)
+
+        if "sessionId" in response_dict:
+            return response_dict["sessionId"]
+        else:
+            return None
+
+    @classmethod
+    async def fetch_ticker(
+        cls,
+        session_id: str,
+        client: httpx.AsyncClient,
+        logger: logging.Logger | None = None,
+        raise_exception: bool = False,
+        quotecast_url: str | None = None,
+        latency_recorder: LatencyRecorder | None = None,
+    ) -> Ticker | None:
+        """Fetches data from the feed.
+        Args:
+            session_id (str):
+                API's session id.
+            client (httpx.AsyncClient):
+                Client used to send the request.
+            logger (logging.Logger, optional):
+                This object will be generated if None.
+                Defaults to None.
+            raise_exception (bool, optional):
+                Whether or not the BrokenPipeError is raised instead of
+                being logged.
+                Defaults to False.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
+            latency_recorder (LatencyRecorder, optional):
+                Records the "network" and "decode" stages.
+                Defaults to None.
+        Raises:
+            BrokenPipeError:
+                A new "session_id" is required.
+        Returns:
+            Ticker | None:
+                json_text : raw JSON data string.
+                response_datetime : reception timestamp.
+                request_duration : request duration.
+        """
+
+        if quotecast_url is None:
+            quotecast_url = QUOTECAST
+
+        if logger is None:
+            logger = cls.build_logger()
+
+        url = f"{quotecast_url}/{session_id}"
+        start_ns = time.perf_counter_ns()
+
+        try:
+            response = await client.get(url=url)
+            duration_ns = time.perf_counter_ns() - start_ns
+            json_text = response.text
+
+            if latency_recorder is not None:
+                latency_recorder.record(stage="network", duration_ns=duration_ns)
+                latency_recorder.record(
+                    stage="decode",
+                    duration_ns=time.perf_counter_ns() - start_ns - duration_ns,
+                )
+
+            if json_text == '[{"m":"sr"}]':
+                raise BrokenPipeError('A new "session_id" is required.')
+
+            ticker = Ticker(
+                json_text=json_text,
+                response_datetime=datetime.now(),
+                request_duration=timedelta(microseconds=duration_ns // 1000),
+            )
+        except BrokenPipeError as e:
+            logger.fatal(e)
+            if raise_exception is True:
+                raise
+            return None
+        except httpx.HTTPStatusError as e:
+            logger.fatal(e)
+            logger.fatal(e.response.text)
+            return None
+        except Exception as e:
+            logger.fatal(e)
+            return None
+
+        return ticker
+
+    @classmethod
+    async def subscribe(
+        cls,
+        ticker_request: TickerRequest,
+        session_id: str,
+        client: httpx.AsyncClient,
+        logger: logging.Logger | None = None,
+        raise_exception: bool = False,
+        quotecast_url: str | None = None,
+    ) -> bool | None:
+        """Adds/removes metric from the data-stream.
+        Args:
+            ticker_request (TickerRequest):
+                list of subscriptions & unsubscriptions to do.
+            session_id (str):
+                API's session id.
+            client (httpx.AsyncClient):
+                Client used to send the request.
+            logger (logging.Logger, optional):
+                This object will be generated if None.
+                Defaults to None.
+            raise_exception (bool, optional):
+                Whether or not the BrokenPipeError is raised instead of
+                being logged.
+                Defaults to False.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
+        Raises:
+            BrokenPipeError:
+                A new "session_id" is required.
+        Returns:
+            bool:
+                Whether or not the subscription succeeded.
+        """
+
+        if quotecast_url is None:
+            quotecast_url = QUOTECAST
+
+        if logger is None:
+            logger = cls.build_logger()
+
+        url = f"{quotecast_url}/{session_id}"
+        data = TickerFetcher.build_ticker_request_payload(ticker_request=ticker_request)
+
+        logger.info("subscribe:data %s", data[:100])
+
+        try:
+            response = await client.post(url=url, content=data)
+            response.raise_for_status()
+
+            if response.text == '[{"m":"sr"}]':
+                raise BrokenPipeError('A new "session_id" is required.')
+
+            return True
+        except BrokenPipeError as e:
+            logger.fatal(e)
+            if raise_exception is True:
+                raise
+            return None
+        except httpx.HTTPStatusError as e:
+            logger.fatal(e)
+            logger.fatal(e.response.text)
+            return None
+        except Exception as e:
+            logger.fatal(e)
+            return None
@@ -0,0 +1,302 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import numpy as np
+import polars as pl
+
+from degiro_connector.quotecast.models.metric import Metric, MetricBatch, MetricType
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class BarBuilder:
+    """Build OHLCV bars incrementally from `LastPrice` and `LastVolume`.
+
+    The bars in progress are stored inside preallocated `numpy` arrays,
+    one row per product : each tick only updates its row. When a `Ticker`
+    starts a new interval, the completed bars of all the products are
+    emitted at once as a DataFrame.
+
+    Example :
+        bar_builder = BarBuilder(
+            interval_list=[timedelta(minutes=1), timedelta(minutes=5)],
+        )
+
+        while True:
+            ticker = ticker_session.fetch_ticker()
+            for interval, df in bar_builder.parse(ticker=ticker).items():
+                print(interval, df)
+
+    The time of a tick is the reception time of its `Ticker`. Each
+    `LastVolume` update is added to the volume of the bar.
+
+    This class requires the package `numpy`.
+    """
+
+    DEFAULT_CAPACITY = 64
+    DEFAULT_INTERVAL = timedelta(minutes=1)
+
+    @staticmethod
+    def build_bucket(timestamp: datetime, interval: timedelta) -> int:
+        """Index of the interval containing `timestamp`, since 1970-01-01."""
+
+        return (timestamp.replace(tzinfo=None) - EPOCH) // interval
+
+    def __init__(
+        self,
+        interval_list: list[timedelta] | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+        callback: Callable[[timedelta, pl.DataFrame], Any] | None = None,
+    ):
+        """
+        Args:
+            interval_list (list[timedelta], optional):
+                Duration of the bars.
+                Defaults to None : one minute.
+            capacity (int, optional):
+                Amount of products preallocated, it doubles when needed.
+                Defaults to 64.
+            callback (Callable[[timedelta, pl.DataFrame], Any], optional):
+                Called with each DataFrame of completed bars.
+                Defaults to None.
+        """
+
+        interval_list = interval_list or [self.DEFAULT_INTERVAL]
+        capacity = max(capacity, 1)
+        shape = (len(interval_list), capacity)
+
+        self.__bucket_list: list[int | None] = [None] * len(interval_list)
+        self.__callback = callback
+        self.__capacity = capacity
+        self.__close = np.full(shape, np.nan)
+        self.__high = np.full(shape, np.nan)
+        self.__interval_list = interval_list
+        self.__low = np.full(shape, np.nan)
+        self.__open = np.full(shape, np.nan)
+        self.__product_id_list: list[str] = []
+        self.__row_map: dict[str, int] = {}
+        self.__tick_count = np.zeros(shape, dtype=np.int64)
+        self.__ticker_to_metric_list = TickerToMetricList()
+        self.__volume = np.zeros(shape, dtype=np.float64)
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def interval_list(self) -> list[timedelta]:
+        return self.__interval_list
+
+    @property
+    def product_id_list(self) -> list[str]:
+        return self.__product_id_list
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    def grow(self) -> None:
+        capacity = self.__capacity
+
+        def extend(array: np.ndarray, fill_value: float) -> np.ndarray:
+            padding = np.full((array.shape[0], capacity), fill_value, array.dtype)
+            return np.concatenate([array, padding], axis=1)
+
+        self.__open = extend(self.__open, np.nan)
+        self.__high = extend(self.__high, np.nan)
+        self.__low = extend(self.__low, np.nan)
+        self.__close = extend(self.__close, np.nan)
+        self.__volume = extend(self.__volume, 0)
+        self.__tick_count = extend(self.__tick_count, 0)
+        self.__capacity = capacity * 2
+
+    def get_row(self, product_id: str) -> int:
+        row_map = self.__row_map
+        row = row_map.get(product_id)
+
+        if row is None:
+            row = len(row_map)
+            if row >= self.__capacity:
+                self.grow()
+            row_map[product_id] = row
+            self.__product_id_list.append(product_id)
+
+        return row
+
+    def build_df(self, index: int) -> pl.DataFrame:
+        """Bars in progress of the interval at position `index`.
+
+        Only the products with at least one price or volume are included.
+        """
+
+        row_count = len(self.__row_map)
+        interval = self.__interval_list[index]
+        bucket = self.__bucket_list[index]
+        tick_count = self.__tick_count[index, :row_count]
+        (row_array,) = np.nonzero(
+            (tick_count > 0) | (self.__volume[index, :row_count] > 0)
+        )
+        start = None if bucket is None else EPOCH + bucket * interval
+
+        return pl.DataFrame(
+            {
+                "product_id": [self.__product_id_list[row] for row in row_array],
+                "start": pl.Series([start] * len(row_array), dtype=pl.Datetime),
+                "open": self.__open[index, row_array],
+                "high": self.__high[index, row_array],
+                "low": self.__low[index, row_array],
+                "close": self.__close[index, row_array],
+                "volume": self.__volume[index, row_array],
+                "tick_count": tick_count[row_array],
+            },
+            nan_to_null=True,
+        )
+
+    def reset(self, index: int) -> None:
+        self.__open[index].fill(np.nan)
+        self.__high[index].fill(np.nan)
+        self.__low[index].fill(np.nan)
+        self.__close[index].fill(np.nan)
+        self.__volume[index].fill(0)
+        self.__tick_count[index].fill(0)
+
+    def roll(self, timestamp: datetime) -> dict[timedelta, pl.DataFrame]:
+        """Complete the bars of the intervals which ended before `timestamp`.
+
+        Returns:
+            dict[timedelta, pl.DataFrame]: Completed bars of each interval.
+        """
+
+        bucket_list = self.__bucket_list
+        callback = self.__callback
+        completed_map = {}
+
+        for index, interval in enumerate(self.__interval_list):
+            bucket = self.build_bucket(timestamp=timestamp, interval=interval)
+            current_bucket = bucket_list[index]
+
+            if current_bucket is None or bucket > current_bucket:
+                if current_bucket is not None:
+                    df = self.build_df(index=index)
+                    if not df.is_empty():
+                        completed_map[interval] = df
+                        if callback is not None:
+                            callback(interval, df)
+                    self.reset(index=index)
+                bucket_list[index] = bucket
+
+        return completed_map
+
+    def flush(self) -> dict[timedelta, pl.DataFrame]:
+        """Complete all the bars in progress, for instance at market close."""
+
+        callback = self.__callback
+        completed_map = {}
+
+        for index, interval in enumerate(self.__interval_list):
+            df = self.build_df(index=index)
+            if not df.is_empty():
+                completed_map[interval] = df
+                if callback is not None:
+                    callback(interval, df)
+            self.reset(index=index)
+
+        return completed_map
+
+    def update(
+        self,
+        metric_list: list[Metric],
+        timestamp: datetime,
+    ) -> dict[timedelta, pl.DataFrame]:
+        return self.update_batch(
+            metric_batch=MetricBatch.from_metric_list(metric_list=metric_list),
+            timestamp=timestamp,
+        )
+
+    def update_batch(
+        self,
+        metric_batch: MetricBatch,
+        timestamp: datetime,
+    ) -> dict[timedelta, pl.DataFrame]:
+        """Add the ticks of `metric_batch` to the bars in progress.
+        Args:
+            metric_batch (MetricBatch):
+                Metrics received, only `LastPrice` and `LastVolume` are used.
+            timestamp (datetime):
+                Reception time of the metrics.
+        Returns:
+            dict[timedelta, pl.DataFrame]:
+                Bars completed because `timestamp` started a new interval.
+        """
+
+        completed_map = self.roll(timestamp=timestamp)
+        get_row = self.get_row
+        price_row_list = []
+        price_list = []
+        volume_row_list = []
+        volume_list = []
+
+        for product_id, metric_type, value in zip(
+            metric_batch.product_id_list,
+            metric_batch.metric_type_list,
+            metric_batch.value_list,
+        ):
+            if metric_type is MetricType.LastPrice:
+                price_row_list.append(get_row(product_id=product_id))
+                price_list.append(value)
+            elif metric_type is MetricType.LastVolume:
+                volume_row_list.append(get_row(product_id=product_id))
+                volume_list.append(value)
+
+        if price_list:
+            price_row_array = np.asarray(price_row_list, dtype=np.intp)
+            price_array = np.asarray(price_list, dtype=np.float64)
+
+            # FIRST AND LAST TICK OF EACH PRODUCT INSIDE THIS BATCH
+            first_row_array, first_index_array = np.unique(
+                price_row_array,
+                return_index=True,
+            )
+            last_row_array, last_index_array = np.unique(
+                price_row_array[::-1],
+                return_index=True,
+            )
+            last_index_array = len(price_row_array) - 1 - last_index_array
+
+            for index in range(len(self.__interval_list)):
+                opening_array = self.__tick_count[index, first_row_array] == 0
+                self.__open[index, first_row_array[opening_array]] = price_array[
+                    first_index_array[opening_array]
+                ]
+                self.__close[index, last_row_array] = price_array[last_index_array]
+                np.fmax.at(self.__high[index], price_row_array, price_array)
+                np.fmin.at(self.__low[index], price_row_array, price_array)
+                np.add.at(self.__tick_count[index], price_row_array, 1)
+
+        if volume_list:
+            volume_row_array = np.asarray(volume_row_list, dtype=np.intp)
+            volume_array = np.asarray(volume_list, dtype=np.float64)
+
+            for index in range(len(self.__interval_list)):
+                np.add.at(self.__volume[index], volume_row_array, volume_array)
+
+        return completed_map
+
+    def parse(self, ticker: Ticker) -> dict[timedelta, pl.DataFrame]:
+        """Update the bars with a `Ticker`, a heartbeat can complete bars.
+
+        Returns:
+            dict[timedelta, pl.DataFrame]: Completed bars of each interval.
+        """
+
+        if ticker.json_text == '[{"m":"h"}]':
+            return self.roll(timestamp=ticker.response_datetime)
+
+        metric_batch = self.__ticker_to_metric_list.parse_batch(ticker=ticker)
+
+        return self.update_batch(
+            metric_batch=metric_batch,
+            timestamp=ticker.response_datetime,
+        )
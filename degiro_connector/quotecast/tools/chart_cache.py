@@ -0,0 +1,243 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+from orjson import OPT_SORT_KEYS, dumps
+
+from degiro_connector.quotecast.models.chart import Chart, ChartRequest
+
+
+class ChartCache:
+    """Keep the series of the charts until they expire.
+
+    Each `Series` returned by the Chart API has an `expires` datetime :
+    until then, the same request gets the same series. The cache stores
+    each series on its own, so a request only fetches its expired or
+    missing series.
+
+    Example :
+        chart_fetcher = ChartFetcher(
+            user_token=user_token,
+            chart_cache=ChartCache(max_series_count=10_000, folder="charts"),
+        )
+        chart = chart_fetcher.get_chart(chart_request=chart_request)  # NETWORK
+        chart = chart_fetcher.get_chart(chart_request=chart_request)  # CACHE
+
+    There are two tiers :
+        - memory : the `max_series_count` least recently used series
+        - disk (optional) : one JSON file per series inside `folder`,
+        shared between processes and kept across restarts
+
+    The key of a series is the request without `requestid`, `callback`
+    and `user_token`, plus the id of the series.
+    """
+
+    DEFAULT_MAX_SERIES_COUNT = 10_000
+
+    def __init__(
+        self,
+        max_series_count: int = DEFAULT_MAX_SERIES_COUNT,
+        folder: str | Path | None = None,
+    ):
+        """
+        Args:
+            max_series_count (int, optional):
+                Maximum amount of series kept in memory.
+                Defaults to 10_000.
+            folder (str | Path, optional):
+                Folder of the disk tier, None to only use the memory.
+                Defaults to None.
+        """
+
+        if max_series_count < 1:
+            raise ValueError(f"Invalid max_series_count : {max_series_count}")
+
+        self.__entry_map: OrderedDict[str, Chart] = OrderedDict()
+        self.__folder = None if folder is None else Path(folder)
+        self.__hit_count = 0
+        self.__lock = threading.Lock()
+        self.__max_series_count = max_series_count
+        self.__miss_count = 0
+
+        if self.__folder is not None:
+            self.__folder.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def hit_count(self) -> int:
+        """Series found in the cache."""
+
+        return self.__hit_count
+
+    @property
+    def miss_count(self) -> int:
+        """Series missing or expired."""
+
+        return self.__miss_count
+
+    @property
+    def series_count(self) -> int:
+        """Series kept in memory."""
+
+        return len(self.__entry_map)
+
+    @staticmethod
+    def build_key(chart_request: ChartRequest, series_id: str) -> str:
+        params = chart_request.model_dump(
+            by_alias=True,
+            exclude={"callback", "override", "requestid", "series", "user_token"},
+            exclude_none=True,
+            mode="json",
+        )
+        params.update(chart_request.override)
+        params["series"] = series_id
+
+        return dumps(params, option=OPT_SORT_KEYS).decode()
+
+    @staticmethod
+    def is_expired(entry: Chart, now: datetime | None = None) -> bool:
+        expires = entry.series[0].expires
+
+        if now is None:
+            now = datetime.now(expires.tzinfo)
+
+        return expires <= now
+
+    def build_path(self, key: str) -> Path:
+        if self.__folder is None:
+            raise AttributeError("This cache has no folder.")
+
+        return self.__folder / (hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def load(self, key: str) -> Chart | None:
+        """Entry of the disk tier, if any."""
+
+        path = self.build_path(key=key)
+
+        try:
+            return Chart.model_validate_json(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(self, key: str, entry: Chart) -> None:
+        """Write an entry in the disk tier, readers never see a partial file."""
+
+        path = self.build_path(key=key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+        tmp_path.write_bytes(entry.model_dump_json().encode())
+        os.replace(tmp_path, path)
+
+    def get_entry(self, key: str) -> Chart | None:
+        entry_map = self.__entry_map
+
+        with self.__lock:
+            entry = entry_map.get(key)
+            if entry is not None:
+                entry_map.move_to_end(key)
+
+        if entry is None and self.__folder is not None:
+            entry = self.load(key=key)
+            if entry is not None and not self.is_expired(entry=entry):
+                self.put_entry(key=key, entry=entry)
+
+        if entry is None or self.is_expired(entry=entry):
+            return None
+
+        return entry
+
+    def put_entry(self, key: str, entry: Chart) -> None:
+        entry_map = self.__entry_map
+
+        with self.__lock:
+            entry_map[key] = entry
+            entry_map.move_to_end(key)
+
+            while len(entry_map) > self.__max_series_count:
+                entry_map.popitem(last=False)
+
+    def get(self, chart_request: ChartRequest) -> tuple[Chart | None, list[str]]:
+        """Series of a request found in the cache.
+        Args:
+            chart_request (ChartRequest):
+                Request to look for.
+        Returns:
+            tuple[Chart | None, list[str]]:
+                Chart with the cached series, None if there is none.
+                Ids of the series to fetch.
+        """
+
+        chart = None
+        missing_list = []
+        series_list = []
+
+        for series_id in dict.fromkeys(chart_request.series):
+            entry = self.get_entry(
+                key=self.build_key(chart_request=chart_request, series_id=series_id)
+            )
+
+            if entry is None:
+                missing_list.append(series_id)
+                continue
+
+            if chart is None:
+                chart = entry
+            series_list.extend(entry.series)
+
+        with self.__lock:
+            self.__hit_count += len(series_list)
+            self.__miss_count += len(missing_list)
+
+        if chart is not None:
+            chart = chart.model_copy(
+                update={"requestid": chart_request.requestid, "series": series_list}
+            )
+
+        return chart, missing_list
+
+    def put(self, chart_request: ChartRequest, chart: Chart) -> None:
+        """Store each series of a chart, received for `chart_request`."""
+
+        for series in chart.series:
+            key = self.build_key(chart_request=chart_request, series_id=series.id)
+            entry = chart.model_copy(update={"series": [series]})
+
+            if self.is_expired(entry=entry):
+                continue
+
+            self.put_entry(key=key, entry=entry)
+            if self.__folder is not None:
+                self.save(key=key, entry=entry)
+
+    @staticmethod
+    def merge(
+        chart_request: ChartRequest,
+        cached_chart: Chart | None,
+        chart: Chart,
+    ) -> Chart:
+        """Cached and fetched series, in the order of `chart_request.series`."""
+
+        series_map = {series.id: series for series in chart.series}
+
+        if cached_chart is not None:
+            for series in cached_chart.series:
+                series_map.setdefault(series.id, series)
+
+        return chart.model_copy(
+            update={
+                "requestid": chart_request.requestid,
+                "series": [
+                    series_map[series_id]
+                    for series_id in dict.fromkeys(chart_request.series)
+                    if series_id in series_map
+                ],
+            }
+        )
+
+    def clear(self) -> None:
+        """Empty the memory tier, the files of the disk tier are kept."""
+
+        with self.__lock:
+            self.__entry_map.clear()
@@ -1,14 +1,17 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterator
+from urllib.parse import urlencode
 
-import json
 import polars as pl
 import requests
 from isodate import parse_duration
+from orjson import loads
 
 from degiro_connector.core.constants import urls
 from degiro_connector.quotecast.models.chart import Chart, ChartRequest, Series
+from degiro_connector.quotecast.tools.chart_cache import ChartCache
 from degiro_connector.core.models.model_connection import ModelConnection
 from degiro_connector.core.models.model_session import ModelSession
 
@@ -47,10 +50,40 @@ class SeriesFormatter:
         start: datetime,
         resolution: timedelta,
     ):
-        df = df.with_columns((pl.col(column) * resolution).cast(pl.Duration) + start)
+        """Replace the index of each row by `start + index * resolution`."""
+
+        resolution_us = resolution // timedelta(microseconds=1)
+        df = df.with_columns(
+            (pl.col(column) * resolution_us).cast(pl.Int64).cast(pl.Duration("us"))
+            + start
+        )
 
         return df
 
+    @staticmethod
+    def build_df(data: list, columns: list[str] | None = None) -> pl.DataFrame:
+        """Typed columns from the rows of a timeseries.
+
+        Each column is extracted from the rows at once, instead of inferring
+        the rows one by one with `orient="row"`. Every column is `Float64`,
+        whatever the values : the index might be fractional and prices
+        which happen to be whole numbers mustn't come out as `Int64`.
+        """
+
+        width = len(data[0]) if data else len(columns or [])
+        columns = columns or [f"column_{index}" for index in range(width)]
+
+        return pl.DataFrame(
+            data=[
+                pl.Series(
+                    name=column,
+                    values=[row[index] for row in data],
+                    dtype=pl.Float64,
+                )
+                for index, column in enumerate(columns)
+            ]
+        )
+
     @classmethod
     def format(
         cls,
@@ -77,11 +110,7 @@ class SeriesFormatter:
         else:
             columns = None
 
-        df = pl.DataFrame(
-            data=series.data,
-            orient="row",
-            schema=columns,
-        )
+        df = cls.build_df(data=series.data, columns=columns)
         start, resolution = cls.parse_date_and_resolution(times=series.times)
         column = df.columns[0]
         formatted_df = cls.format_timestamp(
@@ -107,7 +136,194 @@ class SeriesFormatter:
         return df
 
 
+class ChartPlanner:
+    """Pack the series of many products into few `ChartRequest`.
+
+    Each `ChartRequest` stays within `max_series_count` series and
+    `max_url_length` characters. The series of a product are never
+    spread across two requests.
+
+    Example :
+        chart_planner = ChartPlanner(max_series_count=50)
+        chart_request_list = chart_planner.plan(
+            chart_request=chart_request,
+            product_list=["issueid:360148977", "vwdkey:AAPL.BATS,E"],
+            kind_list=["price", "volume"],
+        )
+
+        for chart_request in chart_request_list:
+            chart = chart_fetcher.get_chart(chart_request=chart_request)
+            chart_map = ChartPlanner.split_chart(chart=chart)
+            # {"issueid:360148977": Chart(...), "vwdkey:AAPL.BATS,E": Chart(...)}
+    """
+
+    DEFAULT_MAX_SERIES_COUNT = 50
+    DEFAULT_MAX_URL_LENGTH = 4096
+    # "object" IS THE SERIES WITHOUT PREFIX, EXAMPLE : "issueid:360148977"
+    KIND_LIST = ["object", "price", "ohlc", "volume"]
+
+    def __init__(
+        self,
+        max_series_count: int = DEFAULT_MAX_SERIES_COUNT,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+        chart_url: str | None = None,
+        user_token: int = 0,
+    ):
+        """
+        Args:
+            max_series_count (int, optional):
+                Maximum amount of series inside a request.
+                Defaults to 50.
+            max_url_length (int, optional):
+                Maximum length of the URL of a request.
+                Defaults to 4096.
+            chart_url (str, optional):
+                URL of Degiro's Chart API, used to measure the URLs.
+                Defaults to None : uses `urls.CHART`.
+            user_token (int, optional):
+                User identifier in Degiro's API, used to measure the URLs.
+                Defaults to 0.
+        """
+
+        if max_series_count < 1:
+            raise ValueError(f"Invalid max_series_count : {max_series_count}")
+
+        if chart_url is None:
+            chart_url = urls.CHART
+
+        self.__chart_url = chart_url
+        self.__max_series_count = max_series_count
+        self.__max_url_length = max_url_length
+        self.__user_token = user_token
+
+    @property
+    def max_series_count(self) -> int:
+        return self.__max_series_count
+
+    @property
+    def max_url_length(self) -> int:
+        return self.__max_url_length
+
+    @staticmethod
+    def build_series_id(kind: str, product: str) -> str:
+        return product if kind == "object" else f"{kind}:{product}"
+
+    @classmethod
+    def parse_series_id(cls, series_id: str) -> tuple[str, str]:
+        """Kind and product of a series.
+        Args:
+            series_id (str):
+                Example :
+                    series_id = "price:issueid:360148977"
+        Returns:
+            tuple[str, str]:
+                Example :
+                    ("price", "issueid:360148977")
+        """
+
+        kind, separator, product = series_id.partition(":")
+
+        if separator and kind in cls.KIND_LIST:
+            return kind, product
+
+        return "object", series_id
+
+    def build_url_length(self, chart_request: ChartRequest) -> int:
+        """Length of the URL of a request, without its series."""
+
+        chart_request = chart_request.model_copy(update={"series": []}, deep=True)
+        params = ChartFetcher.build_params(
+            chart_request=chart_request,
+            user_token=self.__user_token,
+        )
+        http_request = requests.Request(
+            method="GET",
+            url=self.__chart_url,
+            params=params,
+        )
+
+        return len(http_request.prepare().url or "")
+
+    def plan(
+        self,
+        chart_request: ChartRequest,
+        product_list: list[str],
+        kind_list: list[str] | None = None,
+    ) -> list[ChartRequest]:
+        """Fewest requests fetching `kind_list` for each product.
+        Args:
+            chart_request (ChartRequest):
+                Request used as a template : same period, resolution...
+            product_list (list[str]):
+                Products, example : ["issueid:360148977", "vwdkey:AAPL.BATS,E"].
+            kind_list (list[str], optional):
+                Series of each product, among `KIND_LIST`.
+                Defaults to None : ["price"].
+        Returns:
+            list[ChartRequest]:
+                Requests with `requestid` equal to their index.
+        """
+
+        kind_list = kind_list or ["price"]
+        for kind in kind_list:
+            if kind not in self.KIND_LIST:
+                raise ValueError(f"Unknown series kind : {kind}")
+
+        max_series_count = self.__max_series_count
+        max_url_length = self.__max_url_length
+        base_length = self.build_url_length(chart_request=chart_request)
+        series_list: list[list[str]] = []
+        current_list: list[str] = []
+        current_length = base_length
+
+        for product in dict.fromkeys(product_list):
+            product_series_list = [
+                self.build_series_id(kind=kind, product=product) for kind in kind_list
+            ]
+            # "&series=..." FOR EACH SERIES
+            product_length = sum(
+                1 + len(urlencode({"series": series_id}))
+                for series_id in product_series_list
+            )
+
+            if current_list and (
+                len(current_list) + len(product_series_list) > max_series_count
+                or current_length + product_length > max_url_length
+            ):
+                series_list.append(current_list)
+                current_list = []
+                current_length = base_length
+
+            current_list.extend(product_series_list)
+            current_length += product_length
+
+        if current_list:
+            series_list.append(current_list)
+
+        return ChartFetcher.build_chart_request_list(
+            chart_request=chart_request,
+            series_list=series_list,
+        )
+
+    @classmethod
+    def split_chart(cls, chart: Chart) -> dict[str, Chart]:
+        """One `Chart` for each product inside `chart.series`."""
+
+        series_map: dict[str, list[Series]] = {}
+
+        for series in chart.series:
+            _kind, product = cls.parse_series_id(series_id=series.id)
+            series_map.setdefault(product, []).append(series)
+
+        return {
+            product: chart.model_copy(update={"series": series_list})
+            for product, series_list in series_map.items()
+        }
+
+
 class ChartFetcher:
+    DEFAULT_MAX_WORKERS = 8
+
     @staticmethod
     def build_logger() -> logging.Logger:
         return logging.getLogger(__name__)
@@ -116,6 +332,14 @@ class ChartFetcher:
     def build_session(headers: dict[str, str] | None = None) -> requests.Session:
         return ModelSession.build_session(headers=headers)
 
+    @property
+    def chart_cache(self) -> ChartCache | None:
+        return self.__chart_cache
+
+    @property
+    def chart_url(self) -> str:
+        return self.__chart_url
+
     @property
     def user_token(self):
         return self.__user_token
@@ -198,6 +422,43 @@ class ChartFetcher:
             Chart: Data of the chart.
         """
 
+        chart_cache = self.__chart_cache
+
+        if chart_cache is None or raw is True:
+            return self.fetch_chart(chart_request=chart_request, raw=raw)
+
+        cached_chart, missing_list = chart_cache.get(chart_request=chart_request)
+
+        if cached_chart is not None and not missing_list:
+            return cached_chart
+
+        # ONLY THE MISSING OR EXPIRED SERIES ARE FETCHED
+        chart = self.fetch_chart(
+            chart_request=chart_request.model_copy(update={"series": missing_list})
+        )
+
+        if not isinstance(chart, Chart):
+            return None
+
+        # THE CHART IS RETURNED EVEN IF THE CACHE CAN'T STORE IT
+        try:
+            chart_cache.put(chart_request=chart_request, chart=chart)
+        except Exception as e:
+            self.logger.fatal(e)
+
+        return chart_cache.merge(
+            chart_request=chart_request,
+            cached_chart=cached_chart,
+            chart=chart,
+        )
+
+    def fetch_chart(
+        self,
+        chart_request: ChartRequest,
+        raw: bool = False,
+    ) -> Chart | dict | None:
+        """Fetches chart's data from Degiro's API, without cache."""
+
         session = self.session_storage.session
         logger = self.logger
         user_token = self.__user_token
@@ -207,7 +468,7 @@ class ChartFetcher:
         if session is None:
             session = self.build_session()
 
-        url = urls.CHART
+        url = self.__chart_url
         params = self.build_params(
             chart_request=chart_request,
             user_token=user_token,
@@ -219,8 +480,9 @@ class ChartFetcher:
         try:
             response = session.send(prepped)
             response.raise_for_status()
-            response_map = json.loads(
-                response.text[len(chart_request.callback) + 1 : -1]
+            # STRIPS "callback(...)" FROM A VIEW : THE BODY ISN'T COPIED
+            response_map = loads(
+                memoryview(response.content)[len(chart_request.callback) + 1 : -1]
             )
 
             if raw is True:
@@ -238,13 +500,209 @@ class ChartFetcher:
             logger.fatal(e)
             return None
 
+    @staticmethod
+    def build_chart_request_list(
+        chart_request: ChartRequest,
+        series_list: list[list[str]],
+    ) -> list[ChartRequest]:
+        """Copies of `chart_request`, one for each list of series.
+        Args:
+            chart_request (ChartRequest):
+                Request used as a template : same period, resolution...
+            series_list (list[list[str]]):
+                Series of each request, example :
+                    series_list = [
+                        ["price:issueid:360148977"],
+                        ["price:issueid:360015751"],
+                    ]
+        Returns:
+            list[ChartRequest]:
+                Requests with `requestid` equal to their index.
+        """
+
+        return [
+            chart_request.model_copy(
+                update={"requestid": str(index), "series": list(series)},
+                deep=True,
+            )
+            for index, series in enumerate(series_list)
+        ]
+
+    def get_chart_list(
+        self,
+        chart_request_list: list[ChartRequest],
+        raw: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Iterator[tuple[ChartRequest, Chart | dict | None]]:
+        """Fetches many charts concurrently.
+
+        The requests are sent by a pool of `max_workers` threads, each
+        thread uses its own `requests.Session` from `session_storage`.
+
+        Example :
+            chart_request_list = chart_fetcher.build_chart_request_list(
+                chart_request=chart_request,
+                series_list=[
+                    [f"price:issueid:{product_id}"] for product_id in product_id_list
+                ],
+            )
+            for chart_request, chart in chart_fetcher.get_chart_list(
+                chart_request_list=chart_request_list,
+            ):
+                ...
+
+        Args:
+            chart_request_list (list[ChartRequest]):
+                Requests to send, see `get_chart`.
+            raw (bool, optional):
+                Whether are not we want the raw API responses.
+                Defaults to False.
+            max_workers (int, optional):
+                Maximum amount of concurrent requests.
+                Defaults to 8.
+        Yields:
+            tuple[ChartRequest, Chart | dict | None]:
+                Each request with its chart, as soon as it is received.
+                The chart is None if this request failed : the other
+                requests are not affected.
+        """
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="chart_fetcher",
+        )
+
+        try:
+            future_map = {
+                executor.submit(
+                    self.get_chart,
+                    chart_request=chart_request,
+                    raw=raw,
+                ): chart_request
+                for chart_request in chart_request_list
+            }
+
+            for future in as_completed(future_map):
+                try:
+                    chart = future.result()
+                except Exception as e:
+                    self.logger.fatal(e)
+                    chart = None
+
+                yield future_map[future], chart
+        finally:
+            # THE REMAINING REQUESTS ARE DROPPED IF THE CONSUMER STOPS EARLY
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_chart_by_product(
+        self,
+        chart_request: ChartRequest,
+        product_list: list[str],
+        kind_list: list[str] | None = None,
+        chart_planner: ChartPlanner | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Iterator[tuple[str, Chart | None]]:
+        """Fetches the series of many products with few requests.
+
+        The products are packed by `chart_planner` into few requests,
+        fetched concurrently by `get_chart_list`.
+
+        Example :
+            for product, chart in chart_fetcher.get_chart_by_product(
+                chart_request=chart_request,
+                product_list=["issueid:360148977", "vwdkey:AAPL.BATS,E"],
+                kind_list=["ohlc", "volume"],
+            ):
+                ...
+
+        Args:
+            chart_request (ChartRequest):
+                Request used as a template : same period, resolution...
+            product_list (list[str]):
+                Products, example : ["issueid:360148977", "vwdkey:AAPL.BATS,E"].
+            kind_list (list[str], optional):
+                Series of each product, see `ChartPlanner.KIND_LIST`.
+                Defaults to None : ["price"].
+            chart_planner (ChartPlanner, optional):
+                This object will be generated if None.
+                Defaults to None.
+            max_workers (int, optional):
+                Maximum amount of concurrent requests.
+                Defaults to 8.
+        Yields:
+            tuple[str, Chart | None]:
+                Each product with its own `Chart`, None if its request
+                failed.
+        """
+
+        if chart_planner is None:
+            chart_planner = ChartPlanner(
+                chart_url=self.__chart_url,
+                user_token=self.__user_token,
+            )
+
+        chart_request_list = chart_planner.plan(
+            chart_request=chart_request,
+            product_list=product_list,
+            kind_list=kind_list,
+        )
+
+        for packed_request, chart in self.get_chart_list(
+            chart_request_list=chart_request_list,
+            max_workers=max_workers,
+        ):
+            packed_product_list = dict.fromkeys(
+                ChartPlanner.parse_series_id(series_id=series_id)[1]
+                for series_id in packed_request.series
+            )
+
+            if chart is None:
+                for product in packed_product_list:
+                    yield product, None
+                continue
+
+            chart_map = ChartPlanner.split_chart(chart=chart)
+            for product in packed_product_list:
+                yield product, chart_map.get(
+                    product,
+                    chart.model_copy(update={"series": []}),
+                )
+
     def __init__(
         self,
         user_token: int,
         connection_storage: ModelConnection | None = None,
         logger: logging.Logger | None = None,
         session_storage: ModelSession | None = None,
+        chart_url: str | None = None,
+        chart_cache: ChartCache | None = None,
     ):
+        """
+        Args:
+            user_token (int):
+                User identifier in Degiro's API.
+            connection_storage (ModelConnection, optional):
+                This object will be generated if None.
+                Defaults to None.
+            logger (logging.Logger, optional):
+                This object will be generated if None.
+                Defaults to None.
+            session_storage (ModelSession, optional):
+                Thread-local sessions, generated if None.
+                Defaults to None.
+            chart_url (str, optional):
+                URL of Degiro's Chart API.
+                Defaults to None : uses `urls.CHART`.
+            chart_cache (ChartCache, optional):
+                Cache used by `get_chart`, None to always use the network.
+                Defaults to None.
+        """
+
+        if chart_url is None:
+            chart_url = urls.CHART
+
+        self.__chart_cache = chart_cache
+        self.__chart_url = chart_url
         self.__user_token = user_token
         self.__connection_storage = connection_storage or ModelConnection(timeout=600)
         self.__logger = logger or logging.getLogger(self.__module__)
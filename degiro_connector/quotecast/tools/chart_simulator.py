@@ -0,0 +1,282 @@
+import math
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from isodate import parse_duration
+from orjson import dumps
+
+from degiro_connector.quotecast.tools.ticker_simulator import TickerSimulator
+
+SERIES_TYPE_MAP = {
+    "ohlc": "ohlc",
+    "price": "time",
+    "volume": "time",
+}
+
+
+class ChartSimulator:
+    """Local server speaking the same protocol than Degiro's Chart API.
+
+    It can be used to test or benchmark the chart tools without
+    credentials nor network.
+
+    Example :
+        with ChartSimulator(universe_size=1000) as simulator:
+            chart_fetcher = ChartFetcher(
+                user_token=0,
+                chart_url=simulator.url,
+            )
+            chart = chart_fetcher.get_chart(chart_request=chart_request)
+
+    The products available are the same than `TickerSimulator`, see
+    `product_id_list`. A request with another "issueid" gets an HTTP
+    error 404.
+
+    The values only depend on the product and the timestamp : fetching
+    the same bar twice gives the same values.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        universe_size: int = 100,
+        expires_after: timedelta = timedelta(minutes=1),
+        latency: float = 0.0,
+        now: datetime | None = None,
+    ):
+        """
+        Args:
+            host (str, optional):
+                Interface to listen on.
+                Defaults to "127.0.0.1".
+            port (int, optional):
+                Port to listen on, 0 to pick a free one.
+                Defaults to 0.
+            universe_size (int, optional):
+                Amount of products available.
+                Defaults to 100.
+            expires_after (timedelta, optional):
+                Delay before the series returned expire.
+                Defaults to 1 minute.
+            latency (float, optional):
+                Seconds waited before answering each request.
+                Defaults to 0.0.
+            now (datetime, optional):
+                End of the charts, fixed to get the same bars at each
+                request.
+                Defaults to None : current datetime.
+        """
+
+        self.__expires_after = expires_after
+        self.__latency = latency
+        self.__lock = threading.Lock()
+        self.__now = now
+        self.__product_id_set = set(
+            TickerSimulator.build_product_id_list(universe_size=universe_size)
+        )
+        self.__request_count = 0
+        self.__thread: threading.Thread | None = None
+        self.__server = ThreadingHTTPServer((host, port), self.build_handler())
+        self.__server.daemon_threads = True
+
+    @property
+    def product_id_list(self) -> list[str]:
+        return sorted(self.__product_id_set)
+
+    @property
+    def request_count(self) -> int:
+        """Amount of chart requests received."""
+
+        return self.__request_count
+
+    @property
+    def url(self) -> str:
+        """Value to use as `chart_url`."""
+
+        host, port = self.__server.server_address[:2]
+
+        return f"http://{host}:{port}/data.js"
+
+    def build_handler(self) -> type[BaseHTTPRequestHandler]:
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                simulator.handle(handler=self)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self.__lock:
+            self.__request_count += 1
+
+        if self.__latency > 0:
+            time.sleep(self.__latency)
+
+        params = parse_qs(urlsplit(handler.path).query)
+        callback = params.get("callback", [""])[0]
+        response_map = self.build_chart(params=params)
+
+        if response_map is None:
+            handler.send_response(404)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        content = callback.encode() + b"(" + dumps(response_map) + b")"
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/javascript")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    @staticmethod
+    def floor_datetime(value: datetime, resolution: timedelta) -> datetime:
+        step = resolution // timedelta(seconds=1)
+        timestamp = int((value - datetime(1970, 1, 1)).total_seconds())
+
+        return datetime(1970, 1, 1) + timedelta(seconds=timestamp - timestamp % step)
+
+    @staticmethod
+    def build_value(product: str, timestamp: datetime) -> float:
+        """Deterministic price of a product."""
+
+        phase = zlib.crc32(product.encode()) % 1000
+        day = (timestamp - datetime(1970, 1, 1)).total_seconds() / 86400
+
+        return round(100 + 10 * math.sin(day / 7 + phase), 4)
+
+    def build_data(
+        self,
+        kind: str,
+        product: str,
+        start: datetime,
+        resolution: timedelta,
+        count: int,
+    ) -> list[list]:
+        build_value = self.build_value
+        data = []
+
+        for index in range(count):
+            timestamp = start + index * resolution
+
+            if kind == "price":
+                data.append([index, build_value(product=product, timestamp=timestamp)])
+            elif kind == "volume":
+                seed = f"{product}:{timestamp.isoformat()}".encode()
+                data.append([index, zlib.crc32(seed) % 1000])
+            else:
+                open_price = build_value(product=product, timestamp=timestamp)
+                close_price = build_value(
+                    product=product,
+                    timestamp=timestamp + resolution,
+                )
+                data.append(
+                    [
+                        index,
+                        open_price,
+                        max(open_price, close_price),
+                        min(open_price, close_price),
+                        close_price,
+                    ]
+                )
+
+        return data
+
+    def build_chart(self, params: dict[str, list[str]]) -> dict | None:
+        now = self.__now or datetime.now()
+        resolution_text = params.get("resolution", ["P1D"])[0]
+        resolution = parse_duration(resolution_text)
+        resolution = now + resolution - now
+        period = parse_duration(params.get("period", ["P1D"])[0])
+        end = self.floor_datetime(value=now, resolution=resolution)
+        start = self.floor_datetime(value=end - period, resolution=resolution)
+        count = (end - start) // resolution
+        expires = (now + self.__expires_after).isoformat()
+        series_list = []
+
+        for series_id in params.get("series", []):
+            kind, _separator, product = series_id.partition(":")
+
+            if kind not in SERIES_TYPE_MAP:
+                kind, product = "object", series_id
+
+            key_type, _separator, key = product.partition(":")
+            if key_type == "issueid" and key not in self.__product_id_set:
+                return None
+
+            if kind == "object":
+                series_list.append(
+                    {
+                        "expires": expires,
+                        "data": {
+                            "issueId": int(key) if key.isdigit() else None,
+                            "name": key,
+                            "lastPrice": self.build_value(
+                                product=product,
+                                timestamp=end,
+                            ),
+                        },
+                        "id": series_id,
+                        "type": "object",
+                    }
+                )
+            else:
+                series_list.append(
+                    {
+                        "times": f"{start.isoformat()}/{resolution_text}",
+                        "expires": expires,
+                        "data": self.build_data(
+                            kind=kind,
+                            product=product,
+                            start=start,
+                            resolution=resolution,
+                            count=count,
+                        ),
+                        "id": series_id,
+                        "type": SERIES_TYPE_MAP[kind],
+                    }
+                )
+
+        return {
+            "requestid": params.get("requestid", [""])[0],
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "resolution": resolution_text,
+            "series": series_list,
+        }
+
+    def start(self) -> None:
+        if self.__thread is not None:
+            return
+
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever,
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        if self.__thread is None:
+            return
+
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__thread = None
+
+    def __enter__(self) -> "ChartSimulator":
+        self.start()
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
@@ -0,0 +1,172 @@
+import threading
+import time
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+
+
+class ConflatingQueue:
+    """Bounded buffer keeping only the latest value of each metric.
+
+    The fetch loop puts the `MetricBatch` without ever blocking. While the
+    consumer is busy, a new value of a (product, metric) replaces the
+    pending one : the consumer always gets the freshest state and its work
+    only depends on the amount of changed keys.
+
+    Example :
+        conflating_queue = ConflatingQueue(max_size=10000)
+
+        # FETCH LOOP, INSIDE A THREAD
+        while True:
+            ticker = ticker_session.fetch_ticker()
+            metric_batch = ticker_to_metric_list.parse_batch(ticker=ticker)
+            conflating_queue.put(metric_batch=metric_batch)
+
+        # CONSUMER
+        while True:
+            metric_batch = conflating_queue.get()
+            if metric_batch is None:
+                break
+            strategy.on_metric_batch(metric_batch)
+
+    When `max_size` keys are already pending, the key updated the longest
+    time ago is dropped to make room for a new one.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        """
+        Args:
+            max_size (int, optional):
+                Maximum amount of pending (product, metric), None for no
+                limit.
+                Defaults to None.
+        """
+
+        if max_size is not None and max_size < 1:
+            raise ValueError(f"`max_size` must be positive : {max_size}")
+
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__conflated_count = 0
+        self.__dropped_count = 0
+        self.__max_size = max_size
+        self.__pending_map: dict[tuple[str, MetricType], str | float] = {}
+        self.__put_count = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def conflated_count(self) -> int:
+        """Values replaced by a newer one before being consumed."""
+
+        return self.__conflated_count
+
+    @property
+    def dropped_count(self) -> int:
+        """Values dropped because `max_size` was reached."""
+
+        return self.__dropped_count
+
+    @property
+    def max_size(self) -> int | None:
+        return self.__max_size
+
+    @property
+    def put_count(self) -> int:
+        """Values received."""
+
+        return self.__put_count
+
+    def __len__(self) -> int:
+        return len(self.__pending_map)
+
+    def put(self, metric_batch: MetricBatch) -> None:
+        """Merge `metric_batch` into the pending values, never blocks."""
+
+        max_size = self.__max_size
+
+        with self.__condition:
+            if self.__closed:
+                raise ValueError("`put` on a closed ConflatingQueue.")
+
+            pending_map = self.__pending_map
+            conflated_count = 0
+            dropped_count = 0
+
+            for key, value in zip(
+                zip(metric_batch.product_id_list, metric_batch.metric_type_list),
+                metric_batch.value_list,
+            ):
+                # THE KEY MOVES TO THE END : THE OLDEST PENDING KEY IS FIRST
+                if pending_map.pop(key, None) is not None:
+                    conflated_count += 1
+                elif max_size is not None and len(pending_map) >= max_size:
+                    del pending_map[next(iter(pending_map))]
+                    dropped_count += 1
+                pending_map[key] = value
+
+            self.__put_count += len(metric_batch)
+            self.__conflated_count += conflated_count
+            self.__dropped_count += dropped_count
+
+            if pending_map:
+                self.__condition.notify()
+
+    def swap(self) -> MetricBatch:
+        """Take all the pending values at once."""
+
+        pending_map = self.__pending_map
+        self.__pending_map = {}
+
+        if not pending_map:
+            return MetricBatch()
+
+        key_list = list(pending_map)
+
+        return MetricBatch(
+            product_id_list=[product_id for product_id, _ in key_list],
+            metric_type_list=[metric_type for _, metric_type in key_list],
+            value_list=list(pending_map.values()),
+        )
+
+    def get_nowait(self) -> MetricBatch:
+        """Returns the pending values, the `MetricBatch` is empty if none."""
+
+        with self.__condition:
+            return self.swap()
+
+    def get(self, timeout: float | None = None) -> MetricBatch | None:
+        """Wait for pending values then returns them all.
+        Args:
+            timeout (float, optional):
+                Maximum seconds to wait, None to wait forever.
+                Defaults to None.
+        Returns:
+            MetricBatch | None:
+                Latest value of each changed (product, metric), empty on
+                timeout or None if the queue is closed.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self.__condition:
+            while not self.__pending_map:
+                if self.__closed:
+                    return None
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+
+                if remaining is not None and remaining <= 0:
+                    return MetricBatch()
+
+                self.__condition.wait(timeout=remaining)
+
+            return self.swap()
+
+    def close(self) -> None:
+        """Wake up the consumers : they get the last values then None."""
+
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
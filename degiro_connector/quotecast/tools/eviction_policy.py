@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+class EvictionPolicy:
+    """Decide which products to forget inside a long-running stream.
+
+    A product is evicted when :
+        - it wasn't updated during `ttl`
+        - or `max_product_count` is reached : least recently updated first
+
+    Example :
+        ticker_to_df = TickerToDF(
+            eviction_policy=EvictionPolicy(
+                ttl=timedelta(hours=1),
+                max_product_count=5_000,
+            ),
+        )
+
+    The clock is the reception time of the `Ticker` : replaying recorded
+    tickers evicts the same products than the live stream did.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta | None = None,
+        max_product_count: int | None = None,
+    ):
+        """
+        Args:
+            ttl (timedelta, optional):
+                Delay without update after which a product is evicted.
+                Defaults to None.
+            max_product_count (int, optional):
+                Maximum amount of products kept.
+                Defaults to None.
+        """
+
+        if max_product_count is not None and max_product_count < 1:
+            raise ValueError(f"Invalid max_product_count : {max_product_count}")
+
+        self.__max_product_count = max_product_count
+        # {product_id: last_update}, LEAST RECENTLY UPDATED FIRST
+        self.__last_update_map: OrderedDict[str, datetime] = OrderedDict()
+        self.__ttl = ttl
+
+    @property
+    def max_product_count(self) -> int | None:
+        return self.__max_product_count
+
+    @property
+    def product_count(self) -> int:
+        return len(self.__last_update_map)
+
+    @property
+    def ttl(self) -> timedelta | None:
+        return self.__ttl
+
+    def touch(self, product_id_list: list[str], now: datetime) -> None:
+        """Record an update of these products."""
+
+        last_update_map = self.__last_update_map
+
+        for product_id in product_id_list:
+            last_update_map[product_id] = now
+            last_update_map.move_to_end(product_id)
+
+    def discard(self, product_id_list: list[str]) -> None:
+        """Forget products evicted for another reason, like "a_rel"."""
+
+        last_update_map = self.__last_update_map
+
+        for product_id in product_id_list:
+            last_update_map.pop(product_id, None)
+
+    def collect(self, now: datetime) -> list[str]:
+        """Remove and return the products to evict."""
+
+        last_update_map = self.__last_update_map
+        max_product_count = self.__max_product_count
+        ttl = self.__ttl
+        evicted_list = []
+
+        if ttl is not None:
+            while last_update_map:
+                product_id, last_update = next(iter(last_update_map.items()))
+                if now - last_update < ttl:
+                    break
+                last_update_map.popitem(last=False)
+                evicted_list.append(product_id)
+
+        if max_product_count is not None:
+            while len(last_update_map) > max_product_count:
+                product_id, _last_update = last_update_map.popitem(last=False)
+                evicted_list.append(product_id)
+
+        return evicted_list
+
+    def clear(self) -> None:
+        self.__last_update_map.clear()
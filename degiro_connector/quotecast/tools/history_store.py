@@ -0,0 +1,434 @@
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import polars as pl
+from isodate import parse_duration
+from orjson import OPT_INDENT_2, dumps, loads
+
+from degiro_connector.quotecast.models.chart import ChartRequest, Interval
+from degiro_connector.quotecast.tools.chart_fetcher import (
+    ChartFetcher,
+    ChartPlanner,
+    SeriesFormatter,
+)
+
+# PERIODS USED TO BACKFILL, SMALLEST FIRST
+PERIOD_LIST = [
+    Interval.P1D,
+    Interval.P1W,
+    Interval.P1M,
+    Interval.P3M,
+    Interval.P6M,
+    Interval.P1Y,
+    Interval.P3Y,
+    Interval.P5Y,
+    Interval.P10Y,
+    Interval.P50Y,
+]
+
+
+class HistoryStore:
+    """Keep the history of many products on disk, fetching only the gaps.
+
+    For each product, series kind and resolution, the store knows which
+    [start, end) ranges it holds. `update` only fetches the missing
+    ranges : a daily top-up downloads the new bars, not the whole
+    history.
+
+    Example :
+        history_store = HistoryStore(folder="history", chart_fetcher=chart_fetcher)
+        history_store.update(
+            product_list=["issueid:360148977", "vwdkey:AAPL.BATS,E"],
+            kind="ohlc",
+            resolution=Interval.P1D,
+            start=datetime(2020, 1, 1),
+        )
+        df = history_store.load(
+            product="issueid:360148977",
+            kind="ohlc",
+            resolution=Interval.P1D,
+        )
+
+    The Chart API only accepts a `period` ending now : a gap is fetched
+    with the smallest `period` reaching its start. The products with the
+    same `period` are packed together, see `ChartPlanner`.
+
+    A bar still open at the end of a chart is stored but not held : it
+    is fetched again, complete, with the next gap.
+
+    The datetimes of a store are either all naive or all aware, like the
+    ones of the Chart API : naive, in the timezone `tz`.
+
+    Files :
+        history/index.json : ranges held, for each series
+        history/P1D/ohlc/issueid_360148977.parquet : bars of a series
+    """
+
+    def __init__(
+        self,
+        folder: str | Path,
+        chart_fetcher: ChartFetcher,
+        culture: str = "fr-FR",
+        tz: str = "Europe/Paris",
+        chart_planner: ChartPlanner | None = None,
+        logger: logging.Logger | None = None,
+    ):
+        """
+        Args:
+            folder (str | Path):
+                Root folder of the files.
+            chart_fetcher (ChartFetcher):
+                Used to fetch the gaps.
+            culture (str, optional):
+                Culture of the chart requests.
+                Defaults to "fr-FR".
+            tz (str, optional):
+                Timezone of the chart requests.
+                Defaults to "Europe/Paris".
+            chart_planner (ChartPlanner, optional):
+                Packs the products into few requests.
+                Defaults to None.
+            logger (logging.Logger, optional):
+                This object will be generated if None.
+                Defaults to None.
+        """
+
+        self.__chart_fetcher = chart_fetcher
+        self.__chart_planner = chart_planner
+        self.__culture = culture
+        self.__folder = Path(folder)
+        self.__lock = threading.Lock()
+        self.__logger = logger or logging.getLogger(self.__module__)
+        self.__tz = tz
+
+        self.__folder.mkdir(parents=True, exist_ok=True)
+        self.__index_path = self.__folder / "index.json"
+        self.__range_map: dict[str, list[list[datetime]]] = self.load_index()
+
+    @staticmethod
+    def build_key(product: str, kind: str, resolution: Interval) -> str:
+        return f"{resolution.value}/{kind}:{product}"
+
+    @staticmethod
+    def build_duration(interval: Interval, now: datetime) -> timedelta:
+        """Duration of an `Interval` ending at `now` : months and years vary."""
+
+        return now - (now - parse_duration(interval.value))
+
+    @classmethod
+    def build_period(cls, start: datetime, now: datetime) -> Interval:
+        """Smallest period reaching `start`."""
+
+        for period in PERIOD_LIST:
+            if now - cls.build_duration(interval=period, now=now) <= start:
+                return period
+
+        return PERIOD_LIST[-1]
+
+    @staticmethod
+    def merge_range_list(
+        range_list: list[list[datetime]],
+        start: datetime,
+        end: datetime,
+    ) -> list[list[datetime]]:
+        """Add [start, end) to sorted ranges, merging the overlaps."""
+
+        merged_list: list[list[datetime]] = []
+
+        for range_start, range_end in sorted(range_list + [[start, end]]):
+            if merged_list and range_start <= merged_list[-1][1]:
+                merged_list[-1][1] = max(merged_list[-1][1], range_end)
+            else:
+                merged_list.append([range_start, range_end])
+
+        return merged_list
+
+    @staticmethod
+    def check_range(
+        start: datetime,
+        end: datetime,
+        range_list: list[list[datetime]] | None = None,
+    ) -> None:
+        """Reject naive and aware datetimes mixed together.
+        Raises:
+            ValueError:
+                `start`, `end` and the ranges of `range_list` are not all
+                naive or all aware.
+        """
+
+        aware = start.tzinfo is not None
+
+        if (end.tzinfo is not None) != aware or (
+            range_list and (range_list[0][0].tzinfo is not None) != aware
+        ):
+            raise ValueError(
+                f"Naive and aware datetimes are mixed : start={start}, end={end}"
+            )
+
+    @classmethod
+    def build_complete_end(
+        cls,
+        df: pl.DataFrame,
+        resolution: Interval,
+        end: datetime,
+    ) -> datetime:
+        """End of the complete bars : the start of the first bar still open
+        at `end`, or `end` itself."""
+
+        duration = cls.build_duration(interval=resolution, now=end)
+        open_df = df.filter(pl.col("timestamp") + duration > end)
+
+        if open_df.height == 0:
+            return end
+
+        return min(end, open_df["timestamp"].min())
+
+    @staticmethod
+    def cast_df(df: pl.DataFrame) -> pl.DataFrame:
+        """Schema of the stored bars : `Datetime("us")` timestamps and
+        `Float64` values, whatever the types of a fetched chart."""
+
+        return df.cast(
+            {
+                column: pl.Datetime("us") if column == "timestamp" else pl.Float64
+                for column in df.columns
+            }
+        )
+
+    def build_path(self, product: str, kind: str, resolution: Interval) -> Path:
+        file_name = re.sub(r"[^\w.,-]", "_", product) + ".parquet"
+
+        return self.__folder / resolution.value / kind / file_name
+
+    def load_index(self) -> dict[str, list[list[datetime]]]:
+        try:
+            index = loads(self.__index_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+
+        return {
+            key: [
+                [datetime.fromisoformat(start), datetime.fromisoformat(end)]
+                for start, end in range_list
+            ]
+            for key, range_list in index.items()
+        }
+
+    def save_index(self) -> None:
+        """Write the index, readers never see a partial file."""
+
+        tmp_path = self.__index_path.with_suffix(".tmp")
+        tmp_path.write_bytes(dumps(self.__range_map, option=OPT_INDENT_2))
+        os.replace(tmp_path, self.__index_path)
+
+    def get_range_list(
+        self,
+        product: str,
+        kind: str,
+        resolution: Interval,
+    ) -> list[tuple[datetime, datetime]]:
+        """Ranges [start, end) held for a series."""
+
+        key = self.build_key(product=product, kind=kind, resolution=resolution)
+
+        return [(start, end) for start, end in self.__range_map.get(key, [])]
+
+    def find_gap_list(
+        self,
+        product: str,
+        kind: str,
+        resolution: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> list[tuple[datetime, datetime]]:
+        """Ranges of [start, end) which are not held.
+
+        A gap shorter than `resolution` can't contain a new bar : it is
+        ignored.
+        """
+
+        key = self.build_key(product=product, kind=kind, resolution=resolution)
+        range_list = self.__range_map.get(key, [])
+        self.check_range(start=start, end=end, range_list=range_list)
+
+        minimum = self.build_duration(interval=resolution, now=end)
+        gap_list = []
+        cursor = start
+
+        for range_start, range_end in range_list:
+            if range_end <= cursor:
+                continue
+            if range_start >= end:
+                break
+            if range_start - cursor >= minimum:
+                gap_list.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+
+        if end - cursor >= minimum:
+            gap_list.append((cursor, end))
+
+        return gap_list
+
+    def load(
+        self,
+        product: str,
+        kind: str,
+        resolution: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> pl.DataFrame | None:
+        """Bars of a series inside [start, end), None if nothing is held."""
+
+        path = self.build_path(product=product, kind=kind, resolution=resolution)
+
+        if not path.exists():
+            return None
+
+        lf = pl.scan_parquet(path)
+        if start is not None:
+            lf = lf.filter(pl.col("timestamp") >= start)
+        if end is not None:
+            lf = lf.filter(pl.col("timestamp") < end)
+
+        return lf.collect()
+
+    def write(
+        self,
+        product: str,
+        kind: str,
+        resolution: Interval,
+        df: pl.DataFrame,
+        start: datetime,
+        end: datetime,
+    ) -> int:
+        """Merge the bars of [start, end) inside the series.
+
+        Returns:
+            int: Amount of bars added.
+        """
+
+        path = self.build_path(product=product, kind=kind, resolution=resolution)
+        key = self.build_key(product=product, kind=kind, resolution=resolution)
+
+        with self.__lock:
+            self.check_range(
+                start=start,
+                end=end,
+                range_list=self.__range_map.get(key),
+            )
+            old_df = pl.read_parquet(path) if path.exists() else None
+            old_count = 0 if old_df is None else old_df.height
+            df = self.cast_df(df=df)
+
+            if old_df is not None and old_df.height:
+                df = pl.concat([self.cast_df(df=old_df), df], how="vertical")
+
+            # FETCHED BARS REPLACE THE STORED ONES
+            df = df.unique(subset="timestamp", keep="last").sort("timestamp")
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            df.write_parquet(tmp_path)
+            os.replace(tmp_path, path)
+
+            self.__range_map[key] = self.merge_range_list(
+                range_list=self.__range_map.get(key, []),
+                start=start,
+                end=end,
+            )
+            self.save_index()
+
+        return df.height - old_count
+
+    def update(
+        self,
+        product_list: list[str],
+        kind: str,
+        resolution: Interval,
+        start: datetime,
+        now: datetime | None = None,
+        max_workers: int = ChartFetcher.DEFAULT_MAX_WORKERS,
+    ) -> dict[str, int]:
+        """Fetch the missing bars of [start, now) for each product.
+        Args:
+            product_list (list[str]):
+                Products, example : ["issueid:360148977", "vwdkey:AAPL.BATS,E"].
+            kind (str):
+                "price", "ohlc" or "volume".
+            resolution (Interval):
+                Resolution of the bars.
+            start (datetime):
+                Beginning of the history.
+            now (datetime, optional):
+                End of the history, the Chart API always ends now.
+                Defaults to None : current datetime, naive in `tz`.
+            max_workers (int, optional):
+                Maximum amount of concurrent requests.
+                Defaults to 8.
+        Returns:
+            dict[str, int]:
+                Amount of bars added for each product fetched.
+        """
+
+        if kind not in ["price", "ohlc", "volume"]:
+            raise ValueError(f"Only timeseries can be stored, kind={kind}")
+
+        now = now or datetime.now(ZoneInfo(self.__tz)).replace(tzinfo=None)
+        self.check_range(start=start, end=now)
+        product_map: dict[Interval, list[str]] = {}
+
+        for product in dict.fromkeys(product_list):
+            gap_list = self.find_gap_list(
+                product=product,
+                kind=kind,
+                resolution=resolution,
+                start=start,
+                end=now,
+            )
+            if gap_list:
+                # ONE REQUEST REACHING THE OLDEST GAP COVERS ALL OF THEM
+                period = self.build_period(start=gap_list[0][0], now=now)
+                product_map.setdefault(period, []).append(product)
+
+        count_map = {}
+
+        for period, period_product_list in product_map.items():
+            chart_request = ChartRequest(
+                culture=self.__culture,
+                period=period,
+                requestid="0",
+                resolution=resolution,
+                tz=self.__tz,
+            )
+
+            for product, chart in self.__chart_fetcher.get_chart_by_product(
+                chart_request=chart_request,
+                product_list=period_product_list,
+                kind_list=[kind],
+                chart_planner=self.__chart_planner,
+                max_workers=max_workers,
+            ):
+                if chart is None or not chart.series:
+                    self.__logger.warning("update:failed %s", product)
+                    continue
+
+                df = SeriesFormatter.format_series(series=chart.series[0])
+                count_map[product] = self.write(
+                    product=product,
+                    kind=kind,
+                    resolution=resolution,
+                    df=df,
+                    start=datetime.fromisoformat(chart.start),
+                    end=self.build_complete_end(
+                        df=df,
+                        resolution=resolution,
+                        end=datetime.fromisoformat(chart.end),
+                    ),
+                )
+
+        return count_map
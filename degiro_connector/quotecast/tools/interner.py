@@ -0,0 +1,105 @@
+class Interner:
+    """Map names to small integer codes : 0, 1, 2...
+
+    A name receives its code the first time it is interned and keeps it
+    afterwards : codes can be used as indexes of lists or arrays instead
+    of hashing strings for each metric.
+
+    Example :
+        product_interner = Interner()
+        product_interner.intern(name="360015751")  # 0
+        product_interner.intern(name="AAPL.BATS,E")  # 1
+        product_interner.intern(name="360015751")  # 0
+        product_interner.name_list[1]  # "AAPL.BATS,E"
+
+    Each name is stored once : the objects which keep the returned name
+    share the same `str` instance.
+
+    Each `intern` must be balanced by a `release` : once a name has no
+    user left, its code is freed and given to the next new name. The
+    holders of per-code indexes rebuild them when `release_count` moves.
+    """
+
+    def __init__(self, name_list: list[str] | None = None):
+        """
+        Args:
+            name_list (list[str], optional):
+                Names to intern, in order of their codes.
+                Defaults to None.
+        """
+
+        self.__code_map: dict[str, int] = {}
+        # AMOUNT OF USERS OF EACH CODE
+        self.__count_list: list[int] = []
+        self.__free_code_list: list[int] = []
+        self.__name_list: list[str | None] = []
+        self.__release_count = 0
+
+        for name in name_list or []:
+            self.intern(name=name)
+
+    @property
+    def code_map(self) -> dict[str, int]:
+        """Code of each name."""
+
+        return self.__code_map
+
+    @property
+    def name_list(self) -> list[str | None]:
+        """Name of each code, None if the code is free."""
+
+        return self.__name_list
+
+    @property
+    def release_count(self) -> int:
+        """Amount of codes freed so far."""
+
+        return self.__release_count
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__code_map
+
+    def __len__(self) -> int:
+        """Amount of names interned."""
+
+        return len(self.__code_map)
+
+    def get_code(self, name: str) -> int | None:
+        return self.__code_map.get(name)
+
+    def intern(self, name: str) -> int:
+        """Code of `name`, counted as one more user of this code."""
+
+        code_map = self.__code_map
+        code = code_map.get(name)
+
+        if code is not None:
+            self.__count_list[code] += 1
+        elif self.__free_code_list:
+            code = self.__free_code_list.pop()
+            code_map[name] = code
+            self.__count_list[code] = 1
+            self.__name_list[code] = name
+        else:
+            code = len(self.__name_list)
+            code_map[name] = code
+            self.__count_list.append(1)
+            self.__name_list.append(name)
+
+        return code
+
+    def release(self, name: str) -> None:
+        """One user less for `name`, crashes on purpose if it is unknown."""
+
+        code = self.__code_map[name]
+        count_list = self.__count_list
+
+        if count_list[code] > 1:
+            count_list[code] -= 1
+            return
+
+        del self.__code_map[name]
+        count_list[code] = 0
+        self.__free_code_list.append(code)
+        self.__name_list[code] = None
+        self.__release_count += 1
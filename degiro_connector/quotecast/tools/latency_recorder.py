@@ -0,0 +1,295 @@
+import math
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable
+
+# STAGES RECORDED BY THE QUOTECAST TOOLS
+STAGE_LIST = [
+    "network",  # HTTP REQUEST, UNTIL THE BODY IS RECEIVED
+    "decode",  # BYTES TO `str`
+    "parse",  # `str` TO JSON OBJECTS
+    "map",  # JSON OBJECTS TO METRICS
+    "build_df",  # METRICS TO `polars.DataFrame`
+]
+
+
+class LatencyHistogram:
+    """Histogram of durations in nanoseconds, with a bounded relative error.
+
+    Like an HDR histogram, the buckets are linear inside each power of
+    two : with `precision_bits=7`, each value is stored with less than
+    1% of error, whatever its magnitude. Recording a value is an O(1)
+    increment inside a preallocated list.
+    """
+
+    DEFAULT_MAX_VALUE = timedelta(minutes=10)
+    DEFAULT_PRECISION_BITS = 7
+
+    def __init__(
+        self,
+        precision_bits: int = DEFAULT_PRECISION_BITS,
+        max_value: timedelta = DEFAULT_MAX_VALUE,
+    ):
+        """
+        Args:
+            precision_bits (int, optional):
+                Amount of bits kept from each value.
+                Defaults to 7.
+            max_value (timedelta, optional):
+                Larger durations are stored as this one.
+                Defaults to 10 minutes.
+        """
+
+        if precision_bits < 2:
+            raise ValueError(f"Invalid precision_bits : {precision_bits}")
+
+        self.__precision_bits = precision_bits
+        self.__sub_bucket_count = 1 << precision_bits
+        self.__half_bucket_count = 1 << (precision_bits - 1)
+        self.__max_value_ns = max_value // timedelta(microseconds=1) * 1000
+        self.__count_list = [0] * (self.get_index(value=self.__max_value_ns) + 1)
+        self.__count = 0
+        self.__max = 0
+        self.__min = 0
+        self.__total = 0
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def max(self) -> int:
+        return self.__max
+
+    @property
+    def min(self) -> int:
+        return self.__min
+
+    @property
+    def total(self) -> int:
+        return self.__total
+
+    def get_index(self, value: int) -> int:
+        """Bucket of a value."""
+
+        if value < self.__sub_bucket_count:
+            return value
+
+        shift = value.bit_length() - self.__precision_bits
+
+        return (
+            self.__sub_bucket_count
+            + (shift - 1) * self.__half_bucket_count
+            + (value >> shift)
+            - self.__half_bucket_count
+        )
+
+    def get_value(self, index: int) -> int:
+        """Highest value stored inside a bucket."""
+
+        if index < self.__sub_bucket_count:
+            return index
+
+        shift, offset = divmod(
+            index - self.__sub_bucket_count,
+            self.__half_bucket_count,
+        )
+
+        return ((self.__half_bucket_count + offset + 1) << (shift + 1)) - 1
+
+    def record(self, value: int) -> None:
+        value = min(max(value, 0), self.__max_value_ns)
+
+        self.__count_list[self.get_index(value=value)] += 1
+
+        if self.__count == 0 or value < self.__min:
+            self.__min = value
+        if value > self.__max:
+            self.__max = value
+
+        self.__count += 1
+        self.__total += value
+
+    def merge(self, histogram: "LatencyHistogram") -> None:
+        """Add the values of another histogram with the same settings."""
+
+        if len(histogram.__count_list) != len(self.__count_list):
+            raise ValueError("Histograms with different settings can't be merged.")
+
+        if histogram.count == 0:
+            return
+
+        for index, count in enumerate(histogram.__count_list):
+            if count:
+                self.__count_list[index] += count
+
+        self.__min = (
+            histogram.min if self.__count == 0 else min(self.__min, histogram.min)
+        )
+        self.__max = max(self.__max, histogram.max)
+        self.__count += histogram.count
+        self.__total += histogram.total
+
+    def get_percentile(self, percentile: float) -> int:
+        """Value below which `percentile` % of the values are, in nanoseconds."""
+
+        if self.__count == 0:
+            return 0
+
+        target = max(1, math.ceil(percentile / 100 * self.__count))
+        cumulative_count = 0
+
+        for index, count in enumerate(self.__count_list):
+            cumulative_count += count
+            if cumulative_count >= target:
+                return min(self.get_value(index=index), self.__max)
+
+        return self.__max
+
+    def reset(self) -> None:
+        count_list = self.__count_list
+
+        for index in range(len(count_list)):
+            count_list[index] = 0
+
+        self.__count = 0
+        self.__max = 0
+        self.__min = 0
+        self.__total = 0
+
+    def build_summary(self) -> dict[str, float]:
+        """Summary of the histogram, durations in microseconds."""
+
+        count = self.__count
+
+        return {
+            "count": count,
+            "min_us": self.__min / 1000,
+            "mean_us": self.__total / count / 1000 if count else 0.0,
+            "p50_us": self.get_percentile(percentile=50) / 1000,
+            "p90_us": self.get_percentile(percentile=90) / 1000,
+            "p99_us": self.get_percentile(percentile=99) / 1000,
+            "p999_us": self.get_percentile(percentile=99.9) / 1000,
+            "max_us": self.__max / 1000,
+        }
+
+
+class LatencyRecorder:
+    """Collect the duration of each stage of the quotecast pipeline.
+
+    The tools accept an optional `latency_recorder` : when it is None,
+    nothing is measured. Otherwise each stage is measured with
+    `time.perf_counter_ns` and stored inside its own `LatencyHistogram`.
+
+    Example :
+        latency_recorder = LatencyRecorder(
+            callback=lambda summary_map: print(summary_map),
+            callback_interval=timedelta(minutes=1),
+        )
+        ticker_session = TickerSession(
+            user_token=user_token,
+            latency_recorder=latency_recorder,
+        )
+
+        while True:
+            ticker = ticker_session.fetch_ticker()
+            ticker_session.ticker_to_metric_list.parse_batch(ticker=ticker)
+
+        latency_recorder.snapshot()
+        # {"network": {"count": 10, "p50_us": 1520.0, ...}, "parse": ...}
+
+    The stages are listed inside `STAGE_LIST`, any other name can be
+    recorded too.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[dict[str, dict[str, float]]], Any] | None = None,
+        callback_interval: timedelta = timedelta(minutes=1),
+        reset_on_callback: bool = True,
+        precision_bits: int = LatencyHistogram.DEFAULT_PRECISION_BITS,
+        max_value: timedelta = LatencyHistogram.DEFAULT_MAX_VALUE,
+    ):
+        """
+        Args:
+            callback (Callable[[dict[str, dict[str, float]]], Any], optional):
+                Called with the summaries every `callback_interval`, from
+                the thread recording the durations.
+                Defaults to None.
+            callback_interval (timedelta, optional):
+                Delay between two calls of `callback`.
+                Defaults to 1 minute.
+            reset_on_callback (bool, optional):
+                Whether or not the histograms are reset after each call of
+                `callback` : each summary then covers one interval.
+                Defaults to True.
+            precision_bits (int, optional):
+                See `LatencyHistogram`.
+                Defaults to 7.
+            max_value (timedelta, optional):
+                See `LatencyHistogram`.
+                Defaults to 10 minutes.
+        """
+
+        self.__callback = callback
+        self.__callback_interval_ns = (
+            callback_interval // timedelta(microseconds=1) * 1000
+        )
+        self.__histogram_map: dict[str, LatencyHistogram] = {}
+        self.__lock = threading.Lock()
+        self.__max_value = max_value
+        self.__next_callback_ns = time.monotonic_ns() + self.__callback_interval_ns
+        self.__precision_bits = precision_bits
+        self.__reset_on_callback = reset_on_callback
+
+    @property
+    def histogram_map(self) -> dict[str, LatencyHistogram]:
+        return self.__histogram_map
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """Store the duration of a stage, in nanoseconds."""
+
+        with self.__lock:
+            histogram = self.__histogram_map.get(stage)
+            if histogram is None:
+                histogram = LatencyHistogram(
+                    precision_bits=self.__precision_bits,
+                    max_value=self.__max_value,
+                )
+                self.__histogram_map[stage] = histogram
+            histogram.record(value=duration_ns)
+
+        if self.__callback is not None and (
+            time.monotonic_ns() >= self.__next_callback_ns
+        ):
+            self.__next_callback_ns = (
+                time.monotonic_ns() + self.__callback_interval_ns
+            )
+            self.__callback(self.snapshot(reset=self.__reset_on_callback))
+
+    def snapshot(self, reset: bool = False) -> dict[str, dict[str, float]]:
+        """Summary of each stage, see `LatencyHistogram.build_summary`.
+        Args:
+            reset (bool, optional):
+                Whether or not to empty the histograms afterwards.
+                Defaults to False.
+        Returns:
+            dict[str, dict[str, float]]: {stage: summary}
+        """
+
+        with self.__lock:
+            summary_map = {
+                stage: histogram.build_summary()
+                for stage, histogram in self.__histogram_map.items()
+            }
+            if reset:
+                for histogram in self.__histogram_map.values():
+                    histogram.reset()
+
+        return summary_map
+
+    def reset(self) -> None:
+        with self.__lock:
+            for histogram in self.__histogram_map.values():
+                histogram.reset()
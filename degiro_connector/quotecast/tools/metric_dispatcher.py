@@ -0,0 +1,252 @@
+import logging
+import threading
+from typing import Any, Callable
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+
+class Subscriber:
+    """Consumer registered inside a `MetricDispatcher`."""
+
+    __slots__ = (
+        "callback",
+        "error_count",
+        "metric_type_set",
+        "product_id_set",
+        "subscriber_id",
+    )
+
+    def __init__(
+        self,
+        subscriber_id: int,
+        callback: Callable[[MetricBatch], Any],
+        product_id_set: set[str] | None,
+        metric_type_set: set[MetricType] | None,
+    ):
+        self.callback = callback
+        self.error_count = 0
+        self.metric_type_set = metric_type_set
+        self.product_id_set = product_id_set
+        self.subscriber_id = subscriber_id
+
+
+class MetricDispatcher:
+    """Deliver a single parsed metric stream to many consumers.
+
+    Each `Ticker` is decoded once, then each consumer receives a single
+    `MetricBatch` with only the metrics it filtered on.
+
+    Example :
+        metric_dispatcher = MetricDispatcher()
+        metric_dispatcher.register(
+            callback=print,
+            product_id_list=["360015751"],
+        )
+        metric_dispatcher.register(
+            callback=conflating_queue.put,
+            metric_type_list=[MetricType.LastPrice],
+        )
+
+        while True:
+            ticker = ticker_session.fetch_ticker()
+            metric_dispatcher.parse(ticker=ticker)
+
+    The routes of each (product, metric) are computed once and cached :
+    the work per metric only depends on the amount of matching consumers.
+    The routes of the released metrics are dropped, and the cache is
+    cleared once it holds `ROUTE_MAP_SIZE` routes.
+
+    An exception raised by a callback is logged and counted, the other
+    consumers still get their metrics.
+    """
+
+    ROUTE_MAP_SIZE = 100_000
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        ticker_to_metric_list: TickerToMetricList | None = None,
+    ):
+        self.__lock = threading.RLock()
+        self.__logger = logger or logging.getLogger(self.__module__)
+        self.__product_index: dict[str | None, list[Subscriber]] = {}
+        self.__route_map: dict[tuple[str, MetricType], tuple[Subscriber, ...]] = {}
+        self.__subscriber_id_next = 0
+        self.__subscriber_map: dict[int, Subscriber] = {}
+        self.__ticker_to_metric_list = ticker_to_metric_list or TickerToMetricList()
+
+    @property
+    def route_count(self) -> int:
+        """Amount of (product, metric) routes cached."""
+
+        return len(self.__route_map)
+
+    @property
+    def subscriber_map(self) -> dict[int, Subscriber]:
+        return dict(self.__subscriber_map)
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    def register(
+        self,
+        callback: Callable[[MetricBatch], Any],
+        product_id_list: list[str] | None = None,
+        metric_type_list: list[MetricType] | list[str] | None = None,
+    ) -> int:
+        """Add a consumer.
+        Args:
+            callback (Callable[[MetricBatch], Any]):
+                Called with the matching metrics of each `Ticker`. It can be
+                the method `put` of a queue.
+            product_id_list (list[str], optional):
+                Products to receive, None for all of them.
+                Defaults to None.
+            metric_type_list (list[MetricType] | list[str], optional):
+                Metrics to receive, None for all of them.
+                Defaults to None.
+        Returns:
+            int: Identifier of the consumer, used by `unregister`.
+        """
+
+        with self.__lock:
+            subscriber_id = self.__subscriber_id_next
+            self.__subscriber_id_next += 1
+
+            subscriber = Subscriber(
+                subscriber_id=subscriber_id,
+                callback=callback,
+                product_id_set=(
+                    None if product_id_list is None else set(product_id_list)
+                ),
+                metric_type_set=(
+                    None
+                    if metric_type_list is None
+                    else set(map(MetricType, metric_type_list))
+                ),
+            )
+            self.__subscriber_map[subscriber_id] = subscriber
+            self.rebuild_index()
+
+        return subscriber_id
+
+    def unregister(self, subscriber_id: int) -> bool:
+        with self.__lock:
+            if self.__subscriber_map.pop(subscriber_id, None) is None:
+                return False
+            self.rebuild_index()
+
+        return True
+
+    def rebuild_index(self) -> None:
+        """Index the consumers by product, the routes are computed again."""
+
+        product_index: dict[str | None, list[Subscriber]] = {}
+
+        for subscriber in self.__subscriber_map.values():
+            if subscriber.product_id_set is None:
+                product_index.setdefault(None, []).append(subscriber)
+            else:
+                for product_id in subscriber.product_id_set:
+                    product_index.setdefault(product_id, []).append(subscriber)
+
+        self.__product_index = product_index
+        self.__route_map = {}
+
+    def build_route(
+        self,
+        product_id: str,
+        metric_type: MetricType,
+    ) -> tuple[Subscriber, ...]:
+        product_index = self.__product_index
+        candidate_list = product_index.get(product_id, []) + product_index.get(
+            None, []
+        )
+        route_map = self.__route_map
+
+        if len(route_map) >= self.ROUTE_MAP_SIZE:
+            route_map.clear()
+
+        route = tuple(
+            sorted(
+                (
+                    subscriber
+                    for subscriber in candidate_list
+                    if subscriber.metric_type_set is None
+                    or metric_type in subscriber.metric_type_set
+                ),
+                key=lambda subscriber: subscriber.subscriber_id,
+            )
+        )
+        route_map[(product_id, metric_type)] = route
+
+        return route
+
+    def release_route_list(self, release_list: list[tuple[str, MetricType]]) -> None:
+        """Drop the routes of unsubscribed metrics."""
+
+        with self.__lock:
+            route_map = self.__route_map
+
+            for product_id, metric_type in release_list:
+                route_map.pop((product_id, metric_type), None)
+
+    def dispatch(self, metric_batch: MetricBatch) -> int:
+        """Deliver the metrics to the matching consumers.
+
+        Returns:
+            int: Amount of consumers which received metrics.
+        """
+
+        logger = self.__logger
+
+        with self.__lock:
+            build_route = self.build_route
+            route_map = self.__route_map
+            batch_map: dict[Subscriber, MetricBatch] = {}
+
+            for product_id, metric_type, value in zip(
+                metric_batch.product_id_list,
+                metric_batch.metric_type_list,
+                metric_batch.value_list,
+            ):
+                route = route_map.get((product_id, metric_type))
+                if route is None:
+                    route = build_route(product_id=product_id, metric_type=metric_type)
+
+                for subscriber in route:
+                    subscriber_batch = batch_map.get(subscriber)
+                    if subscriber_batch is None:
+                        subscriber_batch = batch_map[subscriber] = MetricBatch()
+                    subscriber_batch.product_id_list.append(product_id)
+                    subscriber_batch.metric_type_list.append(metric_type)
+                    subscriber_batch.value_list.append(value)
+
+        for subscriber, subscriber_batch in batch_map.items():
+            try:
+                subscriber.callback(subscriber_batch)
+            except Exception as e:
+                subscriber.error_count += 1
+                logger.fatal(e)
+
+        return len(batch_map)
+
+    def parse(self, ticker: Ticker) -> MetricBatch:
+        """Decode a `Ticker` once and deliver its metrics.
+
+        Returns:
+            MetricBatch: Metrics contained in the `Ticker`.
+        """
+
+        if ticker.json_text == '[{"m":"h"}]':
+            return MetricBatch()
+
+        ticker_to_metric_list = self.__ticker_to_metric_list
+        metric_batch = ticker_to_metric_list.parse_batch(ticker=ticker)
+        self.dispatch(metric_batch=metric_batch)
+        self.release_route_list(release_list=ticker_to_metric_list.last_release_list)
+
+        return metric_batch
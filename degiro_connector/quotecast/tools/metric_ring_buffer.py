@@ -0,0 +1,343 @@
+import struct
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+from degiro_connector.quotecast.models.metric import (
+    METRIC_CODE_MAP,
+    METRIC_TYPE_LIST,
+    MetricBatch,
+)
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+# HEADER : magic | version | capacity | write_sequence
+HEADER = struct.Struct("<4sIQQ40x")
+MAGIC = b"DGRB"
+VERSION = 1
+
+# RECORD : sequence | product_id | metric_type | kind | number | text
+# kind : 0 for a number, 1 for a text
+RECORD = struct.Struct("<Q32sHB5xd24s")
+PRODUCT_ID_SIZE = 32
+TEXT_SIZE = 24
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_INVALID = 2**64 - 1
+
+ATTACH_LOCK = threading.Lock()
+
+
+def attach(name: str) -> shared_memory.SharedMemory:
+    """Attach an existing segment without letting this process destroy it."""
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # BEFORE PYTHON 3.13 ATTACHING ALSO REGISTERS THE SEGMENT : IT WOULD BE
+    # DESTROYED WHEN THIS PROCESS EXITS, OR UNREGISTERED FOR ITS CREATOR
+    with ATTACH_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None  # type: ignore
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register  # type: ignore
+
+
+class MetricRingBufferWriter:
+    """Publish metrics inside a shared-memory ring buffer.
+
+    A single process fetches and decodes the data-stream, many processes
+    on the same host read it with `MetricRingBufferReader`, without any
+    serialization nor extra quotecast session.
+
+    Example :
+        with MetricRingBufferWriter(name="degiro-ticks") as writer:
+            while True:
+                ticker = ticker_session.fetch_ticker()
+                writer.parse(ticker=ticker)
+
+    Each metric is a fixed-size record :
+        * product_id : at most 32 bytes
+        * text values : at most 24 bytes
+
+    A metric which doesn't fit is not written : it is counted inside
+    `drop_count`.
+
+    The records are numbered : when a reader is more than `capacity`
+    records late, the oldest ones are overwritten and the reader detects
+    it through their sequence number.
+    """
+
+    DEFAULT_CAPACITY = 65536
+
+    def __init__(
+        self,
+        name: str | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+        ticker_to_metric_list: TickerToMetricList | None = None,
+    ):
+        if capacity < 1:
+            raise ValueError(f"`capacity` must be positive : {capacity}")
+
+        self.__capacity = capacity
+        self.__drop_count = 0
+        self.__shm = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=HEADER.size + capacity * RECORD.size,
+        )
+        self.__ticker_to_metric_list = ticker_to_metric_list or TickerToMetricList()
+        self.__write_sequence = 0
+
+        HEADER.pack_into(self.__shm.buf, 0, MAGIC, VERSION, capacity, 0)
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def drop_count(self) -> int:
+        """Amount of metrics too long to be written."""
+
+        return self.__drop_count
+
+    @property
+    def name(self) -> str:
+        """Name to give to `MetricRingBufferReader`."""
+
+        return self.__shm.name
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    @property
+    def write_sequence(self) -> int:
+        """Amount of records written since the creation."""
+
+        return self.__write_sequence
+
+    def write(self, metric_batch: MetricBatch) -> int:
+        """Append the metrics to the ring buffer.
+
+        Returns:
+            int: The `write_sequence` after the write.
+        """
+
+        buf = self.__shm.buf
+        capacity = self.__capacity
+        header_size = HEADER.size
+        record_size = RECORD.size
+        record_pack_into = RECORD.pack_into
+        sequence_pack_into = SEQUENCE.pack_into
+        metric_code_map = METRIC_CODE_MAP
+        drop_count = 0
+        sequence = self.__write_sequence
+
+        for product_id, metric_type, value in zip(
+            metric_batch.product_id_list,
+            metric_batch.metric_type_list,
+            metric_batch.value_list,
+        ):
+            product_id_bytes = product_id.encode()
+            text_bytes = value.encode() if isinstance(value, str) else b""
+
+            # `struct` WOULD TRUNCATE THEM SILENTLY
+            if len(product_id_bytes) > PRODUCT_ID_SIZE or len(text_bytes) > TEXT_SIZE:
+                drop_count += 1
+                continue
+
+            offset = header_size + (sequence % capacity) * record_size
+
+            # THE SEQUENCE IS WRITTEN LAST : A READER CAN DETECT A TORN RECORD
+            sequence_pack_into(buf, offset, SEQUENCE_INVALID)
+            if isinstance(value, str):
+                record_pack_into(
+                    buf,
+                    offset,
+                    SEQUENCE_INVALID,
+                    product_id_bytes,
+                    metric_code_map[metric_type],
+                    1,
+                    0.0,
+                    text_bytes,
+                )
+            else:
+                record_pack_into(
+                    buf,
+                    offset,
+                    SEQUENCE_INVALID,
+                    product_id_bytes,
+                    metric_code_map[metric_type],
+                    0,
+                    value,
+                    b"",
+                )
+            sequence_pack_into(buf, offset, sequence)
+            sequence += 1
+
+        self.__drop_count += drop_count
+        self.__write_sequence = sequence
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, capacity, sequence)
+
+        return sequence
+
+    def parse(self, ticker: Ticker) -> MetricBatch:
+        """Decode a `Ticker` and publish its metrics."""
+
+        if ticker.json_text == '[{"m":"h"}]':
+            return MetricBatch()
+
+        metric_batch = self.__ticker_to_metric_list.parse_batch(ticker=ticker)
+        self.write(metric_batch=metric_batch)
+
+        return metric_batch
+
+    def close(self, unlink: bool = True) -> None:
+        """Release the segment, the readers can't attach after `unlink`."""
+
+        self.__shm.close()
+        if unlink:
+            self.__shm.unlink()
+
+    def __enter__(self) -> "MetricRingBufferWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class MetricRingBufferReader:
+    """Read the metrics published by `MetricRingBufferWriter`.
+
+    Example :
+        reader = MetricRingBufferReader(name="degiro-ticks")
+
+        while True:
+            metric_batch = reader.read()
+            if reader.overrun_count:
+                print("Too slow, some metrics were overwritten.")
+
+    Each reader has its own position : many readers can consume the same
+    ring buffer at their own pace.
+    """
+
+    def __init__(self, name: str, from_start: bool = False):
+        """
+        Args:
+            name (str):
+                Name of the ring buffer, see `MetricRingBufferWriter.name`.
+            from_start (bool, optional):
+                Whether or not the records still available are read,
+                instead of only the new ones.
+                Defaults to False.
+        """
+
+        self.__shm = attach(name=name)
+
+        magic, version, capacity, write_sequence = HEADER.unpack_from(self.__shm.buf)
+
+        if magic != MAGIC or version != VERSION:
+            self.__shm.close()
+            raise ValueError(f"Not a metric ring buffer : {name}")
+
+        self.__capacity = capacity
+        self.__overrun_count = 0
+        self.__read_sequence = (
+            max(0, write_sequence - capacity) if from_start else write_sequence
+        )
+
+    @property
+    def lag(self) -> int:
+        """Amount of records written but not read yet."""
+
+        return self.get_write_sequence() - self.__read_sequence
+
+    @property
+    def overrun_count(self) -> int:
+        """Amount of records overwritten before being read."""
+
+        return self.__overrun_count
+
+    @property
+    def read_sequence(self) -> int:
+        return self.__read_sequence
+
+    def get_write_sequence(self) -> int:
+        return HEADER.unpack_from(self.__shm.buf)[3]
+
+    def read(self, max_count: int | None = None) -> MetricBatch:
+        """Returns the metrics written since the last read.
+        Args:
+            max_count (int, optional):
+                Maximum amount of metrics to return, None for all of them.
+                Defaults to None.
+        Returns:
+            MetricBatch: Metrics in the order they were written.
+        """
+
+        buf = self.__shm.buf
+        capacity = self.__capacity
+        header_size = HEADER.size
+        record_size = RECORD.size
+        record_unpack_from = RECORD.unpack_from
+        sequence_unpack_from = SEQUENCE.unpack_from
+        metric_type_list = METRIC_TYPE_LIST
+        write_sequence = self.get_write_sequence()
+        sequence = self.__read_sequence
+
+        if write_sequence - sequence > capacity:
+            self.__overrun_count += write_sequence - capacity - sequence
+            sequence = write_sequence - capacity
+
+        if max_count is not None:
+            write_sequence = min(write_sequence, sequence + max_count)
+
+        product_id_list = []
+        metric_type_list_out = []
+        value_list: list[str | float] = []
+
+        while sequence < write_sequence:
+            offset = header_size + (sequence % capacity) * record_size
+            (
+                record_sequence,
+                product_id,
+                metric_type_index,
+                kind,
+                number,
+                text,
+            ) = record_unpack_from(buf, offset)
+
+            if (
+                record_sequence != sequence
+                or sequence_unpack_from(buf, offset)[0] != sequence
+            ):
+                # OVERWRITTEN WHILE READING : THE WRITER IS A LAP AHEAD
+                self.__overrun_count += 1
+                sequence += 1
+                continue
+
+            product_id_list.append(product_id.rstrip(b"\x00").decode())
+            metric_type_list_out.append(metric_type_list[metric_type_index])
+            value_list.append(
+                text.rstrip(b"\x00").decode(errors="ignore") if kind else number
+            )
+            sequence += 1
+
+        self.__read_sequence = sequence
+
+        return MetricBatch(
+            product_id_list=product_id_list,
+            metric_type_list=metric_type_list_out,
+            value_list=value_list,
+        )
+
+    def close(self) -> None:
+        self.__shm.close()
+
+    def __enter__(self) -> "MetricRingBufferReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,330 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import polars as pl
+
+from degiro_connector.quotecast.models.metric import MetricBatch
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.ticker_to_df import TickerToDF
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+SUFFIX_MAP = {
+    "parquet": ".parquet",
+    "ipc": ".arrow",
+}
+PARTITION_LIST = ["date", "product_id"]
+SCHEMA = {
+    "product_id": pl.Utf8,
+    "metric_type": pl.Utf8,
+    "value_number": pl.Float64,
+    "value_text": pl.Utf8,
+    "response_datetime": pl.Datetime("us", "UTC"),
+    "request_duration_s": pl.Float64,
+}
+
+
+class MetricSink:
+    """Write the parsed metrics inside columnar files, in micro-batches.
+
+    Only the metrics received are written : one row per metric, instead of
+    a snapshot of all the products at each `Ticker`.
+
+    Example :
+        with MetricSink(folder="ticks", partition_by=["date"]) as metric_sink:
+            while True:
+                ticker = ticker_session.fetch_ticker()
+                metric_sink.parse(ticker=ticker)
+
+        df = pl.scan_parquet("ticks/**/*.parquet")
+        df = pl.scan_parquet("ticks/2024-01-05/*.parquet")
+
+    The rows are buffered in memory and written by a background thread,
+    when `batch_size` rows are buffered or every `flush_interval` : the
+    fetch loop never waits for the disk.
+
+    There is one folder per partition, for instance with
+    partition_by=["date", "product_id"] :
+        ticks/2024-01-05/360015751/metric-...-000000.parquet
+
+    Each file contains all the columns : the files can be read without
+    knowing how they were partitioned. The "response_datetime" is stored
+    in UTC, like the outputs of `TickerToDF` : the "date" partition is the
+    UTC date.
+    """
+
+    DEFAULT_BATCH_SIZE = 100_000
+    DEFAULT_FLUSH_INTERVAL = timedelta(seconds=10)
+
+    def __init__(
+        self,
+        folder: str | Path,
+        file_format: str = "parquet",
+        partition_by: list[str] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: timedelta | None = DEFAULT_FLUSH_INTERVAL,
+        compression: str = "zstd",
+        logger: logging.Logger | None = None,
+        prefix: str = "metric",
+    ):
+        """
+        Args:
+            folder (str | Path):
+                Root folder of the files.
+            file_format (str, optional):
+                "parquet" or "ipc" (Arrow IPC).
+                Defaults to "parquet".
+            partition_by (list[str], optional):
+                Partitions among "date" and "product_id".
+                Defaults to None : ["date"].
+            batch_size (int, optional):
+                Rows buffered before being written.
+                Defaults to 100_000.
+            flush_interval (timedelta, optional):
+                Maximum delay before buffered rows are written, None to only
+                write by `batch_size`.
+                Defaults to 10 seconds.
+            compression (str, optional):
+                Compression of the files, see `polars.DataFrame.write_parquet`
+                and `polars.DataFrame.write_ipc`.
+                Defaults to "zstd".
+            logger (logging.Logger, optional):
+                Logger used by the background thread.
+                Defaults to None.
+            prefix (str, optional):
+                Prefix of the file names.
+                Defaults to "metric".
+        """
+
+        if file_format not in SUFFIX_MAP:
+            raise ValueError(f"Unknown file format : {file_format}")
+
+        partition_by = ["date"] if partition_by is None else partition_by
+        for partition in partition_by:
+            if partition not in PARTITION_LIST:
+                raise ValueError(f"Unknown partition : {partition}")
+
+        self.__batch_size = batch_size
+        self.__compression = compression
+        self.__error_count = 0
+        self.__file_format = file_format
+        self.__flush_interval = flush_interval
+        self.__folder = Path(folder)
+        self.__last_flush = time.monotonic()
+        self.__lock = threading.Lock()
+        self.__logger = logger or logging.getLogger(self.__module__)
+        self.__partition_by = partition_by
+        self.__path_list: list[Path] = []
+        self.__prefix = prefix
+        self.__queue: queue.Queue = queue.Queue()
+        self.__row_count = 0
+        self.__ticker_to_metric_list = TickerToMetricList()
+        self.__buffer = self.build_buffer()
+        self.__thread = threading.Thread(target=self.run, daemon=True)
+
+        self.__folder.mkdir(parents=True, exist_ok=True)
+        self.__thread.start()
+
+    @staticmethod
+    def build_buffer() -> dict[str, list]:
+        return {column: [] for column in SCHEMA}
+
+    @property
+    def error_count(self) -> int:
+        """Micro-batches which couldn't be written."""
+
+        return self.__error_count
+
+    @property
+    def path_list(self) -> list[Path]:
+        """Files written by this sink."""
+
+        return list(self.__path_list)
+
+    @property
+    def pending_count(self) -> int:
+        """Rows buffered, not handed to the background thread yet."""
+
+        return len(self.__buffer["product_id"])
+
+    @property
+    def row_count(self) -> int:
+        """Rows written."""
+
+        return self.__row_count
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    def write(
+        self,
+        metric_batch: MetricBatch,
+        response_datetime: datetime,
+        request_duration: timedelta | None = None,
+    ) -> None:
+        """Buffer the metrics, the disk is only used by the background thread.
+
+        A naive `response_datetime` is Paris' time, like `Ticker.response_datetime`.
+        """
+
+        size = len(metric_batch)
+        request_duration_s = (
+            None if request_duration is None else request_duration.total_seconds()
+        )
+        response_datetime = TickerToDF.convert_to_utc(response_datetime).replace(
+            tzinfo=timezone.utc
+        )
+
+        with self.__lock:
+            buffer = self.__buffer
+            buffer["product_id"].extend(metric_batch.product_id_list)
+            buffer["metric_type"].extend(
+                metric_type.value for metric_type in metric_batch.metric_type_list
+            )
+            for value in metric_batch.value_list:
+                if isinstance(value, str):
+                    buffer["value_number"].append(None)
+                    buffer["value_text"].append(value)
+                else:
+                    buffer["value_number"].append(value)
+                    buffer["value_text"].append(None)
+            buffer["response_datetime"].extend([response_datetime] * size)
+            buffer["request_duration_s"].extend([request_duration_s] * size)
+
+        if self.pending_count >= self.__batch_size or self.is_flush_due():
+            self.flush()
+
+    def parse(self, ticker: Ticker) -> MetricBatch:
+        """Decode a `Ticker` then buffer its metrics."""
+
+        if ticker.json_text == '[{"m":"h"}]':
+            return MetricBatch()
+
+        metric_batch = self.__ticker_to_metric_list.parse_batch(ticker=ticker)
+        self.write(
+            metric_batch=metric_batch,
+            response_datetime=ticker.response_datetime,
+            request_duration=ticker.request_duration,
+        )
+
+        return metric_batch
+
+    def is_flush_due(self) -> bool:
+        flush_interval = self.__flush_interval
+
+        return (
+            flush_interval is not None
+            and time.monotonic() - self.__last_flush
+            >= flush_interval.total_seconds()
+        )
+
+    def flush(self, wait: bool = False) -> None:
+        """Hand the buffered rows to the background thread.
+        Args:
+            wait (bool, optional):
+                Whether or not to wait until all the rows are written.
+                Defaults to False.
+        """
+
+        with self.__lock:
+            buffer = self.__buffer
+            self.__buffer = self.build_buffer()
+            self.__last_flush = time.monotonic()
+
+        if buffer["product_id"]:
+            self.__queue.put(buffer)
+
+        if wait:
+            self.__queue.join()
+
+    def build_path(self, partition_key: tuple) -> Path:
+        folder = self.__folder
+
+        for value in partition_key:
+            folder = folder / str(value)
+
+        folder.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        index = len(self.__path_list)
+
+        return folder / (
+            f"{self.__prefix}-{timestamp}-{index:06d}{SUFFIX_MAP[self.__file_format]}"
+        )
+
+    def write_buffer(self, buffer: dict[str, list]) -> None:
+        """Write a micro-batch : one file per partition."""
+
+        partition_by = self.__partition_by
+        df = pl.DataFrame(buffer, schema=SCHEMA)
+
+        if partition_by:
+            df = df.with_columns(pl.col("response_datetime").dt.date().alias("date"))
+            df_map = {
+                partition_key: partition_df.drop("date")
+                for partition_key, partition_df in df.partition_by(
+                    partition_by,
+                    as_dict=True,
+                ).items()
+            }
+        else:
+            df_map = {(): df}
+
+        for partition_key, partition_df in df_map.items():
+            if not isinstance(partition_key, tuple):
+                partition_key = (partition_key,)
+            path = self.build_path(partition_key=partition_key)
+
+            if self.__file_format == "parquet":
+                partition_df.write_parquet(path, compression=self.__compression)
+            else:
+                partition_df.write_ipc(path, compression=self.__compression)
+
+            self.__path_list.append(path)
+
+        self.__row_count += len(df)
+
+    def run(self) -> None:
+        """Loop of the background thread."""
+
+        flush_interval = self.__flush_interval
+        timeout = None if flush_interval is None else flush_interval.total_seconds()
+
+        while True:
+            try:
+                buffer = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                if self.is_flush_due():
+                    self.flush()
+                continue
+
+            if buffer is None:
+                self.__queue.task_done()
+                break
+
+            try:
+                self.write_buffer(buffer=buffer)
+            except Exception as e:
+                self.__error_count += 1
+                self.__logger.fatal(e)
+            finally:
+                self.__queue.task_done()
+
+    def close(self) -> None:
+        """Write the buffered rows then stop the background thread."""
+
+        if not self.__thread.is_alive():
+            return
+
+        self.flush()
+        self.__queue.put(None)
+        self.__thread.join()
+
+    def __enter__(self) -> "MetricSink":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
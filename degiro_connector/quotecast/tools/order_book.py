@@ -0,0 +1,471 @@
+import re
+
+import numpy as np
+import polars as pl
+
+from degiro_connector.quotecast.models.metric import (
+    METRIC_CODE_MAP,
+    Metric,
+    MetricBatch,
+    MetricCodeBatch,
+    MetricType,
+)
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.eviction_policy import EvictionPolicy
+from degiro_connector.quotecast.tools.interner import Interner
+from degiro_connector.quotecast.tools.ticker_to_df import TickerToDF
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+DEPTH_PATTERN = re.compile(r"^([AB])(\d+)(Price|Volume|Orders)$")
+FIELD_LIST = [
+    "ask_price",
+    "ask_volume",
+    "ask_orders",
+    "bid_price",
+    "bid_volume",
+    "bid_orders",
+]
+DEPTH_MAX = 10
+
+
+class OrderBook:
+    """Level-2 order book of many products, stored in columnar arrays.
+
+    Depth metrics (A1Price ... B10Orders) are written in place inside a
+    single preallocated `numpy` array of shape (field, product, level) :
+        * field : ask_price, ask_volume, ask_orders, bid_price, bid_volume,
+          bid_orders (see `FIELD_LIST`)
+        * product : one row per product, in order of appearance
+        * level : 0 for A1/B1 ... 9 for A10/B10
+
+    Missing values are NaN. The other metrics are ignored.
+
+    Example :
+        order_book = OrderBook()
+
+        while True:
+            ticker = ticker_session.fetch_ticker()
+            order_book.parse(ticker=ticker)
+            df = order_book.build_df()
+
+    The properties `ask_price`, `bid_volume`, ... are views : no data is
+    copied, they reflect the next updates, until the capacity grows or a
+    product is evicted.
+
+    A product is evicted when "a_rel" released its last metric or when
+    `eviction_policy` decides so : the remaining rows keep their order.
+
+    This class requires the package `numpy`.
+    """
+
+    DEFAULT_CAPACITY = 64
+
+    @staticmethod
+    def build_slot_map() -> dict[MetricType, tuple[int, int]]:
+        """Position of each depth metric : {metric_type: (field, level)}."""
+
+        slot_map = {}
+
+        for metric_type in MetricType:
+            match = DEPTH_PATTERN.match(metric_type.value)
+            if match is not None:
+                side, level, name = match.groups()
+                field = FIELD_LIST.index(
+                    f"{'ask' if side == 'A' else 'bid'}_{name.lower()}"
+                )
+                slot_map[metric_type] = (field, int(level) - 1)
+
+        return slot_map
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        depth: int = DEPTH_MAX,
+        product_interner: Interner | None = None,
+        eviction_policy: EvictionPolicy | None = None,
+    ):
+        """
+        Args:
+            capacity (int, optional):
+                Amount of products preallocated, it doubles when needed.
+                Defaults to 64.
+            depth (int, optional):
+                Amount of levels stored, from 1 to 10.
+                Defaults to 10.
+            product_interner (Interner, optional):
+                Integer code of each product id, see `TickerToMetricList`.
+                Defaults to None.
+            eviction_policy (EvictionPolicy, optional):
+                Forget the products not updated recently.
+                Defaults to None : products are only forgotten on "a_rel".
+        """
+
+        if not 1 <= depth <= DEPTH_MAX:
+            raise ValueError(f"`depth` must be between 1 and {DEPTH_MAX} : {depth}")
+
+        capacity = max(capacity, 1)
+
+        self.__book = np.full((len(FIELD_LIST), capacity, depth), np.nan)
+        self.__capacity = capacity
+        self.__depth = depth
+        self.__eviction_policy = eviction_policy
+        self.__product_id_list: list[str] = []
+        self.__row_map: dict[str, int] = {}
+        self.__slot_map = {
+            metric_type: slot
+            for metric_type, slot in self.build_slot_map().items()
+            if slot[1] < depth
+        }
+        # ROW OF EACH PRODUCT CODE, -1 IF THE PRODUCT HAS NO ROW YET
+        self.__row_by_code = np.full(capacity, -1, dtype=np.intp)
+        # `release_count` OF THE INTERNER WHEN `__row_by_code` WAS BUILT
+        self.__row_by_code_release_count = 0
+        # FIELD AND LEVEL OF EACH METRIC CODE, -1 IF IT ISN'T A DEPTH METRIC
+        self.__field_by_code = np.full(len(METRIC_CODE_MAP), -1, dtype=np.intp)
+        self.__level_by_code = np.full(len(METRIC_CODE_MAP), -1, dtype=np.intp)
+        for metric_type, (field, level) in self.__slot_map.items():
+            self.__field_by_code[METRIC_CODE_MAP[metric_type]] = field
+            self.__level_by_code[METRIC_CODE_MAP[metric_type]] = level
+        self.__ticker_to_metric_list = TickerToMetricList(
+            product_interner=product_interner,
+        )
+
+    @property
+    def book(self) -> np.ndarray:
+        """View on the whole book : shape (field, product, level)."""
+
+        return self.__book[:, : len(self.__row_map)]
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    @property
+    def eviction_policy(self) -> EvictionPolicy | None:
+        return self.__eviction_policy
+
+    @property
+    def product_id_list(self) -> list[str]:
+        """Product of each row."""
+
+        return self.__product_id_list
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    @property
+    def ask_price(self) -> np.ndarray:
+        return self.__book[0, : len(self.__row_map)]
+
+    @property
+    def ask_volume(self) -> np.ndarray:
+        return self.__book[1, : len(self.__row_map)]
+
+    @property
+    def ask_orders(self) -> np.ndarray:
+        return self.__book[2, : len(self.__row_map)]
+
+    @property
+    def bid_price(self) -> np.ndarray:
+        return self.__book[3, : len(self.__row_map)]
+
+    @property
+    def bid_volume(self) -> np.ndarray:
+        return self.__book[4, : len(self.__row_map)]
+
+    @property
+    def bid_orders(self) -> np.ndarray:
+        return self.__book[5, : len(self.__row_map)]
+
+    def grow(self) -> None:
+        book = self.__book
+        capacity = self.__capacity * 2
+        new_book = np.full((book.shape[0], capacity, book.shape[2]), np.nan)
+        new_book[:, : self.__capacity] = book
+
+        self.__book = new_book
+        self.__capacity = capacity
+
+    def get_row(self, product_id: str) -> int:
+        row_map = self.__row_map
+        row = row_map.get(product_id)
+
+        if row is None:
+            row = len(row_map)
+            if row >= self.__capacity:
+                self.grow()
+            row_map[product_id] = row
+            self.__product_id_list.append(product_id)
+
+        return row
+
+    def update(self, metric_list: list[Metric]) -> int:
+        return self.update_batch(
+            metric_batch=MetricBatch.from_metric_list(metric_list=metric_list)
+        )
+
+    def update_batch(self, metric_batch: MetricBatch) -> int:
+        """Write the depth metrics of `metric_batch` inside the book.
+
+        Returns:
+            int: Amount of depth metrics written.
+        """
+
+        slot_map = self.__slot_map
+        get_row = self.get_row
+        # {(field, row, level): value} : THE LAST VALUE OF A POSITION WINS
+        value_map: dict[tuple[int, int, int], float] = {}
+        metric_count = 0
+
+        for product_id, metric_type, value in zip(
+            metric_batch.product_id_list,
+            metric_batch.metric_type_list,
+            metric_batch.value_list,
+        ):
+            slot = slot_map.get(metric_type)
+            if slot is not None:
+                value_map[(slot[0], get_row(product_id=product_id), slot[1])] = value
+                metric_count += 1
+
+        if value_map:
+            field_tuple, row_tuple, level_tuple = zip(*value_map)
+            self.__book[field_tuple, row_tuple, level_tuple] = np.asarray(
+                list(value_map.values()),
+                dtype=np.float64,
+            )
+
+        return metric_count
+
+    def get_row_array(self, product_code_array: np.ndarray) -> np.ndarray:
+        """Rows of the products, new products receive a row."""
+
+        product_interner = self.__ticker_to_metric_list.product_interner
+        row_by_code = self.__row_by_code
+
+        # A FREED CODE CAN BELONG TO ANOTHER PRODUCT NOW
+        if self.__row_by_code_release_count != product_interner.release_count:
+            row_by_code.fill(-1)
+            self.__row_by_code_release_count = product_interner.release_count
+
+        if product_code_array.max() >= len(row_by_code):
+            size = max(int(product_code_array.max()) + 1, 2 * len(row_by_code))
+            padding = np.full(size - len(row_by_code), -1, dtype=np.intp)
+            row_by_code = np.concatenate([row_by_code, padding])
+            self.__row_by_code = row_by_code
+
+        row_array = row_by_code[product_code_array]
+
+        if (row_array < 0).any():
+            product_id_list = product_interner.name_list
+
+            # IN ORDER OF APPEARANCE, LIKE `get_row`
+            for product_code in product_code_array[row_array < 0].tolist():
+                if row_by_code[product_code] < 0:
+                    row_by_code[product_code] = self.get_row(
+                        product_id=product_id_list[product_code]
+                    )
+            row_array = row_by_code[product_code_array]
+
+        return row_array
+
+    def update_code_batch(self, metric_code_batch: MetricCodeBatch) -> int:
+        """Same than `update_batch`, without any lookup by name.
+
+        The product codes must come from the `product_interner` of this
+        book's `ticker_to_metric_list`.
+
+        Returns:
+            int: Amount of depth metrics written.
+        """
+
+        if len(metric_code_batch) == 0:
+            return 0
+
+        metric_code_array = np.asarray(metric_code_batch.metric_code_list, np.intp)
+        field_array = self.__field_by_code[metric_code_array]
+        (index_array,) = np.nonzero(field_array >= 0)
+
+        if len(index_array) == 0:
+            return 0
+
+        product_code_array = np.asarray(metric_code_batch.product_code_list, np.intp)
+        value_list = metric_code_batch.value_list
+
+        # THE BOOK MAY GROW : ROWS FIRST
+        row_array = self.get_row_array(
+            product_code_array=product_code_array[index_array]
+        )
+        field_array = field_array[index_array]
+        level_array = self.__level_by_code[metric_code_array[index_array]]
+        book = self.__book
+
+        # A FANCY ASSIGNMENT DOESN'T GUARANTEE WHICH DUPLICATE WINS : ONLY
+        # THE LAST VALUE OF EACH POSITION IS KEPT
+        position_array = np.ravel_multi_index(
+            (field_array, row_array, level_array),
+            book.shape,
+        )
+        _unique_array, last_array = np.unique(position_array[::-1], return_index=True)
+        last_array = len(position_array) - 1 - last_array
+        index_list = index_array[last_array].tolist()
+
+        book[
+            field_array[last_array],
+            row_array[last_array],
+            level_array[last_array],
+        ] = np.asarray([value_list[index] for index in index_list], np.float64)
+
+        return len(index_array)
+
+    def parse(self, ticker: Ticker) -> MetricCodeBatch:
+        """Update the book with a `Ticker`.
+
+        Returns:
+            MetricCodeBatch: Metrics contained in the `Ticker`.
+        """
+
+        eviction_policy = self.__eviction_policy
+        ticker_to_metric_list = self.__ticker_to_metric_list
+
+        if ticker.json_text != '[{"m":"h"}]':
+            metric_code_batch = ticker_to_metric_list.parse_code_batch(ticker=ticker)
+            self.update_code_batch(metric_code_batch=metric_code_batch)
+            product_id_list = ticker_to_metric_list.product_interner.name_list
+            evicted_list = TickerToDF.build_evicted_list(
+                ticker_to_metric_list=ticker_to_metric_list,
+                eviction_policy=eviction_policy,
+                product_id_list=[
+                    product_id_list[product_code]
+                    for product_code in dict.fromkeys(
+                        metric_code_batch.product_code_list
+                    )
+                ],
+                now=ticker.response_datetime,
+            )
+        else:
+            metric_code_batch = MetricCodeBatch()
+            # A HEARTBEAT STILL MOVES THE CLOCK OF THE EVICTION POLICY
+            evicted_list = (
+                []
+                if eviction_policy is None
+                else eviction_policy.collect(now=ticker.response_datetime)
+            )
+
+        self.evict(product_id_list=evicted_list)
+
+        return metric_code_batch
+
+    def evict(self, product_id_list: list[str]) -> None:
+        """Forget these products, the remaining rows keep their order."""
+
+        row_map = self.__row_map
+        evicted_row_set = {
+            row_map[product_id]
+            for product_id in product_id_list
+            if product_id in row_map
+        }
+
+        if evicted_row_set:
+            kept_row_list = [
+                row for row in range(len(row_map)) if row not in evicted_row_set
+            ]
+            book = self.__book
+            new_book = np.full(book.shape, np.nan)
+            new_book[:, : len(kept_row_list)] = book[:, kept_row_list]
+
+            self.__book = new_book
+            self.__product_id_list = [
+                self.__product_id_list[row] for row in kept_row_list
+            ]
+            self.__row_map = {
+                product_id: row
+                for row, product_id in enumerate(self.__product_id_list)
+            }
+            self.__row_by_code.fill(-1)
+
+        if self.__eviction_policy is not None:
+            self.__eviction_policy.discard(product_id_list=product_id_list)
+
+    def get_snapshot(self, product_id: str) -> np.ndarray | None:
+        """View on the book of a single product : shape (field, level)."""
+
+        row = self.__row_map.get(product_id)
+
+        if row is None:
+            return None
+
+        return self.__book[:, row]
+
+    def clear(self) -> None:
+        self.__book.fill(np.nan)
+        self.__row_by_code.fill(-1)
+        self.__product_id_list.clear()
+        self.__row_map.clear()
+
+        if self.__eviction_policy is not None:
+            self.__eviction_policy.clear()
+
+    def spread(self) -> np.ndarray:
+        return self.ask_price[:, 0] - self.bid_price[:, 0]
+
+    def mid(self) -> np.ndarray:
+        return (self.ask_price[:, 0] + self.bid_price[:, 0]) / 2
+
+    def microprice(self) -> np.ndarray:
+        """Mid-price weighted by the volumes of the opposite side, at level 1."""
+
+        ask_price = self.ask_price[:, 0]
+        ask_volume = self.ask_volume[:, 0]
+        bid_price = self.bid_price[:, 0]
+        bid_volume = self.bid_volume[:, 0]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (ask_price * bid_volume + bid_price * ask_volume) / (
+                ask_volume + bid_volume
+            )
+
+    def imbalance(self, level_count: int = 1) -> np.ndarray:
+        """Volume imbalance on the first `level_count` levels.
+
+        Returns:
+            np.ndarray:
+                From -1 (only asks) to 1 (only bids), NaN if there is no
+                volume.
+        """
+
+        ask_volume = np.nansum(self.ask_volume[:, :level_count], axis=1)
+        bid_volume = np.nansum(self.bid_volume[:, :level_count], axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (bid_volume - ask_volume) / (bid_volume + ask_volume)
+
+    def build_df(self, level_count: int = 1) -> pl.DataFrame:
+        """Build a DataFrame of the best limits and the derived values.
+
+        Args:
+            level_count (int, optional):
+                Amount of levels used for the imbalance.
+                Defaults to 1.
+        Returns:
+            pl.DataFrame: One row per product.
+        """
+
+        return pl.DataFrame(
+            {
+                "product_id": self.__product_id_list,
+                "bid_price": self.bid_price[:, 0],
+                "bid_volume": self.bid_volume[:, 0],
+                "ask_price": self.ask_price[:, 0],
+                "ask_volume": self.ask_volume[:, 0],
+                "spread": self.spread(),
+                "mid": self.mid(),
+                "microprice": self.microprice(),
+                "imbalance": self.imbalance(level_count=level_count),
+            },
+            nan_to_null=True,
+        )
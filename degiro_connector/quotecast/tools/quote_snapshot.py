@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import httpx
+import polars as pl
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.sharded_ticker_stream import (
+    BalancedShardPolicy,
+    ShardedTickerStream,
+)
+from degiro_connector.quotecast.tools.ticker_to_df import TickerToDFIncremental
+
+
+class QuoteSnapshot:
+    """Current values of many products, fetched once.
+
+    The products are spread across `shard_count` quotecast sessions,
+    polled concurrently. A product is released ("a_rel") as soon as all
+    its metrics were received : the sessions only keep streaming the
+    products still waited for.
+
+    Example :
+        quote_snapshot = QuoteSnapshot(user_token=user_token, shard_count=8)
+        df = quote_snapshot.fetch_sync(product_id_list=product_id_list)
+
+        # OR INSIDE A COROUTINE
+        df = await quote_snapshot.fetch(product_id_list=product_id_list)
+
+    The DataFrame has one row per product, in the order of
+    `product_id_list`, with the same columns than `TickerToDF.parse`.
+
+    A product without all its metrics at the end of `timeout` keeps
+    null values : it is listed inside `missing_product_id_list`. Some
+    metrics are never sent for some products, for instance `LastVolume`
+    of an index. A product rejected by the API is listed there as soon
+    as the rejection is received, the other products keep streaming.
+    """
+
+    DEFAULT_METRIC_TYPE_LIST = [
+        MetricType.LastDate,
+        MetricType.LastTime,
+        MetricType.LastPrice,
+        MetricType.LastVolume,
+    ]
+    DEFAULT_TIMEOUT = timedelta(seconds=10)
+    RELEASE_TIMEOUT = timedelta(seconds=2)
+
+    def __init__(
+        self,
+        user_token: int,
+        shard_count: int = 4,
+        metric_type_list: list[MetricType] | None = None,
+        timeout: timedelta = DEFAULT_TIMEOUT,
+        client: httpx.AsyncClient | None = None,
+        logger: logging.Logger | None = None,
+        quotecast_url: str | None = None,
+    ):
+        """
+        Args:
+            user_token (int):
+                Token used to open the quotecast sessions.
+            shard_count (int, optional):
+                Amount of concurrent quotecast sessions.
+                Defaults to 4.
+            metric_type_list (list[MetricType], optional):
+                Metrics fetched for each product.
+                Defaults to None : LastDate, LastTime, LastPrice and
+                LastVolume.
+            timeout (timedelta, optional):
+                Maximum duration of a snapshot.
+                Defaults to 10 seconds.
+            client (httpx.AsyncClient, optional):
+                Client shared by the sessions, created if None.
+                Defaults to None.
+            logger (logging.Logger, optional):
+                Logger of the sessions.
+                Defaults to None.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
+        """
+
+        self.__client = client
+        self.__logger = logger or logging.getLogger(self.__module__)
+        self.__metric_type_list = metric_type_list or self.DEFAULT_METRIC_TYPE_LIST
+        self.__missing_product_id_list: list[str] = []
+        self.__quotecast_url = quotecast_url
+        self.__shard_count = shard_count
+        self.__timeout = timeout
+        self.__user_token = user_token
+
+    @property
+    def missing_product_id_list(self) -> list[str]:
+        """Products without all their metrics, during the last snapshot."""
+
+        return self.__missing_product_id_list
+
+    def build_ticker_request(
+        self,
+        product_id_list: list[str],
+        request_type: str = "subscription",
+    ) -> TickerRequest:
+        metric_name_list = [metric_type.value for metric_type in self.__metric_type_list]
+
+        return TickerRequest(
+            request_type=request_type,
+            request_map={
+                product_id: list(metric_name_list) for product_id in product_id_list
+            },
+        )
+
+    async def release(
+        self,
+        stream: ShardedTickerStream,
+        product_id_list: list[str],
+    ) -> None:
+        """Unsubscribe products, a failure is only logged."""
+
+        if not product_id_list:
+            return
+
+        # THE SNAPSHOT NEVER WAITS LONG FOR AN UNSUBSCRIPTION
+        try:
+            success = await asyncio.wait_for(
+                stream.unsubscribe(
+                    ticker_request=self.build_ticker_request(
+                        product_id_list=product_id_list,
+                        request_type="unsubscription",
+                    )
+                ),
+                self.RELEASE_TIMEOUT.total_seconds(),
+            )
+        except asyncio.TimeoutError:
+            success = False
+
+        if not success:
+            self.__logger.warning("release:failed %s", len(product_id_list))
+
+    async def fetch(self, product_id_list: list[str]) -> pl.DataFrame:
+        """Fetch the current values of the products.
+        Args:
+            product_id_list (list[str]):
+                Products to fetch, example : ["360015751", "AAPL.BATS,E"].
+        Returns:
+            pl.DataFrame: One row per product.
+        """
+
+        product_id_list = list(dict.fromkeys(product_id_list))
+        metric_type_set = set(self.__metric_type_list)
+        pending_map = {
+            product_id: set(metric_type_set) for product_id in product_id_list
+        }
+        rejected_list: list[str] = []
+        ticker_to_df = TickerToDFIncremental(capacity=len(product_id_list))
+        deadline = time.monotonic() + self.__timeout.total_seconds()
+
+        async with ShardedTickerStream(
+            user_token=self.__user_token,
+            shard_count=self.__shard_count,
+            shard_policy=BalancedShardPolicy(),
+            client=self.__client,
+            logger=self.__logger,
+            quotecast_url=self.__quotecast_url,
+        ) as stream:
+            await stream.subscribe(
+                ticker_request=self.build_ticker_request(
+                    product_id_list=product_id_list
+                )
+            )
+            iterator = aiter(stream)
+
+            while pending_map:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                try:
+                    metric_batch = await asyncio.wait_for(anext(iterator), remaining)
+                except (asyncio.TimeoutError, StopAsyncIteration):
+                    break
+                except Exception as e:
+                    # A SHARD FAILED : ITS PRODUCTS STAY MISSING
+                    self.__logger.fatal(e)
+                    continue
+
+                ticker = stream.last_ticker
+                ticker_to_df.update_batch(
+                    metric_batch=metric_batch,
+                    request_duration=None if ticker is None else ticker.request_duration,
+                    response_datetime=(
+                        None if ticker is None else ticker.response_datetime
+                    ),
+                )
+
+                for product_id, _metric_name in stream.last_reject_list:
+                    if pending_map.pop(product_id, None) is not None:
+                        rejected_list.append(product_id)
+
+                completed_list = []
+                for product_id, metric_type in zip(
+                    metric_batch.product_id_list,
+                    metric_batch.metric_type_list,
+                ):
+                    pending_set = pending_map.get(product_id)
+                    if pending_set is not None:
+                        pending_set.discard(metric_type)
+                        if not pending_set:
+                            del pending_map[product_id]
+                            completed_list.append(product_id)
+
+                await self.release(stream=stream, product_id_list=completed_list)
+
+            await self.release(stream=stream, product_id_list=list(pending_map))
+
+        missing_set = set(rejected_list).union(pending_map)
+        self.__missing_product_id_list = [
+            product_id for product_id in product_id_list if product_id in missing_set
+        ]
+        df = ticker_to_df.build_df()
+        product_df = pl.DataFrame(
+            {"product_id": product_id_list},
+            schema={"product_id": pl.Utf8},
+        )
+
+        if df is None:
+            return product_df
+
+        return product_df.join(df, on="product_id", how="left")
+
+    def fetch_sync(self, product_id_list: list[str]) -> pl.DataFrame:
+        """Same than `fetch`, from synchronous code."""
+
+        return asyncio.run(self.fetch(product_id_list=product_id_list))
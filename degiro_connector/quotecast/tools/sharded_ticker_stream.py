@@ -0,0 +1,374 @@
+import abc
+import asyncio
+import logging
+import zlib
+from datetime import timedelta
+
+import httpx
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+from degiro_connector.quotecast.models.ticker import Ticker, TickerRequest
+from degiro_connector.quotecast.tools.async_ticker_fetcher import AsyncTickerFetcher
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
+from degiro_connector.quotecast.tools.ticker_stream import TickerStream
+
+
+class ShardPolicy(abc.ABC):
+    """Choose which quotecast session receives a new product."""
+
+    @abc.abstractmethod
+    def assign(
+        self,
+        product_id: str,
+        metric_count: int,
+        load_list: list[int],
+    ) -> int:
+        """Returns the index of the shard which will hold `product_id`.
+        Args:
+            product_id (str):
+                Product to assign.
+            metric_count (int):
+                Amount of metrics requested for this product.
+            load_list (list[int]):
+                Amount of metrics currently held by each shard.
+        Returns:
+            int: Index of the shard.
+        """
+
+
+class HashShardPolicy(ShardPolicy):
+    """Stable assignment : a product always goes to the same shard."""
+
+    def assign(
+        self,
+        product_id: str,
+        metric_count: int,
+        load_list: list[int],
+    ) -> int:
+        return zlib.crc32(product_id.encode()) % len(load_list)
+
+
+class BalancedShardPolicy(ShardPolicy):
+    """Assign the product to the shard holding the fewest metrics."""
+
+    def assign(
+        self,
+        product_id: str,
+        metric_count: int,
+        load_list: list[int],
+    ) -> int:
+        return min(range(len(load_list)), key=load_list.__getitem__)
+
+
+class ShardedTickerStream:
+    """Spread a large subscription across many quotecast sessions.
+
+    Each shard is a `TickerStream` : they are polled concurrently and
+    their outputs are merged in a single stream, in the order they were
+    received.
+
+    Example :
+        async with ShardedTickerStream(
+            user_token=user_token,
+            shard_count=4,
+            shard_policy=BalancedShardPolicy(),
+        ) as stream:
+            await stream.subscribe(ticker_request=ticker_request)
+            async for metric_batch in stream:
+                print(metric_batch.to_metric_list())
+
+    A product stays on the shard it was assigned to, until all its metrics
+    are unsubscribed or rejected. A product is only assigned once its shard
+    request succeeded.
+
+    The `Ticker` and the rejected metrics behind the last batch returned
+    are available inside `last_ticker` and `last_reject_list`.
+    """
+
+    CANCEL_ATTEMPT_COUNT = 10
+    CANCEL_INTERVAL = timedelta(seconds=0.5)
+
+    def __init__(
+        self,
+        user_token: int,
+        shard_count: int,
+        shard_policy: ShardPolicy | None = None,
+        client: httpx.AsyncClient | None = None,
+        logger: logging.Logger | None = None,
+        quotecast_url: str | None = None,
+        latency_recorder: LatencyRecorder | None = None,
+    ):
+        if shard_count < 1:
+            raise ValueError(f"`shard_count` must be positive : {shard_count}")
+
+        self.__client_owned = client is None
+        self.__client = client or AsyncTickerFetcher.build_client()
+        self.__logger = logger or logging.getLogger(self.__module__)
+        self.__last_reject_list: list[tuple[str, str]] = []
+        self.__last_ticker: Ticker | None = None
+        self.__load_list = [0] * shard_count
+        self.__metric_map: dict[str, set[str]] = {}
+        self.__product_shard_map: dict[str, int] = {}
+        self.__queue: asyncio.Queue = asyncio.Queue()
+        self.__running_count = 0
+        self.__shard_policy = shard_policy or HashShardPolicy()
+        self.__stream_list = [
+            TickerStream(
+                user_token=user_token,
+                client=self.__client,
+                logger=self.__logger,
+                quotecast_url=quotecast_url,
+                latency_recorder=latency_recorder,
+            )
+            for _ in range(shard_count)
+        ]
+        self.__task_list: list[asyncio.Task] = []
+
+    @property
+    def last_reject_list(self) -> list[tuple[str, str]]:
+        """Metrics rejected ("d") in the payload of the last batch."""
+
+        return self.__last_reject_list
+
+    @property
+    def last_ticker(self) -> Ticker | None:
+        """`Ticker` of the last batch."""
+
+        return self.__last_ticker
+
+    @property
+    def load_list(self) -> list[int]:
+        """Amount of metrics subscribed on each shard."""
+
+        return list(self.__load_list)
+
+    @property
+    def product_shard_map(self) -> dict[str, int]:
+        return dict(self.__product_shard_map)
+
+    @property
+    def stream_list(self) -> list[TickerStream]:
+        return self.__stream_list
+
+    @staticmethod
+    def build_metric_name_list(
+        metric_type_list: list[MetricType] | list[str],
+    ) -> list[str]:
+        return [
+            metric_type.value if isinstance(metric_type, MetricType) else metric_type
+            for metric_type in metric_type_list
+        ]
+
+    def split(self, ticker_request: TickerRequest) -> list[TickerRequest | None]:
+        """Split a `TickerRequest` into one request per shard.
+
+        The shards are assigned to the new products, biggest first. Nothing
+        is recorded : the load and the shard of each product are only
+        updated by `commit`, once a shard request is sent.
+
+        Returns:
+            list[TickerRequest | None]:
+                One request per shard, None if the shard is not concerned.
+        """
+
+        load_list = list(self.__load_list)
+        metric_map = self.__metric_map
+        product_shard_map = self.__product_shard_map
+        shard_policy = self.__shard_policy
+        request_type = ticker_request.request_type
+        request_map_list: list[dict[str, list]] = [{} for _ in load_list]
+
+        item_list = sorted(
+            ticker_request.request_map.items(),
+            key=lambda item: len(item[1]),
+            reverse=True,
+        )
+
+        for product_id, metric_type_list in item_list:
+            shard = product_shard_map.get(product_id)
+
+            if request_type == "subscription":
+                metric_set = metric_map.get(product_id, set())
+                metric_name_list = self.build_metric_name_list(metric_type_list)
+                if shard is None:
+                    shard = shard_policy.assign(
+                        product_id=product_id,
+                        metric_count=len(metric_name_list),
+                        load_list=list(load_list),
+                    )
+                # THE NEXT PRODUCTS OF THIS REQUEST ARE ASSIGNED ON THIS LOAD
+                new_metric_set = metric_set.union(metric_name_list)
+                load_list[shard] += len(new_metric_set) - len(metric_set)
+            elif shard is None:
+                continue
+
+            request_map_list[shard][product_id] = metric_type_list
+
+        return [
+            (
+                TickerRequest(request_type=request_type, request_map=request_map)
+                if request_map
+                else None
+            )
+            for request_map in request_map_list
+        ]
+
+    def commit(self, shard: int, ticker_request: TickerRequest) -> None:
+        """Record the products of a request sent to `shard` : its load and
+        the shard of each product are updated."""
+
+        load_list = self.__load_list
+        metric_map = self.__metric_map
+        product_shard_map = self.__product_shard_map
+
+        for product_id, metric_type_list in ticker_request.request_map.items():
+            metric_name_list = self.build_metric_name_list(metric_type_list)
+            metric_set = metric_map.get(product_id, set())
+
+            if ticker_request.request_type == "subscription":
+                product_shard_map[product_id] = shard
+                new_metric_set = metric_set.union(metric_name_list)
+            elif product_shard_map.get(product_id) == shard:
+                new_metric_set = metric_set.difference(metric_name_list)
+            else:
+                continue
+
+            load_list[shard] += len(new_metric_set) - len(metric_set)
+
+            if new_metric_set:
+                metric_map[product_id] = new_metric_set
+            else:
+                metric_map.pop(product_id, None)
+                product_shard_map.pop(product_id, None)
+
+    def release_reject_list(self, reject_list: list[tuple[str, str]]) -> None:
+        """Forget the metrics rejected by a shard : no shard streams them."""
+
+        for product_id, metric_name in reject_list:
+            shard = self.__product_shard_map.get(product_id)
+
+            if shard is not None:
+                self.commit(
+                    shard=shard,
+                    ticker_request=TickerRequest(
+                        request_type="unsubscription",
+                        request_map={product_id: [metric_name]},
+                    ),
+                )
+
+    async def connect(self) -> list[str | None]:
+        return list(
+            await asyncio.gather(*(stream.connect() for stream in self.__stream_list))
+        )
+
+    async def subscribe(self, ticker_request: TickerRequest) -> bool:
+        """Adds/removes metrics on the relevant shards, concurrently.
+
+        Returns:
+            bool: Whether or not all the shards succeeded.
+        """
+
+        shard_request_list = self.split(ticker_request=ticker_request)
+        shard_list = [
+            shard
+            for shard, shard_request in enumerate(shard_request_list)
+            if shard_request is not None
+        ]
+        result_list = await asyncio.gather(
+            *(
+                self.__stream_list[shard].subscribe(
+                    ticker_request=shard_request_list[shard]
+                )
+                for shard in shard_list
+            )
+        )
+
+        # A FAILED SHARD REQUEST LEAVES THE LOAD AND THE ASSIGNMENTS UNCHANGED
+        for shard, result in zip(shard_list, result_list):
+            if result is True:
+                self.commit(shard=shard, ticker_request=shard_request_list[shard])
+
+        return all(result is True for result in result_list)
+
+    async def unsubscribe(self, ticker_request: TickerRequest) -> bool:
+        return await self.subscribe(
+            ticker_request=ticker_request.model_copy(
+                update={"request_type": "unsubscription"}
+            )
+        )
+
+    async def __poll(self, stream: TickerStream) -> None:
+        queue = self.__queue
+
+        try:
+            async for metric_batch in stream:
+                reject_list = stream.ticker_to_metric_list.last_reject_list
+                if reject_list:
+                    self.release_reject_list(reject_list=reject_list)
+                queue.put_nowait((metric_batch, stream.last_ticker, reject_list))
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(None)
+
+    def start(self) -> None:
+        if self.__task_list:
+            return
+
+        self.__running_count = len(self.__stream_list)
+        self.__task_list = [
+            asyncio.create_task(self.__poll(stream=stream))
+            for stream in self.__stream_list
+        ]
+
+    async def close(self) -> None:
+        pending_set = set(self.__task_list)
+
+        for _attempt in range(self.CANCEL_ATTEMPT_COUNT):
+            if not pending_set:
+                break
+            for task in pending_set:
+                task.cancel()
+            # THE HTTP CLIENT CAN SWALLOW A CANCELLATION : IT IS REPEATED
+            _done_set, pending_set = await asyncio.wait(
+                pending_set,
+                timeout=self.CANCEL_INTERVAL.total_seconds(),
+            )
+
+        for task in pending_set:
+            self.__logger.warning("close:task_still_running %s", task.get_name())
+        self.__task_list = []
+
+        await asyncio.gather(*(stream.close() for stream in self.__stream_list))
+
+        if self.__client_owned:
+            await self.__client.aclose()
+
+    async def __aenter__(self) -> "ShardedTickerStream":
+        await self.connect()
+
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __aiter__(self) -> "ShardedTickerStream":
+        self.start()
+
+        return self
+
+    async def __anext__(self) -> MetricBatch:
+        queue = self.__queue
+
+        while self.__running_count > 0:
+            item = await queue.get()
+
+            if item is None:
+                self.__running_count -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                metric_batch, self.__last_ticker, self.__last_reject_list = item
+                return metric_batch
+
+        raise StopAsyncIteration
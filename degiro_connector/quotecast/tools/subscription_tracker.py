@@ -0,0 +1,113 @@
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
+
+
+class SubscriptionTracker:
+    """Keep track of the metrics currently subscribed on a session.
+
+    Example :
+        {
+            "360017018": {"LastDate", "LastPrice"},
+            "AAPL.BATS,E": {"LastPrice"},
+        }
+    """
+
+    def __init__(self) -> None:
+        self.__subscription_map: dict[str, set[str]] = {}
+
+    @property
+    def subscription_map(self) -> dict[str, set[str]]:
+        return self.__subscription_map
+
+    @property
+    def metric_count(self) -> int:
+        return sum(len(metric_set) for metric_set in self.__subscription_map.values())
+
+    def clear(self) -> None:
+        self.__subscription_map.clear()
+
+    def update(self, ticker_request: TickerRequest) -> None:
+        """Apply a subscription or an unsubscription to the tracked set."""
+
+        subscription_map = self.__subscription_map
+        build_metric_name = TickerFetcher.build_metric_name
+
+        for product_id, metric_type_list in ticker_request.request_map.items():
+            metric_name_set = {
+                build_metric_name(metric_type=metric_type)
+                for metric_type in metric_type_list
+            }
+
+            if ticker_request.request_type == "subscription":
+                subscription_map.setdefault(product_id, set()).update(metric_name_set)
+            elif product_id in subscription_map:
+                metric_set = subscription_map[product_id]
+                metric_set.difference_update(metric_name_set)
+                if not metric_set:
+                    del subscription_map[product_id]
+
+    def build_ticker_request(self) -> TickerRequest | None:
+        """Build the subscription of everything tracked, to replay it at once.
+
+        Returns:
+            TickerRequest | None: None if nothing is tracked.
+        """
+
+        if not self.__subscription_map:
+            return None
+
+        return TickerRequest(
+            request_type="subscription",
+            request_map={
+                product_id: sorted(metric_set)
+                for product_id, metric_set in self.__subscription_map.items()
+            },
+        )
+
+    def diff(
+        self,
+        request_map: dict[str, list[MetricType]] | dict[str, list[str]],
+    ) -> tuple[TickerRequest | None, TickerRequest | None]:
+        """Compute the minimal changes to go from the tracked set to `request_map`.
+        Args:
+            request_map (dict[str, list[MetricType]] | dict[str, list[str]]):
+                All the metrics which should be subscribed.
+        Returns:
+            tuple[TickerRequest | None, TickerRequest | None]:
+                The subscription and the unsubscription to send, None if
+                there is nothing to send.
+        """
+
+        subscription_map = self.__subscription_map
+        build_metric_name = TickerFetcher.build_metric_name
+        desired_map = {
+            product_id: set(map(build_metric_name, metric_type_list))
+            for product_id, metric_type_list in request_map.items()
+        }
+        empty_set: set[str] = set()
+
+        add_map = {}
+        for product_id, metric_set in desired_map.items():
+            missing_set = metric_set - subscription_map.get(product_id, empty_set)
+            if missing_set:
+                add_map[product_id] = sorted(missing_set)
+
+        remove_map = {}
+        for product_id, metric_set in subscription_map.items():
+            extra_set = metric_set - desired_map.get(product_id, empty_set)
+            if extra_set:
+                remove_map[product_id] = sorted(extra_set)
+
+        subscription = (
+            TickerRequest(request_type="subscription", request_map=add_map)
+            if add_map
+            else None
+        )
+        unsubscription = (
+            TickerRequest(request_type="unsubscription", request_map=remove_map)
+            if remove_map
+            else None
+        )
+
+        return subscription, unsubscription
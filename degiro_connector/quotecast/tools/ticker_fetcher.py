@@ -15,9 +15,12 @@ from degiro_connector.core.constants.urls import (
 from degiro_connector.core.constants.headers import HEADERS as HEADER_MAP
 from degiro_connector.quotecast.models.ticker import Ticker, TickerRequest
 from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
 
 
 class TickerFetcher:
+    MAX_PAYLOAD_SIZE = 16384
+
     @staticmethod
     def build_logger() -> logging.Logger:
         return logging.getLogger(__name__)
@@ -66,6 +69,7 @@ class TickerFetcher:
         user_token: int,
         logger: logging.Logger | None = None,
         session: requests.Session | None = None,
+        quotecast_url: str | None = None,
     ) -> str | None:
         """Retrieves the "session_id" necessary to access the data-stream.
         Args:
@@ -77,17 +81,22 @@ class TickerFetcher:
             logger (logging.Logger, optional):
                 This object will be generated if None.
                 Defaults to None.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
         Returns:
             str: Session id
         """
 
+        if quotecast_url is None:
+            quotecast_url = QUOTECAST
+
         if logger is None:
             logger = cls.build_logger()
         if session is None:
             session = cls.build_session()
 
-        url = QUOTECAST
-        url = f"{url}/request_session"
+        url = f"{quotecast_url}/request_session"
         version = QUOTECAST_VERSION
         parameters = {"version": version, "userToken": user_token}
         data = '{"referrer":"https://trader.degiro.nl"}'
@@ -114,6 +123,9 @@ class TickerFetcher:
         session_id: str,
         session: requests.Session | None = None,
         logger: logging.Logger | None = None,
+        raise_exception: bool = False,
+        quotecast_url: str | None = None,
+        latency_recorder: LatencyRecorder | None = None,
     ) -> Ticker | None:
         """Fetches data from the feed.
         Args:
@@ -125,6 +137,16 @@ class TickerFetcher:
             logger (logging.Logger, optional):
                 This object will be generated if None.
                 Defaults to None.
+            raise_exception (bool, optional):
+                Whether or not the BrokenPipeError is raised instead of
+                being logged.
+                Defaults to False.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
+            latency_recorder (LatencyRecorder, optional):
+                Records the "network" and "decode" stages.
+                Defaults to None.
         Raises:
             BrokenPipeError:
                 A new "session_id" is required.
@@ -135,12 +157,15 @@ class TickerFetcher:
                 metadata.request_duration : request duration.
         """
 
+        if quotecast_url is None:
+            quotecast_url = QUOTECAST
+
         if logger is None:
             logger = cls.build_logger()
         if session is None:
             session = cls.build_session()
 
-        url = f"{QUOTECAST}/{session_id}"
+        url = f"{quotecast_url}/{session_id}"
         request = requests.Request(method="GET", url=url)
         prepped = session.prepare_request(request=request)
         start_ns = time.perf_counter_ns()
@@ -149,17 +174,30 @@ class TickerFetcher:
             response = session.send(request=prepped)
             # We could have used : response.elapsed.total_seconds()
             duration_ns = time.perf_counter_ns() - start_ns
+            json_text = response.text
 
-            if response.text == '[{"m":"sr"}]':
+            if latency_recorder is not None:
+                latency_recorder.record(stage="network", duration_ns=duration_ns)
+                latency_recorder.record(
+                    stage="decode",
+                    duration_ns=time.perf_counter_ns() - start_ns - duration_ns,
+                )
+
+            if json_text == '[{"m":"sr"}]':
                 raise BrokenPipeError('A new "session_id" is required.')
 
             ticker = Ticker(
-                json_text=response.text,
+                json_text=json_text,
                 # There is no "date" header returned
                 # We could have used : response.cookies._now
                 response_datetime=datetime.now(),
                 request_duration=timedelta(microseconds=duration_ns // 1000),
             )
+        except BrokenPipeError as e:
+            logger.fatal(e)
+            if raise_exception is True:
+                raise
+            return None
         except requests.HTTPError as e:
             logger.fatal(e)
             if isinstance(e.response, requests.Response):
@@ -171,8 +209,8 @@ class TickerFetcher:
 
         return ticker
 
-    @staticmethod
-    def build_ticker_request_payload(ticker_request: TickerRequest) -> str:
+    @classmethod
+    def build_ticker_request_payload(cls, ticker_request: TickerRequest) -> str:
         """Build a payload like the following:
         '{"controlData":"a_req(360017018.LastDate);a_req(360017018.LastTime);a_req(360017018.LastPrice);"}'
         """
@@ -181,19 +219,74 @@ class TickerFetcher:
         request_type = ticker_request.request_type
         request_function = "a_req" if (request_type == "subscription") else "a_rel"
 
-        payload = '{"controlData":"'
+        control_data = "".join(
+            [
+                f"{request_function}({product_id}.{metric_name});"
+                for product_id, metric_type_list in request_map.items()
+                for metric_name in map(cls.build_metric_name, metric_type_list)
+            ]
+        )
 
-        for product_id, metric_type_list in request_map.items():
-            for metric_type in metric_type_list:
-                if isinstance(metric_type, MetricType):
-                    metric_name = metric_type.name
-                else:
-                    metric_name = metric_type
-                payload += f"{request_function}({product_id}.{metric_name});"
+        return '{"controlData":"' + control_data + '"}'
 
-        payload += '"}'
+    @staticmethod
+    def build_metric_name(metric_type: MetricType | str) -> str:
+        if isinstance(metric_type, MetricType):
+            return metric_type.name
+        else:
+            return metric_type
 
-        return payload
+    @classmethod
+    def split_ticker_request(
+        cls,
+        ticker_request: TickerRequest,
+        max_payload_size: int | None = None,
+    ) -> list[TickerRequest]:
+        """Split a `TickerRequest` into requests with bounded payloads.
+        Args:
+            ticker_request (TickerRequest):
+                Request to split.
+            max_payload_size (int, optional):
+                Maximum size of the payload of each request.
+                Defaults to None : uses `MAX_PAYLOAD_SIZE`.
+        Returns:
+            list[TickerRequest]:
+                Requests whose payload size is at most `max_payload_size`,
+                except if a single metric is already bigger.
+        """
+
+        if max_payload_size is None:
+            max_payload_size = cls.MAX_PAYLOAD_SIZE
+
+        request_type = ticker_request.request_type
+        # len("a_req(") + len(".") + len(");") : same for "a_rel"
+        overhead = 9
+        envelope_size = len('{"controlData":""}')
+
+        ticker_request_list = []
+        request_map: dict[str, list[str]] = {}
+        payload_size = envelope_size
+
+        for product_id, metric_type_list in ticker_request.request_map.items():
+            for metric_name in map(cls.build_metric_name, metric_type_list):
+                size = overhead + len(product_id) + len(metric_name)
+
+                if request_map and payload_size + size > max_payload_size:
+                    ticker_request_list.append(
+                        TickerRequest(request_type=request_type, request_map=request_map)
+                    )
+                    request_map = {}
+                    payload_size = envelope_size
+
+                request_map.setdefault(product_id, []).append(metric_name)
+                payload_size += size
+
+        if request_map:
+            ticker_request_list.append(
+                TickerRequest(request_type=request_type, request_map=request_map)
+            )
+
+        return ticker_request_list
 
     @classmethod
     def subscribe(
@@ -202,6 +295,8 @@ class TickerFetcher:
         session_id: str,
         session: requests.Session | None = None,
         logger: logging.Logger | None = None,
+        raise_exception: bool = False,
+        quotecast_url: str | None = None,
     ) -> bool | None:
         """Adds/removes metric from the data-stream.
         Args:
@@ -224,6 +319,13 @@ class TickerFetcher:
             logger (logging.Logger, optional):
                 This object will be generated if None.
                 Defaults to None.
+            raise_exception (bool, optional):
+                Whether or not the BrokenPipeError is raised instead of
+                being logged.
+                Defaults to False.
+            quotecast_url (str, optional):
+                Root URL of Degiro's Quotecast API.
+                Defaults to None : uses `urls.QUOTECAST`.
         Raises:
             BrokenPipeError:
                 A new "session_id" is required.
@@ -232,13 +334,15 @@ class TickerFetcher:
                 Whether or not the subscription succeeded.
         """
 
+        if quotecast_url is None:
+            quotecast_url = QUOTECAST
+
         if logger is None:
             logger = cls.build_logger()
         if session is None:
             session = cls.build_session()
 
-        url = QUOTECAST
-        url = f"{url}/{session_id}"
+        url = f"{quotecast_url}/{session_id}"
         data = cls.build_ticker_request_payload(ticker_request=ticker_request)
 
         logger.info("subscribe:data %s", data[:100])
@@ -255,6 +359,11 @@ class TickerFetcher:
                 raise BrokenPipeError('A new "session_id" is required.')
 
             return True
+        except BrokenPipeError as e:
+            logger.fatal(e)
+            if raise_exception is True:
+                raise
+            return None
         except requests.HTTPError as e:
             logger.fatal(e)
             if isinstance(e.response, requests.Response):
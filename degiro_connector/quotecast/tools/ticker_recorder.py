@@ -0,0 +1,248 @@
+import gzip
+import struct
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from degiro_connector.quotecast.models.ticker import Ticker
+
+# Each record is : size (uint32) | response_datetime (int64) |
+# request_duration (int64) | json_text (utf-8)
+# Datetimes and durations are stored in microseconds.
+HEADER = struct.Struct("<Iqq")
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+SUFFIX_MAP = {
+    None: ".tick",
+    "gzip": ".tick.gz",
+    "zstd": ".tick.zst",
+}
+
+
+def open_file(path: Path, mode: str) -> BinaryIO:
+    """Open a log file, the compression is deduced from its suffix."""
+
+    if path.name.endswith(SUFFIX_MAP["gzip"]):
+        return gzip.open(path, mode)  # type: ignore
+    elif path.name.endswith(SUFFIX_MAP["zstd"]):
+        import zstandard
+
+        if mode == "rb":
+            return zstandard.open(path, mode)
+        else:
+            return zstandard.open(path, mode, cctx=zstandard.ZstdCompressor())
+    else:
+        return open(path, mode)  # type: ignore
+
+
+class TickerRecorder:
+    """Record raw `Ticker` inside an append-only log.
+
+    The log is a folder of files : a new file is created when the current
+    one reaches `max_file_size` bytes or is older than `rotation_interval`.
+
+    Example :
+        with TickerRecorder(folder="ticks", compression="gzip") as recorder:
+            while True:
+                ticker = TickerFetcher.fetch_ticker(session_id=session_id)
+                recorder.write(ticker=ticker)
+
+    The compression "zstd" requires the package `zstandard`.
+    """
+
+    @staticmethod
+    def build_record(ticker: Ticker) -> bytes:
+        json_bytes = ticker.json_text.encode("utf-8")
+        header = HEADER.pack(
+            len(json_bytes),
+            (ticker.response_datetime.replace(tzinfo=None) - EPOCH) // MICROSECOND,
+            ticker.request_duration // MICROSECOND,
+        )
+
+        return header + json_bytes
+
+    def __init__(
+        self,
+        folder: str | Path,
+        compression: str | None = None,
+        max_file_size: int | None = 256 * 1024 * 1024,
+        prefix: str = "ticker",
+        rotation_interval: timedelta | None = None,
+    ):
+        if compression not in SUFFIX_MAP:
+            raise ValueError(f"Unknown compression : {compression}")
+
+        self.__compression = compression
+        self.__file: BinaryIO | None = None
+        self.__file_opening = 0.0
+        self.__file_size = 0
+        self.__folder = Path(folder)
+        self.__max_file_size = max_file_size
+        self.__path_list: list[Path] = []
+        self.__prefix = prefix
+        self.__record_count = 0
+        self.__rotation_interval = rotation_interval
+
+        self.__folder.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def path_list(self) -> list[Path]:
+        """Files created by this recorder."""
+
+        return list(self.__path_list)
+
+    @property
+    def record_count(self) -> int:
+        return self.__record_count
+
+    def rotate(self) -> Path:
+        """Close the current file and open a new one."""
+
+        self.close()
+
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        index = len(self.__path_list)
+        path = self.__folder / (
+            f"{self.__prefix}-{timestamp}-{index:06d}{SUFFIX_MAP[self.__compression]}"
+        )
+        self.__file = open_file(path=path, mode="wb")
+        self.__file_opening = time.monotonic()
+        self.__file_size = 0
+        self.__path_list.append(path)
+
+        return path
+
+    def is_rotation_required(self) -> bool:
+        max_file_size = self.__max_file_size
+        rotation_interval = self.__rotation_interval
+
+        if self.__file is None:
+            return True
+        elif max_file_size is not None and self.__file_size >= max_file_size:
+            return True
+        elif (
+            rotation_interval is not None
+            and time.monotonic() - self.__file_opening
+            >= rotation_interval.total_seconds()
+        ):
+            return True
+        else:
+            return False
+
+    def write(self, ticker: Ticker) -> None:
+        if self.is_rotation_required():
+            self.rotate()
+
+        record = self.build_record(ticker=ticker)
+        self.__file.write(record)  # type: ignore
+        self.__file_size += len(record)
+        self.__record_count += 1
+
+    def flush(self) -> None:
+        if self.__file is not None:
+            self.__file.flush()
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self) -> "TickerRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class TickerReplayer:
+    """Read back the `Ticker` recorded by `TickerRecorder`.
+
+    Example :
+        ticker_to_df = TickerToDF()
+        replayer = TickerReplayer(path="ticks")
+
+        # speed=1 : wall-clock speed
+        # speed=10 : ten times faster
+        # speed=None : as fast as possible
+        for ticker in replayer.replay(speed=10):
+            ticker_to_df.parse(ticker=ticker)
+    """
+
+    @staticmethod
+    def read_file(path: Path) -> Iterator[Ticker]:
+        header_size = HEADER.size
+        unpack = HEADER.unpack
+
+        with open_file(path=path, mode="rb") as file:
+            while True:
+                header = file.read(header_size)
+
+                if len(header) < header_size:
+                    break
+
+                size, response_datetime_us, request_duration_us = unpack(header)
+                json_bytes = file.read(size)
+
+                if len(json_bytes) < size:
+                    break
+
+                yield Ticker.model_construct(
+                    json_text=json_bytes.decode("utf-8"),
+                    response_datetime=EPOCH + response_datetime_us * MICROSECOND,
+                    request_duration=request_duration_us * MICROSECOND,
+                )
+
+    def __init__(self, path: str | Path):
+        self.__path = Path(path)
+
+    @property
+    def path_list(self) -> list[Path]:
+        """Files to read, in chronological order."""
+
+        path = self.__path
+
+        if path.is_dir():
+            return sorted(
+                child
+                for child in path.iterdir()
+                if any(child.name.endswith(suffix) for suffix in SUFFIX_MAP.values())
+            )
+        else:
+            return [path]
+
+    def read(self) -> Iterator[Ticker]:
+        for path in self.path_list:
+            yield from self.read_file(path=path)
+
+    def replay(self, speed: float | None = 1.0) -> Iterator[Ticker]:
+        """Yield the `Ticker` respecting the delays between them.
+        Args:
+            speed (float | None, optional):
+                Acceleration factor, None to replay as fast as possible.
+                Defaults to 1.0.
+        Yields:
+            Ticker: Recorded ticker.
+        """
+
+        if speed is None:
+            yield from self.read()
+            return
+
+        if speed <= 0:
+            raise ValueError(f"`speed` must be positive : {speed}")
+
+        first_datetime = None
+        start = time.monotonic()
+
+        for ticker in self.read():
+            if first_datetime is None:
+                first_datetime = ticker.response_datetime
+
+            elapsed = (ticker.response_datetime - first_datetime).total_seconds()
+            delay = start + elapsed / speed - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            yield ticker
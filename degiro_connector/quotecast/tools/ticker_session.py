@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+import requests
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.models.ticker import Ticker, TickerRequest
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
+from degiro_connector.quotecast.tools.subscription_tracker import SubscriptionTracker
+from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+
+class TickerSession:
+    """Quotecast session which recovers by itself when it expires.
+
+    The subscriptions are tracked : when Degiro's API answers that a new
+    "session_id" is required, the session is renewed, the references of
+    `ticker_to_metric_list` are reset and all the subscriptions are
+    replayed in a single request.
+
+    The duration between the last successful request and the end of the
+    replay is stored inside `gap_list`.
+
+    Example :
+        ticker_session = TickerSession(user_token=user_token)
+        ticker_session.subscribe(ticker_request=ticker_request)
+
+        while True:
+            ticker = ticker_session.fetch_ticker()
+            metric_list = ticker_session.ticker_to_metric_list.parse(ticker=ticker)
+    """
+
+    GAP_LIST_SIZE = 100
+
+    def __init__(
+        self,
+        user_token: int,
+        logger: logging.Logger | None = None,
+        session: requests.Session | None = None,
+        ticker_to_metric_list: TickerToMetricList | None = None,
+        quotecast_url: str | None = None,
+        latency_recorder: LatencyRecorder | None = None,
+    ):
+        self.__user_token = user_token
+        self.__quotecast_url = quotecast_url
+        self.__latency_recorder = latency_recorder
+        self.__gap_list: deque[timedelta] = deque(maxlen=self.GAP_LIST_SIZE)
+        self.__last_success = time.monotonic()
+        self.__lock = threading.RLock()
+        self.__logger = logger or TickerFetcher.build_logger()
+        self.__outage = False
+        self.__reconnect_count = 0
+        self.__session = session or TickerFetcher.build_session()
+        self.__session_id: str | None = None
+        self.__subscription_tracker = SubscriptionTracker()
+        self.__ticker_to_metric_list = ticker_to_metric_list or TickerToMetricList(
+            latency_recorder=latency_recorder,
+        )
+
+    @property
+    def gap_list(self) -> list[timedelta]:
+        """Duration without data of the last reconnections."""
+
+        return list(self.__gap_list)
+
+    @property
+    def latency_recorder(self) -> LatencyRecorder | None:
+        return self.__latency_recorder
+
+    @property
+    def reconnect_count(self) -> int:
+        return self.__reconnect_count
+
+    @property
+    def session_id(self) -> str | None:
+        return self.__session_id
+
+    @property
+    def subscription_tracker(self) -> SubscriptionTracker:
+        return self.__subscription_tracker
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    def connect(self) -> str | None:
+        """Open a new session : references from the previous one are dropped."""
+
+        with self.__lock:
+            session_id = TickerFetcher.get_session_id(
+                user_token=self.__user_token,
+                logger=self.__logger,
+                session=self.__session,
+                quotecast_url=self.__quotecast_url,
+            )
+            self.__ticker_to_metric_list.reset()
+            self.__session_id = session_id
+
+        return session_id
+
+    def renew(self) -> bool:
+        """Open a new session and replay all the tracked subscriptions.
+
+        Returns:
+            bool: Whether or not the session was recovered.
+        """
+
+        logger = self.__logger
+
+        with self.__lock:
+            # AN OUTAGE LASTS UNTIL A RENEW SUCCEEDS, EVEN AFTER A FAILED `connect`
+            self.__outage = self.__outage or self.__session_id is not None
+            session_id = self.connect()
+
+            if session_id is None:
+                return False
+
+            ticker_request = self.__subscription_tracker.build_ticker_request()
+            if ticker_request is not None and self.send(
+                ticker_request=ticker_request,
+                raise_exception=False,
+            ) is not True:
+                return False
+
+            if self.__outage:
+                gap = timedelta(seconds=time.monotonic() - self.__last_success)
+                self.__gap_list.append(gap)
+                self.__outage = False
+                self.__reconnect_count += 1
+                logger.info("renew:gap %s", gap)
+
+            self.__last_success = time.monotonic()
+
+        return True
+
+    def send(
+        self,
+        ticker_request: TickerRequest,
+        raise_exception: bool = True,
+    ) -> bool | None:
+        """Send a `TickerRequest` in chunks with bounded payloads, untracked."""
+
+        for chunk in TickerFetcher.split_ticker_request(ticker_request=ticker_request):
+            success = TickerFetcher.subscribe(
+                ticker_request=chunk,
+                session_id=self.__session_id,
+                session=self.__session,
+                logger=self.__logger,
+                raise_exception=raise_exception,
+                quotecast_url=self.__quotecast_url,
+            )
+            if success is not True:
+                return success
+
+        return True
+
+    def subscribe(self, ticker_request: TickerRequest) -> bool | None:
+        """Adds/removes metrics and keep track of them.
+
+        The request is only tracked once sent : `renew` never replays a
+        request which failed.
+        """
+
+        with self.__lock:
+            expired = self.__session_id is None
+
+            if not expired:
+                try:
+                    success = self.send(ticker_request=ticker_request)
+                except BrokenPipeError:
+                    expired = True
+
+            if expired:
+                if not self.renew():
+                    return None
+                success = self.send(
+                    ticker_request=ticker_request,
+                    raise_exception=False,
+                )
+
+            if success is True:
+                self.__subscription_tracker.update(ticker_request=ticker_request)
+
+        return success
+
+    def set_subscription(
+        self,
+        request_map: dict[str, list[MetricType]] | dict[str, list[str]],
+    ) -> bool | None:
+        """Only sends the changes between the current subscriptions and
+        `request_map`.
+        Args:
+            request_map (dict[str, list[MetricType]] | dict[str, list[str]]):
+                All the metrics which should be subscribed.
+        Returns:
+            bool | None:
+                Whether or not the changes succeeded.
+        """
+
+        with self.__lock:
+            subscription, unsubscription = self.__subscription_tracker.diff(
+                request_map=request_map
+            )
+            success: bool | None = True
+
+            for ticker_request in [unsubscription, subscription]:
+                if ticker_request is not None and success is True:
+                    success = self.subscribe(ticker_request=ticker_request)
+
+        return success
+
+    def fetch_ticker(self) -> Ticker | None:
+        """Fetches data from the feed, renewing the session if required."""
+
+        if self.__session_id is None and not self.renew():
+            return None
+
+        try:
+            ticker = TickerFetcher.fetch_ticker(
+                session_id=self.__session_id,
+                session=self.__session,
+                logger=self.__logger,
+                raise_exception=True,
+                quotecast_url=self.__quotecast_url,
+                latency_recorder=self.__latency_recorder,
+            )
+        except BrokenPipeError:
+            if not self.renew():
+                return None
+            ticker = TickerFetcher.fetch_ticker(
+                session_id=self.__session_id,
+                session=self.__session,
+                logger=self.__logger,
+                quotecast_url=self.__quotecast_url,
+                latency_recorder=self.__latency_recorder,
+            )
+
+        if ticker is not None:
+            self.__last_success = time.monotonic()
+
+        return ticker
@@ -0,0 +1,329 @@
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from orjson import dumps, loads
+
+CONTROL_DATA_PATTERN = re.compile(r"(a_req|a_rel)\(([^)]+)\)")
+PRODUCT_ID_START = 360000000
+
+
+class SimulatedSession:
+    """State of a quotecast session inside `TickerSimulator`."""
+
+    def __init__(self, session_id: str):
+        self.last_poll = time.monotonic()
+        self.last_tick = time.monotonic()
+        self.message_list: list[dict] = []
+        self.reference_map: dict[str, int] = {}
+        self.reference_next = 1
+        self.session_id = session_id
+
+
+class TickerSimulator:
+    """Local server speaking the same protocol than Degiro's Quotecast API.
+
+    It can be used to test, benchmark or load-test the quotecast tools
+    without credentials nor network.
+
+    Example :
+        with TickerSimulator(universe_size=1000, tick_rate=500) as simulator:
+            ticker_session = TickerSession(
+                user_token=0,
+                quotecast_url=simulator.url,
+            )
+            ticker_session.subscribe(ticker_request=ticker_request)
+            ticker = ticker_session.fetch_ticker()
+
+    The products available are the ids starting at `PRODUCT_ID_START`, see
+    `product_id_list`. Subscribing to another product is rejected with a
+    "d" message.
+    """
+
+    @staticmethod
+    def build_product_id_list(universe_size: int) -> list[str]:
+        return [str(PRODUCT_ID_START + index) for index in range(universe_size)]
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        universe_size: int = 100,
+        tick_rate: float = 100.0,
+        heartbeat_interval: float = 5.0,
+        latency: float = 0.0,
+        session_timeout: float = 15.0,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            host (str, optional):
+                Interface to listen on.
+                Defaults to "127.0.0.1".
+            port (int, optional):
+                Port to listen on, 0 to pick a free one.
+                Defaults to 0.
+            universe_size (int, optional):
+                Amount of products which can be subscribed.
+                Defaults to 100.
+            tick_rate (float, optional):
+                Amount of updates per second, for each session.
+                Defaults to 100.0.
+            heartbeat_interval (float, optional):
+                Seconds without updates before a heartbeat is sent.
+                Defaults to 5.0.
+            latency (float, optional):
+                Seconds waited before answering each request.
+                Defaults to 0.0.
+            session_timeout (float, optional):
+                Seconds without polling before a session expires.
+                Defaults to 15.0.
+            seed (int, optional):
+                Seed of the random values.
+                Defaults to None.
+        """
+
+        self.__condition = threading.Condition()
+        self.__heartbeat_interval = heartbeat_interval
+        self.__latency = latency
+        self.__price_map: dict[str, float] = {}
+        self.__product_id_set = set(self.build_product_id_list(universe_size))
+        self.__random = random.Random(seed)
+        self.__session_map: dict[str, SimulatedSession] = {}
+        self.__session_timeout = session_timeout
+        self.__thread: threading.Thread | None = None
+        self.__tick_rate = tick_rate
+        self.__server = ThreadingHTTPServer((host, port), self.build_handler())
+        self.__server.daemon_threads = True
+
+    @property
+    def product_id_list(self) -> list[str]:
+        return sorted(self.__product_id_set)
+
+    @property
+    def session_id_list(self) -> list[str]:
+        with self.__condition:
+            return list(self.__session_map)
+
+    @property
+    def url(self) -> str:
+        """Value to use as `quotecast_url`."""
+
+        host, port = self.__server.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def build_handler(self) -> type[BaseHTTPRequestHandler]:
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                simulator.handle(handler=self, method="GET")
+
+            def do_POST(self) -> None:
+                simulator.handle(handler=self, method="POST")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        path = handler.path.split("?", 1)[0].strip("/")
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+
+        if self.__latency > 0:
+            time.sleep(self.__latency)
+
+        if method == "POST" and path == "request_session":
+            response = {"sessionId": self.create_session()}
+        elif method == "POST":
+            response = self.control(session_id=path, body=body)
+        else:
+            response = self.poll(session_id=path)
+
+        content = dumps(response)
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def create_session(self) -> str:
+        session_id = str(uuid.uuid4())
+
+        with self.__condition:
+            self.__session_map[session_id] = SimulatedSession(session_id=session_id)
+
+        return session_id
+
+    def expire(self, session_id: str | None = None) -> None:
+        """Drop a session, or all of them if `session_id` is None.
+
+        The next request on this session gets the "sr" message.
+        """
+
+        with self.__condition:
+            if session_id is None:
+                self.__session_map.clear()
+            else:
+                self.__session_map.pop(session_id, None)
+            self.__condition.notify_all()
+
+    def get_session(self, session_id: str) -> SimulatedSession | None:
+        session = self.__session_map.get(session_id)
+
+        if (
+            session is not None
+            and time.monotonic() - session.last_poll > self.__session_timeout
+        ):
+            del self.__session_map[session_id]
+            session = None
+
+        return session
+
+    def build_value(self, product_id: str, metric_name: str) -> tuple[str, object]:
+        """Returns the message type and a random value for a metric."""
+
+        rand = self.__random
+
+        if metric_name.endswith("Price"):
+            price = self.__price_map.get(product_id, 100.0)
+            price = round(max(0.01, price * (1 + rand.gauss(0, 0.001))), 4)
+            self.__price_map[product_id] = price
+            return "un", price
+        elif metric_name.endswith("Volume") or metric_name.endswith("Orders"):
+            return "un", rand.randint(1, 1000)
+        elif metric_name == "LastDate":
+            return "us", datetime.now().strftime("%Y-%m-%d")
+        elif metric_name == "LastTime":
+            return "us", datetime.now().strftime("%H:%M:%S")
+        else:
+            return "us", product_id
+
+    def control(self, session_id: str, body: bytes) -> list[dict] | dict:
+        with self.__condition:
+            session = self.get_session(session_id=session_id)
+
+            if session is None:
+                return [{"m": "sr"}]
+
+            control_data = loads(body or b"{}").get("controlData", "")
+            message_list = session.message_list
+            reference_map = session.reference_map
+
+            # THE TICKS ONLY START WITH THE FIRST SUBSCRIPTION : NO BURST
+            # FOR THE TIME SPENT WITHOUT ANY
+            if not reference_map:
+                session.last_tick = time.monotonic()
+
+            for request_function, name in CONTROL_DATA_PATTERN.findall(control_data):
+                product_id, metric_name = name.rsplit(".", 1)
+
+                if request_function == "a_rel":
+                    reference = reference_map.pop(name, None)
+                    if reference is not None:
+                        message_list.append({"m": "a_rel", "v": [name, reference]})
+                elif product_id not in self.__product_id_set:
+                    message_list.append({"m": "d", "v": [name]})
+                elif name not in reference_map:
+                    reference = session.reference_next
+                    session.reference_next += 1
+                    reference_map[name] = reference
+                    message_type, value = self.build_value(
+                        product_id=product_id,
+                        metric_name=metric_name,
+                    )
+                    message_list.append({"m": "a_req", "v": [name, reference]})
+                    message_list.append({"m": message_type, "v": [reference, value]})
+
+            self.__condition.notify_all()
+
+        return {}
+
+    def build_tick_list(self, session: SimulatedSession) -> list[dict]:
+        now = time.monotonic()
+        tick_count = int((now - session.last_tick) * self.__tick_rate)
+        name_list = list(session.reference_map)
+
+        if tick_count <= 0 or not name_list:
+            return []
+
+        session.last_tick = now
+        message_list = []
+
+        for name in self.__random.choices(name_list, k=tick_count):
+            product_id, metric_name = name.rsplit(".", 1)
+            message_type, value = self.build_value(
+                product_id=product_id,
+                metric_name=metric_name,
+            )
+            message_list.append(
+                {"m": message_type, "v": [session.reference_map[name], value]}
+            )
+
+        return message_list
+
+    def poll(self, session_id: str) -> list[dict]:
+        """Long-poll : waits until messages are available or a heartbeat is due."""
+
+        deadline = time.monotonic() + self.__heartbeat_interval
+
+        with self.__condition:
+            while True:
+                session = self.get_session(session_id=session_id)
+
+                if session is None:
+                    return [{"m": "sr"}]
+
+                session.last_poll = time.monotonic()
+                message_list = session.message_list + self.build_tick_list(
+                    session=session
+                )
+
+                if message_list:
+                    session.message_list = []
+                    return message_list
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    return [{"m": "h"}]
+
+                if session.reference_map and self.__tick_rate > 0:
+                    remaining = min(remaining, 1 / self.__tick_rate)
+
+                self.__condition.wait(timeout=remaining)
+
+    def start(self) -> None:
+        if self.__thread is not None:
+            return
+
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever,
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        if self.__thread is None:
+            return
+
+        self.expire()
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__thread = None
+
+    def __enter__(self) -> "TickerSimulator":
+        self.start()
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
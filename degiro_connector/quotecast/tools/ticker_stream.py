@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import timedelta
+
+import httpx
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+from degiro_connector.quotecast.models.ticker import Ticker, TickerRequest
+from degiro_connector.quotecast.tools.async_ticker_fetcher import AsyncTickerFetcher
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
+from degiro_connector.quotecast.tools.subscription_tracker import SubscriptionTracker
+from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+
+class TickerStream:
+    """Consume one quotecast session with `async for`.
+
+    Example :
+        async with TickerStream(user_token=user_token) as stream:
+            await stream.subscribe(ticker_request=ticker_request)
+            async for metric_batch in stream:
+                print(metric_batch.to_metric_list())
+
+    Many streams can share the same `httpx.AsyncClient` : each stream
+    only holds its own "session_id" and references.
+
+    When the session expires, it is renewed and the tracked subscriptions
+    are replayed : the duration without data is stored inside `gap_list`.
+
+    Heartbeats and payloads without values are skipped. A payload with
+    rejected subscriptions gives a batch, maybe empty : see
+    `ticker_to_metric_list.last_reject_list`.
+
+    A failed fetch is retried after an exponential backoff, with a new
+    session if required : the iteration only stops once `close` is
+    called or after `RETRY_COUNT` failures in a row.
+    """
+
+    GAP_LIST_SIZE = 100
+    RETRY_COUNT = 5
+    RETRY_DELAY = timedelta(seconds=0.5)
+    RETRY_DELAY_MAX = timedelta(seconds=10)
+
+    def __init__(
+        self,
+        user_token: int,
+        client: httpx.AsyncClient | None = None,
+        logger: logging.Logger | None = None,
+        ticker_to_metric_list: TickerToMetricList | None = None,
+        quotecast_url: str | None = None,
+        latency_recorder: LatencyRecorder | None = None,
+    ):
+        self.__user_token = user_token
+        self.__quotecast_url = quotecast_url
+        self.__latency_recorder = latency_recorder
+        self.__client_owned = client is None
+        self.__client = client or AsyncTickerFetcher.build_client()
+        self.__closed = False
+        self.__logger = logger or logging.getLogger(self.__module__)
+        self.__gap_list: deque[timedelta] = deque(maxlen=self.GAP_LIST_SIZE)
+        self.__last_success = time.monotonic()
+        self.__last_ticker: Ticker | None = None
+        self.__outage = False
+        self.__reconnect_count = 0
+        self.__session_id: str | None = None
+        self.__subscription_tracker = SubscriptionTracker()
+        self.__ticker_to_metric_list = ticker_to_metric_list or TickerToMetricList(
+            latency_recorder=latency_recorder,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.__client
+
+    @property
+    def gap_list(self) -> list[timedelta]:
+        """Duration without data of the last reconnections."""
+
+        return list(self.__gap_list)
+
+    @property
+    def last_ticker(self) -> Ticker | None:
+        return self.__last_ticker
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self.__logger
+
+    @property
+    def latency_recorder(self) -> LatencyRecorder | None:
+        return self.__latency_recorder
+
+    @property
+    def reconnect_count(self) -> int:
+        return self.__reconnect_count
+
+    @property
+    def session_id(self) -> str | None:
+        return self.__session_id
+
+    @property
+    def subscription_tracker(self) -> SubscriptionTracker:
+        return self.__subscription_tracker
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    @property
+    def user_token(self) -> int:
+        return self.__user_token
+
+    async def connect(self) -> str | None:
+        """Open a new session : references from the previous one are dropped."""
+
+        session_id = await AsyncTickerFetcher.get_session_id(
+            user_token=self.__user_token,
+            client=self.__client,
+            logger=self.__logger,
+            quotecast_url=self.__quotecast_url,
+        )
+        self.__ticker_to_metric_list.reset()
+        self.__session_id = session_id
+
+        return session_id
+
+    async def renew(self) -> bool:
+        """Open a new session and replay all the tracked subscriptions.
+
+        Returns:
+            bool: Whether or not the session was recovered.
+        """
+
+        # AN OUTAGE LASTS UNTIL A RENEW SUCCEEDS, EVEN AFTER A FAILED `connect`
+        self.__outage = self.__outage or self.__session_id is not None
+        session_id = await self.connect()
+
+        if session_id is None:
+            return False
+
+        ticker_request = self.__subscription_tracker.build_ticker_request()
+        if ticker_request is not None and await self.send(
+            ticker_request=ticker_request,
+            raise_exception=False,
+        ) is not True:
+            return False
+
+        if self.__outage:
+            gap = timedelta(seconds=time.monotonic() - self.__last_success)
+            self.__gap_list.append(gap)
+            self.__outage = False
+            self.__reconnect_count += 1
+            self.__logger.info("renew:gap %s", gap)
+
+        self.__last_success = time.monotonic()
+
+        return True
+
+    async def send(
+        self,
+        ticker_request: TickerRequest,
+        raise_exception: bool = True,
+    ) -> bool | None:
+        """Send a `TickerRequest` in chunks with bounded payloads, untracked."""
+
+        for chunk in TickerFetcher.split_ticker_request(ticker_request=ticker_request):
+            success = await AsyncTickerFetcher.subscribe(
+                ticker_request=chunk,
+                session_id=self.__session_id,
+                client=self.__client,
+                logger=self.__logger,
+                raise_exception=raise_exception,
+                quotecast_url=self.__quotecast_url,
+            )
+            if success is not True:
+                return success
+
+        return True
+
+    async def subscribe(self, ticker_request: TickerRequest) -> bool | None:
+        """Adds/removes metrics, according to `ticker_request.request_type`.
+
+        The request is only tracked once sent : `renew` never replays a
+        request which failed.
+        """
+
+        expired = self.__session_id is None
+
+        if not expired:
+            try:
+                success = await self.send(ticker_request=ticker_request)
+            except BrokenPipeError:
+                expired = True
+
+        if expired:
+            if not await self.renew():
+                return None
+            success = await self.send(
+                ticker_request=ticker_request,
+                raise_exception=False,
+            )
+
+        if success is True:
+            self.__subscription_tracker.update(ticker_request=ticker_request)
+
+        return success
+
+    async def set_subscription(
+        self,
+        request_map: dict[str, list[MetricType]] | dict[str, list[str]],
+    ) -> bool | None:
+        """Only sends the changes between the current subscriptions and
+        `request_map`."""
+
+        subscription, unsubscription = self.__subscription_tracker.diff(
+            request_map=request_map
+        )
+        success: bool | None = True
+
+        for ticker_request in [unsubscription, subscription]:
+            if ticker_request is not None and success is True:
+                success = await self.subscribe(ticker_request=ticker_request)
+
+        return success
+
+    async def unsubscribe(self, ticker_request: TickerRequest) -> bool | None:
+        """Removes the metrics of `ticker_request` whatever its `request_type`."""
+
+        return await self.subscribe(
+            ticker_request=ticker_request.model_copy(
+                update={"request_type": "unsubscription"}
+            )
+        )
+
+    async def fetch_ticker(self) -> Ticker | None:
+        """Fetches data from the feed, renewing the session if required."""
+
+        if self.__session_id is None:
+            return None
+
+        try:
+            ticker = await AsyncTickerFetcher.fetch_ticker(
+                session_id=self.__session_id,
+                client=self.__client,
+                logger=self.__logger,
+                raise_exception=True,
+                quotecast_url=self.__quotecast_url,
+                latency_recorder=self.__latency_recorder,
+            )
+        except BrokenPipeError:
+            if not await self.renew():
+                return None
+            ticker = await AsyncTickerFetcher.fetch_ticker(
+                session_id=self.__session_id,
+                client=self.__client,
+                logger=self.__logger,
+                quotecast_url=self.__quotecast_url,
+                latency_recorder=self.__latency_recorder,
+            )
+
+        if ticker is not None:
+            self.__last_success = time.monotonic()
+        self.__last_ticker = ticker
+
+        return ticker
+
+    async def close(self) -> None:
+        self.__closed = True
+        self.__session_id = None
+
+        if self.__client_owned:
+            await self.__client.aclose()
+
+    async def __aenter__(self) -> "TickerStream":
+        self.__closed = False
+
+        if self.__session_id is None:
+            await self.connect()
+
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __aiter__(self) -> "TickerStream":
+        return self
+
+    async def __anext__(self) -> MetricBatch:
+        ticker_to_metric_list = self.__ticker_to_metric_list
+        failure_count = 0
+
+        while True:
+            ticker = await self.fetch_ticker()
+
+            if ticker is None:
+                if self.__closed or failure_count >= self.RETRY_COUNT:
+                    raise StopAsyncIteration
+
+                delay = min(self.RETRY_DELAY * 2**failure_count, self.RETRY_DELAY_MAX)
+                failure_count += 1
+                self.__logger.warning("fetch:retry %s %s", failure_count, delay)
+                await asyncio.sleep(delay.total_seconds())
+
+                if self.__session_id is None and not self.__closed:
+                    await self.renew()
+                continue
+
+            failure_count = 0
+
+            if ticker.json_text == '[{"m":"h"}]':
+                continue
+
+            metric_batch = ticker_to_metric_list.parse_batch(ticker=ticker)
+
+            if len(metric_batch) > 0 or ticker_to_metric_list.last_reject_list:
+                return metric_batch
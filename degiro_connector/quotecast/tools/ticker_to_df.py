@@ -1,11 +1,26 @@
+import time
 from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 import polars as pl
 
-from degiro_connector.quotecast.models.metric import Metric
+from degiro_connector.quotecast.models.metric import (
+    METRIC_CODE_MAP,
+    METRIC_TYPE_LIST,
+    Metric,
+    MetricBatch,
+    MetricCodeBatch,
+    MetricType,
+)
 from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.eviction_policy import EvictionPolicy
+from degiro_connector.quotecast.tools.interner import Interner
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
 from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
 
+PARIS = ZoneInfo("Europe/Paris")
+
 
 class TickerToDF:
     @staticmethod
@@ -49,25 +64,33 @@ class TickerToDF:
         )
 
         df = df.with_columns(
-            (pl.col("LastDate") + " " + pl.col("LastTime")).alias("LastDatetime")
+            pl.col(column).cast(pl.Float64) for column in price_column_list
         )
-        df = df.drop(["LastDate", "LastTime"])
         df = df.with_columns(
-            pl.col("LastDatetime")
-            .str.strptime(pl.Datetime, format="%Y-%m-%d %H:%M:%S")
-            .alias("LastDatetime")
+            pl.col(column).cast(pl.Int64) for column in volume_column_list
         )
         df = df.with_columns(
-            pl.col("LastDatetime").dt.replace_time_zone("Europe/Paris")
+            pl.col(column).cast(pl.Int64) for column in order_column_list
         )
+        df_utc = TickerToDF.add_last_datetime_column(df=df)
+
+        return df_utc
+
+    @staticmethod
+    def add_last_datetime_column(df: pl.DataFrame) -> pl.DataFrame:
+        """Replace `LastDate` and `LastTime` by `LastDatetimeUTC`."""
+
         df = df.with_columns(
-            pl.col(column).cast(pl.Float64) for column in price_column_list
+            (pl.col("LastDate") + " " + pl.col("LastTime")).alias("LastDatetime")
         )
+        df = df.drop(["LastDate", "LastTime"])
         df = df.with_columns(
-            pl.col(column).cast(pl.Int64) for column in volume_column_list
+            pl.col("LastDatetime")
+            .str.strptime(pl.Datetime, format="%Y-%m-%d %H:%M:%S")
+            .alias("LastDatetime")
         )
         df = df.with_columns(
-            pl.col(column).cast(pl.Int64) for column in order_column_list
+            pl.col("LastDatetime").dt.replace_time_zone("Europe/Paris")
         )
 
         df_utc = df.with_columns(
@@ -80,13 +103,94 @@ class TickerToDF:
 
         return df_utc
 
-    def __init__(self) -> None:
+    @staticmethod
+    def convert_to_utc(response_datetime: datetime) -> datetime:
+        """Convert a reception datetime from Paris' time to naive UTC.
+
+        The conversion is done once per `Ticker`, not once per row.
+        """
+
+        if response_datetime.tzinfo is None:
+            response_datetime = response_datetime.replace(tzinfo=PARIS)
+
+        return response_datetime.astimezone(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def build_product_id_list(metric_list: list[Metric]) -> list[str]:
+        """Products of `metric_list`, without duplicates."""
+
+        return list(dict.fromkeys(metric.product_id for metric in metric_list))
+
+    @staticmethod
+    def merge_product_df(stored_df: pl.DataFrame, new_df: pl.DataFrame) -> pl.DataFrame:
+        """Replace the rows of `stored_df` by the ones of `new_df`, by product."""
+
+        return pl.concat(
+            [stored_df.join(new_df, on="product_id", how="anti"), new_df],
+            rechunk=True,
+        )
+
+    @staticmethod
+    def build_evicted_list(
+        ticker_to_metric_list: TickerToMetricList,
+        eviction_policy: EvictionPolicy | None,
+        product_id_list: list[str],
+        now: datetime,
+    ) -> list[str]:
+        """Products to forget after a `Ticker`.
+
+        A product is evicted when "a_rel" released its last metric or when
+        `eviction_policy` decides so.
+        """
+
+        evicted_list = [
+            product_id
+            for product_id, _metric_type in ticker_to_metric_list.last_release_list
+            if not ticker_to_metric_list.is_subscribed(product_id=product_id)
+        ]
+        evicted_list = list(dict.fromkeys(evicted_list))
+
+        if eviction_policy is not None:
+            eviction_policy.touch(product_id_list=product_id_list, now=now)
+            eviction_policy.discard(product_id_list=evicted_list)
+            evicted_list.extend(eviction_policy.collect(now=now))
+
+        return evicted_list
+
+    def __init__(
+        self,
+        eviction_policy: EvictionPolicy | None = None,
+        latency_recorder: LatencyRecorder | None = None,
+    ) -> None:
+        """
+        Args:
+            eviction_policy (EvictionPolicy, optional):
+                Forget the products not updated recently.
+                Defaults to None : products are only forgotten on "a_rel".
+            latency_recorder (LatencyRecorder, optional):
+                Records the "build_df" stage, and the stages of
+                `ticker_to_metric_list`.
+                Defaults to None.
+        """
+
+        self.__eviction_policy = eviction_policy
+        self.__latency_recorder = latency_recorder
         self.__last_df = None
         self.__last_metric_list = []
-        self.__stored_request_duration_map = {}
-        self.__stored_response_datetime_map = {}
+        self.__stored_request_duration_df = pl.DataFrame(
+            schema={"product_id": pl.Utf8, "request_duration_s": pl.Float64}
+        )
+        self.__stored_response_datetime_df = pl.DataFrame(
+            schema={"product_id": pl.Utf8, "response_datetime_utc": pl.Datetime("us")}
+        )
         self.__stored_metric_list = []
-        self.__ticker_to_metric_list = TickerToMetricList()
+        self.__ticker_to_metric_list = TickerToMetricList(
+            latency_recorder=latency_recorder,
+        )
+
+    @property
+    def eviction_policy(self) -> EvictionPolicy | None:
+        return self.__eviction_policy
 
     @property
     def last_df(self) -> pl.DataFrame | None:
@@ -110,20 +214,18 @@ class TickerToDF:
         last_metric_list: list[Metric],
         ticker: Ticker,
     ) -> pl.DataFrame:
-        request_duration_map = {
-            metric.product_id: ticker.request_duration.total_seconds()
-            for metric in last_metric_list
-        }
-        self.__stored_request_duration_map.update(request_duration_map)
-
-        df = df.with_columns(
-            request_duration_s=pl.col("product_id")
-            .map_elements(lambda x: self.__stored_request_duration_map.get(x, None),
-                          return_dtype=pl.Int64)
-            .cast(pl.Int64)
+        self.__stored_request_duration_df = self.merge_product_df(
+            stored_df=self.__stored_request_duration_df,
+            new_df=pl.DataFrame(
+                {
+                    "product_id": self.build_product_id_list(last_metric_list),
+                    "request_duration_s": ticker.request_duration.total_seconds(),
+                },
+                schema=self.__stored_request_duration_df.schema,
+            ),
         )
 
-        return df
+        return df.join(self.__stored_request_duration_df, on="product_id", how="left")
 
     def add_response_datetime_column(
         self,
@@ -131,42 +233,106 @@ class TickerToDF:
         last_metric_list: list[Metric],
         ticker: Ticker,
     ) -> pl.DataFrame:
-        response_datetime = {
-            metric.product_id: ticker.response_datetime for metric in last_metric_list
-        }
-        self.__stored_response_datetime_map.update(response_datetime)
+        self.__stored_response_datetime_df = self.merge_product_df(
+            stored_df=self.__stored_response_datetime_df,
+            new_df=pl.DataFrame(
+                {
+                    "product_id": self.build_product_id_list(last_metric_list),
+                    "response_datetime_utc": self.convert_to_utc(
+                        ticker.response_datetime
+                    ),
+                },
+                schema=self.__stored_response_datetime_df.schema,
+            ),
+        )
 
-        df = df.with_columns(
-            response_datetime=pl.col("product_id").map_elements(
-                lambda x: self.__stored_response_datetime_map.get(x, None),
-                return_dtype=pl.Datetime
-            )
+        return df.join(self.__stored_response_datetime_df, on="product_id", how="left")
+
+    def evict(self, product_id_list: list[str]) -> None:
+        """Forget everything stored about these products."""
+
+        if not product_id_list:
+            return
+
+        product_id_set = set(product_id_list)
+        is_kept = ~pl.col("product_id").is_in(list(product_id_set))
+
+        self.__stored_metric_list = [
+            metric
+            for metric in self.__stored_metric_list
+            if metric.product_id not in product_id_set
+        ]
+        self.__stored_request_duration_df = self.__stored_request_duration_df.filter(
+            is_kept
         )
-        df = df.with_columns(
-            pl.col("response_datetime").dt.replace_time_zone("Europe/Paris")
+        self.__stored_response_datetime_df = (
+            self.__stored_response_datetime_df.filter(is_kept)
         )
 
-        df = df.with_columns(
-            pl.col("response_datetime")
-            .dt.convert_time_zone("UTC")
-            .alias("response_datetime_utc")
-        )
-        df = df.with_columns(pl.col("response_datetime_utc").dt.replace_time_zone(None))
-        df = df.drop("response_datetime")
+        if self.__eviction_policy is not None:
+            self.__eviction_policy.discard(product_id_list=product_id_list)
 
-        return df
+    def get_memory_usage(self) -> dict[str, int]:
+        """Amount of entries stored and estimated size of the tables, in bytes."""
+
+        ticker_to_metric_list = self.__ticker_to_metric_list
+
+        return {
+            "metric_count": len(self.__stored_metric_list),
+            "product_count": self.__stored_response_datetime_df.height,
+            "reference_count": len(ticker_to_metric_list.reference_map),
+            "estimated_size": (
+                self.__stored_request_duration_df.estimated_size()
+                + self.__stored_response_datetime_df.estimated_size()
+            ),
+        }
 
     def parse(self, ticker: Ticker) -> pl.DataFrame | None:
-        stored_metric_list = self.__stored_metric_list
+        eviction_policy = self.__eviction_policy
         ticker_to_metric_list = self.__ticker_to_metric_list
 
-        if ticker.json_text != '[{"m":"h"}]':
-            last_metric_list = ticker_to_metric_list.parse(ticker=ticker)
-            stored_metric_list = self.merge_metric_list(
-                current_data=stored_metric_list,
-                new_data=last_metric_list,
-            )
+        if ticker.json_text == '[{"m":"h"}]':
+            # A HEARTBEAT STILL MOVES THE CLOCK OF THE EVICTION POLICY
+            if eviction_policy is not None:
+                self.evict(
+                    product_id_list=eviction_policy.collect(
+                        now=ticker.response_datetime
+                    )
+                )
 
+            self.__last_df = None
+            self.__last_metric_list = []
+
+            return None
+
+        last_metric_list = ticker_to_metric_list.parse(ticker=ticker)
+        self.__stored_metric_list = self.merge_metric_list(
+            current_data=self.__stored_metric_list,
+            new_data=last_metric_list,
+        )
+        evicted_list = self.build_evicted_list(
+            ticker_to_metric_list=ticker_to_metric_list,
+            eviction_policy=eviction_policy,
+            product_id_list=self.build_product_id_list(last_metric_list),
+            now=ticker.response_datetime,
+        )
+
+        if evicted_list:
+            evicted_set = set(evicted_list)
+            self.evict(product_id_list=evicted_list)
+            last_metric_list = [
+                metric
+                for metric in last_metric_list
+                if metric.product_id not in evicted_set
+            ]
+
+        stored_metric_list = self.__stored_metric_list
+        latency_recorder = self.__latency_recorder
+
+        if latency_recorder is not None:
+            start_ns = time.perf_counter_ns()
+
+        if stored_metric_list:
             df = self.build_df(metric_list=stored_metric_list)
             df = self.add_request_duration_column(
                 df=df,
@@ -179,11 +345,423 @@ class TickerToDF:
                 ticker=ticker,
             )
         else:
-            last_metric_list = []
             df = None
 
+        if latency_recorder is not None:
+            latency_recorder.record(
+                stage="build_df",
+                duration_ns=time.perf_counter_ns() - start_ns,
+            )
+
         self.__last_df = df
         self.__last_metric_list = last_metric_list
-        self.__stored_metric_list = stored_metric_list
+
+        return df
+
+
+class TickerToDFIncremental:
+    """Keep the latest value of each metric inside a columnar state.
+
+    Each product owns a row and each `MetricType` owns a column : a
+    `Ticker` only updates the cells it contains. The DataFrame is only
+    built when `build_df` is called.
+
+    The rows are preallocated and their capacity doubles when needed.
+    Evicted products free their rows, the capacity is then reused.
+
+    `parse` works on integer codes (see `Interner`) : rows and columns
+    are found by position instead of hashing names.
+    """
+
+    DEFAULT_CAPACITY = 64
+
+    @staticmethod
+    def build_converter(metric_type: MetricType) -> tuple[type, pl.PolarsDataType]:
+        name = metric_type.value
+
+        if name.endswith("Price"):
+            return float, pl.Float64
+        elif name.endswith("Volume") or name.endswith("Orders"):
+            return int, pl.Int64
+        else:
+            return str, pl.Utf8
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        eviction_policy: EvictionPolicy | None = None,
+        product_interner: Interner | None = None,
+        latency_recorder: LatencyRecorder | None = None,
+    ) -> None:
+        """
+        Args:
+            capacity (int, optional):
+                Amount of products preallocated, it doubles when needed.
+                Defaults to 64.
+            eviction_policy (EvictionPolicy, optional):
+                Forget the products not updated recently.
+                Defaults to None : products are only forgotten on "a_rel".
+            product_interner (Interner, optional):
+                Integer code of each product id, see `TickerToMetricList`.
+                Defaults to None.
+            latency_recorder (LatencyRecorder, optional):
+                Records the "build_df" stage, and the stages of
+                `ticker_to_metric_list`.
+                Defaults to None.
+        """
+
+        capacity = max(capacity, 1)
+
+        self.__capacity = capacity
+        self.__column_map: dict[MetricType, list] = {}
+        # SAME COLUMNS THAN `__column_map`, BY METRIC CODE
+        self.__column_list: list[list | None] = [None] * len(METRIC_TYPE_LIST)
+        self.__converter_map = {
+            metric_type: self.build_converter(metric_type=metric_type)
+            for metric_type in MetricType
+        }
+        self.__converter_list = [
+            self.__converter_map[metric_type][0] for metric_type in METRIC_TYPE_LIST
+        ]
+        self.__eviction_policy = eviction_policy
+        self.__last_metric_code_batch = MetricCodeBatch()
+        self.__latency_recorder = latency_recorder
+        self.__product_id_list: list[str | None] = [None] * capacity
+        self.__request_duration_list: list[float | None] = [None] * capacity
+        self.__response_datetime_utc_list: list[datetime | None] = [None] * capacity
+        # ROW OF EACH PRODUCT CODE, -1 IF UNKNOWN
+        self.__row_by_code: list[int] = []
+        # `release_count` OF THE INTERNER WHEN `__row_by_code` WAS BUILT
+        self.__row_by_code_release_count = 0
+        self.__row_map: dict[str, int] = {}
+        self.__ticker_to_metric_list = TickerToMetricList(
+            product_interner=product_interner,
+            latency_recorder=latency_recorder,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def eviction_policy(self) -> EvictionPolicy | None:
+        return self.__eviction_policy
+
+    @property
+    def last_metric_batch(self) -> MetricBatch:
+        """Metrics of the last `Ticker`, decoded from `last_metric_code_batch`."""
+
+        return self.__last_metric_code_batch.to_metric_batch(
+            product_id_list=self.__ticker_to_metric_list.product_interner.name_list
+        )
+
+    @property
+    def last_metric_code_batch(self) -> MetricCodeBatch:
+        return self.__last_metric_code_batch
+
+    @property
+    def product_count(self) -> int:
+        return len(self.__row_map)
+
+    @property
+    def ticker_to_metric_list(self) -> TickerToMetricList:
+        return self.__ticker_to_metric_list
+
+    def grow(self) -> None:
+        capacity = self.__capacity
+        padding = [None] * capacity
+
+        self.__product_id_list.extend(padding)
+        self.__request_duration_list.extend(padding)
+        self.__response_datetime_utc_list.extend(padding)
+        for column in self.__column_map.values():
+            column.extend(padding)
+
+        self.__capacity = capacity * 2
+
+    def get_row(self, product_id: str) -> int:
+        row_map = self.__row_map
+        row = row_map.get(product_id)
+
+        if row is None:
+            row = len(row_map)
+            if row >= self.__capacity:
+                self.grow()
+            row_map[product_id] = row
+            self.__product_id_list[row] = product_id
+
+        return row
+
+    def evict(self, product_id_list: list[str]) -> None:
+        """Forget these products, the remaining rows keep their order."""
+
+        row_map = self.__row_map
+        evicted_row_set = {
+            row_map[product_id]
+            for product_id in product_id_list
+            if product_id in row_map
+        }
+
+        if not evicted_row_set:
+            return
+
+        kept_row_list = [
+            row for row in range(len(row_map)) if row not in evicted_row_set
+        ]
+        padding = [None] * (self.__capacity - len(kept_row_list))
+
+        def compact(column: list) -> list:
+            return [column[row] for row in kept_row_list] + padding
+
+        self.__product_id_list = compact(self.__product_id_list)
+        self.__request_duration_list = compact(self.__request_duration_list)
+        self.__response_datetime_utc_list = compact(
+            self.__response_datetime_utc_list
+        )
+        # A COLUMN ONLY EXISTS IF A REMAINING PRODUCT HAS THIS METRIC
+        self.__column_map = {
+            metric_type: compact(column)
+            for metric_type, column in self.__column_map.items()
+            if any(column[row] is not None for row in kept_row_list)
+        }
+        self.__column_list = [
+            self.__column_map.get(metric_type) for metric_type in METRIC_TYPE_LIST
+        ]
+        self.__row_by_code = []
+        self.__row_map = {
+            product_id: row
+            for row, product_id in enumerate(
+                self.__product_id_list[: len(kept_row_list)]
+            )
+        }
+
+        if self.__eviction_policy is not None:
+            self.__eviction_policy.discard(product_id_list=product_id_list)
+
+    def get_memory_usage(self) -> dict[str, int]:
+        """Amount of entries stored."""
+
+        product_interner = self.__ticker_to_metric_list.product_interner
+
+        return {
+            "capacity": self.__capacity,
+            "code_count": len(product_interner.name_list),
+            "column_count": len(self.__column_map),
+            "interned_count": len(product_interner),
+            "product_count": len(self.__row_map),
+            "reference_count": len(self.__ticker_to_metric_list.reference_map),
+            "row_by_code_count": len(self.__row_by_code),
+        }
+
+    def update(
+        self,
+        metric_list: list[Metric],
+        request_duration: timedelta | None = None,
+        response_datetime: datetime | None = None,
+    ) -> None:
+        """Apply the metrics to the state, only the cells they target change."""
+
+        self.update_batch(
+            metric_batch=MetricBatch.from_metric_list(metric_list=metric_list),
+            request_duration=request_duration,
+            response_datetime=response_datetime,
+        )
+
+    def update_batch(
+        self,
+        metric_batch: MetricBatch,
+        request_duration: timedelta | None = None,
+        response_datetime: datetime | None = None,
+    ) -> None:
+        column_map = self.__column_map
+        converter_map = self.__converter_map
+        request_duration_list = self.__request_duration_list
+        response_datetime_utc_list = self.__response_datetime_utc_list
+        request_duration_s = (
+            None if request_duration is None else request_duration.total_seconds()
+        )
+        response_datetime_utc = (
+            None
+            if response_datetime is None
+            else TickerToDF.convert_to_utc(response_datetime)
+        )
+
+        for product_id, metric_type, value in zip(
+            metric_batch.product_id_list,
+            metric_batch.metric_type_list,
+            metric_batch.value_list,
+        ):
+            row = self.get_row(product_id=product_id)
+            column = column_map.get(metric_type)
+
+            if column is None:
+                column = [None] * self.__capacity
+                column_map[metric_type] = column
+                self.__column_list[METRIC_CODE_MAP[metric_type]] = column
+
+            converter, _dtype = converter_map[metric_type]
+            column[row] = converter(value)
+            request_duration_list[row] = request_duration_s
+            response_datetime_utc_list[row] = response_datetime_utc
+
+    def update_code_batch(
+        self,
+        metric_code_batch: MetricCodeBatch,
+        request_duration: timedelta | None = None,
+        response_datetime: datetime | None = None,
+    ) -> None:
+        """Same than `update_batch`, without any lookup by name.
+
+        The product codes must come from the `product_interner` of this
+        instance's `ticker_to_metric_list`.
+        """
+
+        column_list = self.__column_list
+        converter_list = self.__converter_list
+        product_interner = self.__ticker_to_metric_list.product_interner
+        product_id_list = product_interner.name_list
+        request_duration_list = self.__request_duration_list
+        response_datetime_utc_list = self.__response_datetime_utc_list
+
+        # A FREED CODE CAN BELONG TO ANOTHER PRODUCT NOW
+        if self.__row_by_code_release_count != product_interner.release_count:
+            self.__row_by_code = []
+            self.__row_by_code_release_count = product_interner.release_count
+
+        row_by_code = self.__row_by_code
+        request_duration_s = (
+            None if request_duration is None else request_duration.total_seconds()
+        )
+        response_datetime_utc = (
+            None
+            if response_datetime is None
+            else TickerToDF.convert_to_utc(response_datetime)
+        )
+
+        if len(row_by_code) < len(product_id_list):
+            row_by_code.extend([-1] * (len(product_id_list) - len(row_by_code)))
+
+        for product_code, metric_code, value in zip(
+            metric_code_batch.product_code_list,
+            metric_code_batch.metric_code_list,
+            metric_code_batch.value_list,
+        ):
+            row = row_by_code[product_code]
+
+            if row < 0:
+                row = self.get_row(product_id=product_id_list[product_code])
+                row_by_code[product_code] = row
+
+            column = column_list[metric_code]
+
+            if column is None:
+                column = [None] * self.__capacity
+                column_list[metric_code] = column
+                self.__column_map[METRIC_TYPE_LIST[metric_code]] = column
+
+            column[row] = converter_list[metric_code](value)
+            request_duration_list[row] = request_duration_s
+            response_datetime_utc_list[row] = response_datetime_utc
+
+    def parse(self, ticker: Ticker) -> MetricCodeBatch:
+        """Update the state with a `Ticker` without building any DataFrame.
+
+        Returns:
+            MetricCodeBatch: Metrics contained in the `Ticker`.
+        """
+
+        eviction_policy = self.__eviction_policy
+        ticker_to_metric_list = self.__ticker_to_metric_list
+
+        if ticker.json_text != '[{"m":"h"}]':
+            last_metric_code_batch = ticker_to_metric_list.parse_code_batch(
+                ticker=ticker
+            )
+            self.update_code_batch(
+                metric_code_batch=last_metric_code_batch,
+                request_duration=ticker.request_duration,
+                response_datetime=ticker.response_datetime,
+            )
+            product_id_list = ticker_to_metric_list.product_interner.name_list
+            evicted_list = TickerToDF.build_evicted_list(
+                ticker_to_metric_list=ticker_to_metric_list,
+                eviction_policy=eviction_policy,
+                product_id_list=[
+                    product_id_list[product_code]
+                    for product_code in dict.fromkeys(
+                        last_metric_code_batch.product_code_list
+                    )
+                ],
+                now=ticker.response_datetime,
+            )
+        else:
+            last_metric_code_batch = MetricCodeBatch()
+            # A HEARTBEAT STILL MOVES THE CLOCK OF THE EVICTION POLICY
+            evicted_list = (
+                []
+                if eviction_policy is None
+                else eviction_policy.collect(now=ticker.response_datetime)
+            )
+
+        self.evict(product_id_list=evicted_list)
+
+        self.__last_metric_code_batch = last_metric_code_batch
+
+        return last_metric_code_batch
+
+    def build_df(self) -> pl.DataFrame | None:
+        """Build a DataFrame from the current state.
+
+        Returns:
+            pl.DataFrame | None:
+                Same columns than `TickerToDF.parse` or None if no metric
+                was received yet.
+        """
+
+        row_count = len(self.__row_map)
+        column_map = self.__column_map
+        converter_map = self.__converter_map
+        latency_recorder = self.__latency_recorder
+
+        if row_count == 0:
+            return None
+
+        if latency_recorder is not None:
+            start_ns = time.perf_counter_ns()
+
+        series_list = [
+            pl.Series("product_id", self.__product_id_list[:row_count], pl.Utf8)
+        ]
+        for metric_type in MetricType:
+            column = column_map.get(metric_type)
+            if column is not None:
+                _converter, dtype = converter_map[metric_type]
+                series_list.append(
+                    pl.Series(metric_type.value, column[:row_count], dtype)
+                )
+
+        df = pl.DataFrame(series_list)
+
+        if MetricType.LastDate in column_map and MetricType.LastTime in column_map:
+            df = TickerToDF.add_last_datetime_column(df=df)
+
+        df = df.with_columns(
+            pl.Series(
+                "request_duration_s",
+                self.__request_duration_list[:row_count],
+                pl.Float64,
+            ),
+            pl.Series(
+                "response_datetime_utc",
+                self.__response_datetime_utc_list[:row_count],
+                pl.Datetime("us"),
+            ),
+        )
+
+        if latency_recorder is not None:
+            latency_recorder.record(
+                stage="build_df",
+                duration_ns=time.perf_counter_ns() - start_ns,
+            )
 
         return df
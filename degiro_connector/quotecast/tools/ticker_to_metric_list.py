@@ -1,3 +1,5 @@
+import time
+
 import orjson as json
 
 
@@ -9,10 +11,15 @@ from degiro_connector.quotecast.models.message import (
     MessageUnregistration,
 )
 from degiro_connector.quotecast.models.metric import (
+    METRIC_CODE_MAP,
     Metric,
+    MetricBatch,
+    MetricCodeBatch,
     MetricType,
 )
 from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.interner import Interner
+from degiro_connector.quotecast.tools.latency_recorder import LatencyRecorder
 
 
 class TickerToMetricList:
@@ -202,6 +209,8 @@ class TickerToMetricList:
     def __init__(
         self,
         reference_map: dict[int, list] | None = None,
+        product_interner: Interner | None = None,
+        latency_recorder: LatencyRecorder | None = None,
     ) -> None:
         """
 
@@ -211,25 +220,174 @@ class TickerToMetricList:
                 Dictionnary storing the references returned by Degiro's Quotecast.
                 Each reference number matches with a specific product/metric_type set.
                 Example : {reference_number: [product_id, metric_type]}
+            product_interner: Interner | None
+                Integer code of each product id, can be shared between
+                many instances to get the same codes.
+            latency_recorder: LatencyRecorder | None
+                Records the "parse" and "map" stages of `parse_batch` and
+                `parse_code_batch`.
         """
         # {reference: [product_id, metric_type]}
         self._reference_map: dict[int, list] = reference_map or {}
+        # {reference: (product_code, metric_code)}
+        self._reference_code_map: dict[int, tuple[int, int]] = {}
+        # {product_id: amount_of_references}
+        self._product_count_map: dict[str, int] = {}
+        self._latency_recorder = latency_recorder
+        self._product_interner = product_interner or Interner()
+        # [(product_id, metric_type)] released by the last parsed `Ticker`
+        self._last_release_list: list[tuple[str, MetricType]] = []
+        # [(product_id, metric_name)] rejected by the last parsed `Ticker`
+        self._last_reject_list: list[tuple[str, str]] = []
+        # [product_id] WHOSE CODE IS RELEASED BEFORE THE NEXT `Ticker`
+        self._pending_release_list: list[str] = []
+
+        for reference, (product_id, metric_type) in list(self._reference_map.items()):
+            del self._reference_map[reference]
+            self.register(
+                reference=reference,
+                metric_name=f"{product_id}.{MetricType(metric_type).value}",
+            )
+
+    @property
+    def last_release_list(self) -> list[tuple[str, MetricType]]:
+        """Metrics unsubscribed ("a_rel") by the last parsed `Ticker`."""
+
+        return self._last_release_list
+
+    @property
+    def last_reject_list(self) -> list[tuple[str, str]]:
+        """Metrics rejected ("d") by the last parsed `Ticker`.
+
+        Filled by `parse`, `parse_batch` and `parse_code_batch` : a rejected
+        product doesn't stop the parsing of the other messages. Only `parse`
+        raises an `AttributeError` afterwards when this list isn't empty.
+        """
+
+        return self._last_reject_list
+
+    @property
+    def product_id_set(self) -> set[str]:
+        """Products with at least one metric subscribed."""
+
+        return set(self._product_count_map)
+
+    @property
+    def latency_recorder(self) -> LatencyRecorder | None:
+        return self._latency_recorder
+
+    @property
+    def product_interner(self) -> Interner:
+        return self._product_interner
+
+    @property
+    def reference_map(self) -> dict[int, list]:
+        return self._reference_map
+
+    @property
+    def reference_code_map(self) -> dict[int, tuple[int, int]]:
+        """Same than `reference_map` with integer codes."""
+
+        return self._reference_code_map
+
+    def get_memory_usage(self) -> dict[str, int]:
+        """Amount of entries held in memory."""
+
+        product_interner = self._product_interner
+
+        return {
+            "code_count": len(product_interner.name_list),
+            "interned_count": len(product_interner),
+            "product_count": len(self._product_count_map),
+            "reference_count": len(self._reference_map),
+        }
+
+    def is_subscribed(self, product_id: str) -> bool:
+        return product_id in self._product_count_map
+
+    def register(self, reference: int, metric_name: str) -> None:
+        """Store the meaning of a reference, example : "360017018.LastPrice"."""
+
+        if reference in self._reference_map:
+            self.release(reference=reference)
+
+        product_id, metric_name = metric_name.rsplit(sep=".", maxsplit=1)
+        metric_type = MetricType(metric_name)
+        product_interner = self._product_interner
+        product_code = product_interner.intern(name=product_id)
+
+        # THE SAME `str` IS SHARED BY ALL THE REFERENCES OF A PRODUCT
+        product_id = product_interner.name_list[product_code]
+        self._reference_map[reference] = [product_id, metric_type]
+        self._reference_code_map[reference] = (
+            product_code,
+            METRIC_CODE_MAP[metric_type],
+        )
+        self._product_count_map[product_id] = (
+            self._product_count_map.get(product_id, 0) + 1
+        )
+
+    def release(self, reference: int) -> tuple[str, MetricType]:
+        """Forget a reference, crashes on purpose if it is unknown."""
+
+        product_id, metric_type = self._reference_map.pop(reference)
+        del self._reference_code_map[reference]
+        product_count_map = self._product_count_map
+
+        if product_count_map[product_id] > 1:
+            product_count_map[product_id] -= 1
+        else:
+            del product_count_map[product_id]
+
+        # THE BATCH BEING PARSED CAN STILL HOLD THIS CODE
+        self._pending_release_list.append(product_id)
+
+        return product_id, metric_type
+
+    def release_codes(self) -> None:
+        """Give back to `product_interner` the codes of the released references.
+
+        It is done before parsing each `Ticker` : the codes inside a
+        `MetricCodeBatch` stay valid until the next `Ticker` is parsed.
+        """
+
+        product_interner = self._product_interner
+
+        for product_id in self._pending_release_list:
+            product_interner.release(name=product_id)
+        self._pending_release_list = []
+
+    def reset(self) -> None:
+        """Forget all the references : they are only valid for one session."""
+
+        product_interner = self._product_interner
+
+        self.release_codes()
+        for product_id, _metric_type in self._reference_map.values():
+            product_interner.release(name=product_id)
+        self._reference_map.clear()
+        self._reference_code_map.clear()
+        self._product_count_map.clear()
+        self._last_release_list = []
+        self._last_reject_list = []
 
     def from_message_list_to_metric_list(
         self, message_list: list[Message]
     ) -> list[Metric]:
+        self.release_codes()
+
         reference_map = self._reference_map
         metric_list = []
+        release_list = []
 
         for message in message_list:
             if isinstance(message, MessageRegistration):
-                reference_map[message.reference] = message.metric_name.rsplit(
-                    sep=".", maxsplit=1
+                self.register(
+                    reference=message.reference,
+                    metric_name=message.metric_name,
                 )
             elif isinstance(message, MessageUnregistration):
-                del reference_map[
-                    message.reference
-                ]  # crashes on purpose to detect inconsistency
+                release_list.append(self.release(reference=message.reference))
             elif isinstance(message, (MessageNumeric, MessageText)):
                 product_id, metric_type = reference_map[message.reference]
                 metric_list.append(
@@ -240,9 +398,166 @@ class TickerToMetricList:
                     ),
                 )
 
+        self._last_release_list = release_list
+
         return metric_list
 
+    def from_message_list_raw_to_metric_batch(
+        self,
+        message_list_raw: list[dict],
+    ) -> MetricBatch:
+        """Fast path : goes directly from the decoded JSON to a `MetricBatch`.
+
+        No `Message` or `Metric` object is built, the `MetricType` lookup
+        is done once per registration instead of once per value.
+        """
+
+        self.release_codes()
+
+        reference_map = self._reference_map
+        release_list = []
+        reject_list = []
+        product_id_list: list[str] = []
+        metric_type_list: list[MetricType] = []
+        value_list: list[str | float] = []
+        append_product_id = product_id_list.append
+        append_metric_type = metric_type_list.append
+        append_value = value_list.append
+
+        for message_raw in message_list_raw:
+            message_type = message_raw["m"]
+
+            if message_type == "un" or message_type == "us":
+                reference, value = message_raw["v"]
+                product_id, metric_type = reference_map[reference]
+                append_product_id(product_id)
+                append_metric_type(metric_type)
+                append_value(value)
+            elif message_type == "a_req":
+                metric_name, reference = message_raw["v"]
+                self.register(reference=reference, metric_name=metric_name)
+            elif message_type == "a_rel":
+                release_list.append(self.release(reference=message_raw["v"][1]))
+            elif message_type == "h" or message_type == "ue":
+                pass
+            elif message_type == "d":
+                # THE `vwd_id` OR `metric` MIGHT NOT EXIST
+                name = message_raw["v"][0]
+                product_id, _separator, metric_name = name.rpartition(".")
+                reject_list.append((product_id, metric_name))
+            else:
+                raise AttributeError(f"Unknown metric : {message_raw}")
+
+        self._last_release_list = release_list
+        self._last_reject_list = reject_list
+
+        return MetricBatch(
+            product_id_list=product_id_list,
+            metric_type_list=metric_type_list,
+            value_list=value_list,
+        )
+
+    def from_message_list_raw_to_metric_code_batch(
+        self,
+        message_list_raw: list[dict],
+    ) -> MetricCodeBatch:
+        """Same than `from_message_list_raw_to_metric_batch` with integer codes.
+
+        The product codes come from `product_interner`, the metric codes
+        are positions inside `METRIC_TYPE_LIST`.
+        """
+
+        self.release_codes()
+
+        reference_code_map = self._reference_code_map
+        release_list = []
+        reject_list = []
+        product_code_list: list[int] = []
+        metric_code_list: list[int] = []
+        value_list: list[str | float] = []
+        append_product_code = product_code_list.append
+        append_metric_code = metric_code_list.append
+        append_value = value_list.append
+
+        for message_raw in message_list_raw:
+            message_type = message_raw["m"]
+
+            if message_type == "un" or message_type == "us":
+                reference, value = message_raw["v"]
+                product_code, metric_code = reference_code_map[reference]
+                append_product_code(product_code)
+                append_metric_code(metric_code)
+                append_value(value)
+            elif message_type == "a_req":
+                metric_name, reference = message_raw["v"]
+                self.register(reference=reference, metric_name=metric_name)
+            elif message_type == "a_rel":
+                release_list.append(self.release(reference=message_raw["v"][1]))
+            elif message_type == "h" or message_type == "ue":
+                pass
+            elif message_type == "d":
+                # THE `vwd_id` OR `metric` MIGHT NOT EXIST
+                name = message_raw["v"][0]
+                product_id, _separator, metric_name = name.rpartition(".")
+                reject_list.append((product_id, metric_name))
+            else:
+                raise AttributeError(f"Unknown metric : {message_raw}")
+
+        self._last_release_list = release_list
+        self._last_reject_list = reject_list
+
+        return MetricCodeBatch(
+            product_code_list=product_code_list,
+            metric_code_list=metric_code_list,
+            value_list=value_list,
+        )
+
+    def parse_code_batch(self, ticker: Ticker) -> MetricCodeBatch:
+        latency_recorder = self._latency_recorder
+
+        if latency_recorder is not None:
+            start_ns = time.perf_counter_ns()
+        message_list_raw = json.loads(ticker.json_text)  # pylint: disable=no-member
+        if latency_recorder is not None:
+            parse_ns = time.perf_counter_ns()
+        metric_code_batch = self.from_message_list_raw_to_metric_code_batch(
+            message_list_raw=message_list_raw
+        )
+        if latency_recorder is not None:
+            latency_recorder.record(stage="parse", duration_ns=parse_ns - start_ns)
+            latency_recorder.record(
+                stage="map",
+                duration_ns=time.perf_counter_ns() - parse_ns,
+            )
+        return metric_code_batch
+
+    def parse_batch(self, ticker: Ticker) -> MetricBatch:
+        latency_recorder = self._latency_recorder
+
+        if latency_recorder is not None:
+            start_ns = time.perf_counter_ns()
+        message_list_raw = json.loads(ticker.json_text)  # pylint: disable=no-member
+        if latency_recorder is not None:
+            parse_ns = time.perf_counter_ns()
+        metric_batch = self.from_message_list_raw_to_metric_batch(
+            message_list_raw=message_list_raw
+        )
+        if latency_recorder is not None:
+            latency_recorder.record(stage="parse", duration_ns=parse_ns - start_ns)
+            latency_recorder.record(
+                stage="map",
+                duration_ns=time.perf_counter_ns() - parse_ns,
+            )
+        return metric_batch
+
     def parse(self, ticker: Ticker) -> list[Metric]:
-        message_list = self.from_ticker_to_message_list(ticker=ticker)
-        metric_list = self.from_message_list_to_metric_list(message_list=message_list)
+        metric_batch = self.parse_batch(ticker=ticker)
+
+        if self._last_reject_list:
+            raise AttributeError(
+                "Subscription rejected, the `vwd_id` or `metric` might not exist."
+                f" - {self._last_reject_list}"
+            )
+
+        metric_list = metric_batch.to_metric_list()
         return metric_list
@@ -0,0 +1,46 @@
+import asyncio
+import json
+import logging
+
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.ticker_stream import TickerStream
+
+logging.basicConfig(level=logging.INFO)
+
+with open("config/config.json") as config_file:
+    config_dict = json.load(config_file)
+
+user_token = config_dict.get("user_token")  # HERE GOES YOUR USER_TOKEN
+
+ticker_request = TickerRequest(
+    request_type="subscription",
+    request_map={
+        "360015751": [
+            "LastDate",
+            "LastTime",
+            "LastPrice",
+            "LastVolume",
+        ],
+        "AAPL.BATS,E": [
+            "LastDate",
+            "LastTime",
+            "LastPrice",
+            "LastVolume",
+        ],
+    },
+)
+
+
+async def main():
+    async with TickerStream(user_token=user_token) as stream:
+        if stream.session_id is None:
+            raise TypeError("`session_id` is None")
+
+        await stream.subscribe(ticker_request=ticker_request)
+
+        # USE : CTRL+C TO QUIT
+        async for metric_batch in stream:
+            print(metric_batch.to_metric_list())
+
+
+asyncio.run(main())
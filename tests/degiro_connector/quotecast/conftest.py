@@ -1,11 +1,13 @@
 # IMPORTATIONS STANDARD
 import logging
+from datetime import datetime, timedelta
 
 import pytest
 import requests
 import urllib3
 
 from degiro_connector.quotecast.models.chart import Chart, ChartRequest, Interval
+from degiro_connector.quotecast.models.ticker import Ticker
 from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
 
 # SETUP LOGGING
@@ -51,3 +53,47 @@ def stock_request() -> ChartRequest:
     )
 
     return chart_request
+
+
+@pytest.fixture(scope="module")
+def ticker_registration() -> Ticker:
+    json_text = (
+        '[{"m":"a_req","v":["360015751.LastDate",1]},'
+        '{"m":"a_req","v":["360015751.LastTime",2]},'
+        '{"m":"a_req","v":["360015751.LastPrice",3]},'
+        '{"m":"a_req","v":["360015751.LastVolume",4]},'
+        '{"m":"us","v":[1,"2024-01-05"]},'
+        '{"m":"us","v":[2,"15:20:01"]},'
+        '{"m":"un","v":[3,115.85]},'
+        '{"m":"un","v":[4,100]},'
+        '{"m":"a_req","v":["AAPL.BATS,E.LastDate",5]},'
+        '{"m":"a_req","v":["AAPL.BATS,E.LastTime",6]},'
+        '{"m":"a_req","v":["AAPL.BATS,E.LastPrice",7]},'
+        '{"m":"us","v":[5,"2024-01-05"]},'
+        '{"m":"us","v":[6,"15:20:03"]},'
+        '{"m":"un","v":[7,190.5]}]'
+    )
+
+    return Ticker(
+        json_text=json_text,
+        response_datetime=datetime(2024, 1, 5, 15, 20, 4),
+        request_duration=timedelta(seconds=1.5),
+    )
+
+
+@pytest.fixture(scope="module")
+def ticker_update() -> Ticker:
+    return Ticker(
+        json_text='[{"m":"un","v":[3,116.0]},{"m":"un","v":[4,250]}]',
+        response_datetime=datetime(2024, 1, 5, 15, 20, 6),
+        request_duration=timedelta(seconds=2),
+    )
+
+
+@pytest.fixture(scope="module")
+def ticker_heartbeat() -> Ticker:
+    return Ticker(
+        json_text='[{"m":"h"}]',
+        response_datetime=datetime(2024, 1, 5, 15, 20, 11),
+        request_duration=timedelta(seconds=5),
+    )
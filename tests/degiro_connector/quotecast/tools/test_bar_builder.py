@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+from degiro_connector.quotecast.tools.bar_builder import BarBuilder
+
+
+def build_metric_batch(*item_list) -> MetricBatch:
+    return MetricBatch(
+        product_id_list=[product_id for product_id, _, _ in item_list],
+        metric_type_list=[MetricType(metric_type) for _, metric_type, _ in item_list],
+        value_list=[value for _, _, value in item_list],
+    )
+
+
+@pytest.mark.quotecast
+def test_bar_builder():
+    # SETUP
+    callback_list = []
+    bar_builder = BarBuilder(
+        interval_list=[timedelta(minutes=1), timedelta(minutes=5)],
+        capacity=1,
+        callback=lambda interval, df: callback_list.append(interval),
+    )
+    start = datetime(2024, 1, 5, 9, 0, 10)
+
+    # EXECUTE
+    bar_builder.update_batch(
+        metric_batch=build_metric_batch(
+            ("360015751", "LastPrice", 100.0),
+            ("360015751", "LastVolume", 10),
+            ("360015751", "LastPrice", 102.0),
+            ("AAPL.BATS,E", "LastVolume", 5),
+        ),
+        timestamp=start,
+    )
+    bar_builder.update_batch(
+        metric_batch=build_metric_batch(
+            ("360015751", "LastPrice", 99.0),
+            ("360015751", "LastVolume", 20),
+            ("360015751", "LastPrice", 101.0),
+        ),
+        timestamp=start + timedelta(seconds=30),
+    )
+    completed_map = bar_builder.update_batch(
+        metric_batch=build_metric_batch(("360015751", "LastPrice", 105.0)),
+        timestamp=start + timedelta(minutes=1),
+    )
+    flushed_map = bar_builder.flush()
+
+    # CHECK
+    assert bar_builder.capacity == 2
+    assert list(completed_map) == [timedelta(minutes=1)]
+    df = completed_map[timedelta(minutes=1)]
+    assert df.to_dicts() == [
+        {
+            "product_id": "360015751",
+            "start": datetime(2024, 1, 5, 9, 0),
+            "open": 100.0,
+            "high": 102.0,
+            "low": 99.0,
+            "close": 101.0,
+            "volume": 30.0,
+            "tick_count": 4,
+        },
+        {
+            "product_id": "AAPL.BATS,E",
+            "start": datetime(2024, 1, 5, 9, 0),
+            "open": None,
+            "high": None,
+            "low": None,
+            "close": None,
+            "volume": 5.0,
+            "tick_count": 0,
+        },
+    ]
+    assert flushed_map[timedelta(minutes=1)]["open"].to_list() == [105.0]
+    assert flushed_map[timedelta(minutes=5)]["close"].to_list() == [105.0, None]
+    assert flushed_map[timedelta(minutes=5)]["high"].to_list() == [105.0, None]
+    assert callback_list == [
+        timedelta(minutes=1),
+        timedelta(minutes=1),
+        timedelta(minutes=5),
+    ]
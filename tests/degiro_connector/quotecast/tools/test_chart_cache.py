@@ -0,0 +1,114 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from degiro_connector.quotecast.models.chart import ChartRequest, Interval
+from degiro_connector.quotecast.tools.chart_cache import ChartCache
+from degiro_connector.quotecast.tools.chart_fetcher import ChartFetcher
+from degiro_connector.quotecast.tools.chart_simulator import ChartSimulator
+
+
+def build_chart_request(series: list[str], requestid: str = "1") -> ChartRequest:
+    return ChartRequest(
+        culture="fr-FR",
+        period=Interval.P1M,
+        requestid=requestid,
+        resolution=Interval.P1D,
+        series=series,
+        tz="Europe/Paris",
+    )
+
+
+@pytest.mark.quotecast
+def test_chart_cache_memory():
+    with ChartSimulator() as simulator:
+        # SETUP
+        price_a, price_b = [
+            f"price:issueid:{product_id}" for product_id in simulator.product_id_list[:2]
+        ]
+        chart_cache = ChartCache()
+        chart_fetcher = ChartFetcher(
+            user_token=0,
+            chart_url=simulator.url,
+            chart_cache=chart_cache,
+        )
+
+        # EXECUTE
+        chart = chart_fetcher.get_chart(chart_request=build_chart_request([price_a]))
+        cached_chart = chart_fetcher.get_chart(
+            chart_request=build_chart_request([price_a], requestid="2")
+        )
+        cached_request_count = simulator.request_count
+        merged_chart = chart_fetcher.get_chart(
+            chart_request=build_chart_request([price_b, price_a])
+        )
+
+    # CHECK
+    assert cached_request_count == 1
+    assert simulator.request_count == 2
+    assert cached_chart.requestid == "2"
+    assert cached_chart.series == chart.series
+    assert [series.id for series in merged_chart.series] == [price_b, price_a]
+    assert merged_chart.series[1] == chart.series[0]
+    assert chart_cache.hit_count == 2
+    assert chart_cache.miss_count == 2
+    assert chart_cache.series_count == 2
+
+
+@pytest.mark.quotecast
+def test_chart_cache_expiry():
+    with ChartSimulator(expires_after=timedelta(seconds=0.2)) as simulator:
+        # SETUP
+        chart_request = build_chart_request(
+            [f"price:issueid:{simulator.product_id_list[0]}"]
+        )
+        chart_fetcher = ChartFetcher(
+            user_token=0,
+            chart_url=simulator.url,
+            chart_cache=ChartCache(),
+        )
+
+        # EXECUTE
+        chart_fetcher.get_chart(chart_request=chart_request)
+        chart_fetcher.get_chart(chart_request=chart_request)
+        cached_request_count = simulator.request_count
+        time.sleep(0.3)
+        chart = chart_fetcher.get_chart(chart_request=chart_request)
+
+    # CHECK
+    assert cached_request_count == 1
+    assert simulator.request_count == 2
+    assert len(chart.series) == 1
+
+
+@pytest.mark.quotecast
+def test_chart_cache_disk(tmp_path):
+    with ChartSimulator() as simulator:
+        # SETUP
+        series_list = [
+            f"ohlc:issueid:{product_id}" for product_id in simulator.product_id_list[:3]
+        ]
+        chart_request = build_chart_request(series_list)
+
+        # EXECUTE
+        chart = ChartFetcher(
+            user_token=0,
+            chart_url=simulator.url,
+            chart_cache=ChartCache(max_series_count=2, folder=tmp_path),
+        ).get_chart(chart_request=chart_request)
+        chart_cache = ChartCache(folder=tmp_path)
+        cached_chart = ChartFetcher(
+            user_token=0,
+            chart_url=simulator.url,
+            chart_cache=chart_cache,
+        ).get_chart(chart_request=chart_request)
+
+    # CHECK
+    assert simulator.request_count == 1
+    assert len(list(tmp_path.glob("*.json"))) == 3
+    assert cached_chart.series == chart.series
+    assert chart_cache.hit_count == 3
+    assert chart_cache.series_count == 3
+    with pytest.raises(ValueError):
+        ChartCache(max_series_count=0)
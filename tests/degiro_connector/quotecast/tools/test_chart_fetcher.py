@@ -0,0 +1,282 @@
+import threading
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+from degiro_connector.quotecast.models.chart import ChartRequest, Interval, Series
+from degiro_connector.quotecast.tools.chart_cache import ChartCache
+from degiro_connector.quotecast.tools.chart_fetcher import (
+    ChartFetcher,
+    ChartPlanner,
+    SeriesFormatter,
+)
+from degiro_connector.quotecast.tools.chart_simulator import ChartSimulator
+
+
+@pytest.fixture
+def chart_request() -> ChartRequest:
+    return ChartRequest(
+        culture="fr-FR",
+        period=Interval.P1W,
+        requestid="1",
+        resolution=Interval.P1D,
+        series=[],
+        tz="Europe/Paris",
+    )
+
+
+@pytest.mark.quotecast
+def test_get_chart(chart_request):
+    with ChartSimulator(now=datetime(2024, 1, 5, 15, 20)) as simulator:
+        # SETUP
+        product_id = simulator.product_id_list[0]
+        chart_fetcher = ChartFetcher(user_token=0, chart_url=simulator.url)
+        chart_request.series = [
+            f"issueid:{product_id}",
+            f"price:issueid:{product_id}",
+            f"ohlc:issueid:{product_id}",
+        ]
+
+        # EXECUTE
+        chart = chart_fetcher.get_chart(chart_request=chart_request)
+        df = SeriesFormatter.format_series(series=chart.series[2])
+
+    # CHECK
+    assert chart.start == "2023-12-29T00:00:00"
+    assert chart.end == "2024-01-05T00:00:00"
+    assert [series.type for series in chart.series] == ["object", "time", "ohlc"]
+    assert chart.series[0].data["issueId"] == int(product_id)
+    assert len(chart.series[1].data) == 7
+    assert df.columns == ["timestamp", "open", "high", "low", "close"]
+    assert df["timestamp"][0] == datetime(2023, 12, 29)
+    assert df["timestamp"][6] == datetime(2024, 1, 4)
+
+
+@pytest.mark.quotecast
+def test_series_formatter():
+    # SETUP
+    series = Series(
+        expires=datetime(2024, 1, 5, 16),
+        data=[[0, 1.5], [3, 2], [6.5, 100.25]],
+        id="price:issueid:360148977",
+        type="time",
+        times="2024-01-05T09:00:00/PT15M",
+    )
+    empty_series = series.model_copy(update={"data": []})
+    whole_series = series.model_copy(update={"data": [[0, 100], [1, 101]]})
+
+    # EXECUTE
+    df = SeriesFormatter.format(series=series)
+    empty_df = SeriesFormatter.format(series=empty_series)
+    whole_df = SeriesFormatter.format(series=whole_series)
+
+    # CHECK
+    assert df.schema == {"timestamp": pl.Datetime("us"), "price": pl.Float64}
+    assert df["timestamp"].to_list() == [
+        datetime(2024, 1, 5, 9),
+        datetime(2024, 1, 5, 9, 45),
+        datetime(2024, 1, 5, 10, 37, 30),
+    ]
+    assert df["price"].to_list() == [1.5, 2.0, 100.25]
+    assert empty_df.schema == df.schema
+    assert whole_df.schema == df.schema
+    assert empty_df.height == 0
+
+
+@pytest.mark.quotecast
+def test_get_chart_list(chart_request):
+    with ChartSimulator(latency=0.05) as simulator:
+        # SETUP
+        product_id_list = simulator.product_id_list[:20]
+        chart_fetcher = ChartFetcher(user_token=0, chart_url=simulator.url)
+        chart_request_list = chart_fetcher.build_chart_request_list(
+            chart_request=chart_request,
+            series_list=[
+                [f"price:issueid:{product_id}"] for product_id in product_id_list
+            ]
+            + [["price:issueid:1"]],
+        )
+        thread_name_set = set()
+        session_set = set()
+        get_chart = chart_fetcher.get_chart
+
+        def get_chart_tracked(**kwargs):
+            thread_name_set.add(threading.current_thread().name)
+            session_set.add(id(chart_fetcher.session_storage.session))
+            return get_chart(**kwargs)
+
+        chart_fetcher.get_chart = get_chart_tracked
+
+        # EXECUTE
+        result_list = list(
+            chart_fetcher.get_chart_list(
+                chart_request_list=chart_request_list,
+                max_workers=4,
+            )
+        )
+
+    # CHECK
+    chart_map = {
+        chart_request.requestid: chart for chart_request, chart in result_list
+    }
+    assert simulator.request_count == 21
+    assert len(result_list) == 21
+    assert chart_map["20"] is None
+    assert all(chart_map[str(index)] is not None for index in range(20))
+    assert chart_map["3"].series[0].id == f"price:issueid:{product_id_list[3]}"
+    assert chart_request_list[0].user_token == 0
+    assert chart_request.series == []
+    assert len(thread_name_set) == 4
+    assert len(session_set) == 4
+
+
+@pytest.mark.quotecast
+def test_get_chart_list_early_stop(chart_request):
+    with ChartSimulator(latency=0.05) as simulator:
+        # SETUP
+        chart_fetcher = ChartFetcher(user_token=0, chart_url=simulator.url)
+        chart_request_list = chart_fetcher.build_chart_request_list(
+            chart_request=chart_request,
+            series_list=[
+                [f"price:issueid:{product_id}"]
+                for product_id in simulator.product_id_list
+            ],
+        )
+
+        # EXECUTE
+        for _chart_request, chart in chart_fetcher.get_chart_list(
+            chart_request_list=chart_request_list,
+            max_workers=2,
+        ):
+            break
+
+    # CHECK
+    assert chart is not None
+    assert simulator.request_count < 10
+
+
+@pytest.mark.quotecast
+def test_get_chart_list_failure(chart_request):
+    with ChartSimulator() as simulator:
+        # SETUP
+        class BrokenChartCache(ChartCache):
+            def put(self, chart_request, chart):
+                raise OSError("DISK FULL")
+
+        chart_fetcher = ChartFetcher(
+            user_token=0,
+            chart_url=simulator.url,
+            chart_cache=BrokenChartCache(),
+        )
+        chart_request_list = chart_fetcher.build_chart_request_list(
+            chart_request=chart_request,
+            series_list=[
+                [f"price:issueid:{product_id}"]
+                for product_id in simulator.product_id_list[:3]
+            ],
+        )
+        get_chart = chart_fetcher.get_chart
+
+        def get_chart_failing(chart_request, **kwargs):
+            if chart_request.requestid == "1":
+                raise ValueError("BROKEN")
+            return get_chart(chart_request=chart_request, **kwargs)
+
+        chart_fetcher.get_chart = get_chart_failing
+
+        # EXECUTE
+        chart_map = {
+            chart_request.requestid: chart
+            for chart_request, chart in chart_fetcher.get_chart_list(
+                chart_request_list=chart_request_list,
+            )
+        }
+
+    # CHECK
+    assert chart_map["1"] is None
+    assert chart_map["0"] is not None
+    assert chart_map["2"].series[0].id == chart_request_list[2].series[0]
+
+
+@pytest.mark.quotecast
+def test_chart_planner_plan(chart_request):
+    # SETUP
+    product_list = [f"issueid:{360000000 + index}" for index in range(10)]
+    chart_planner = ChartPlanner(max_series_count=6)
+    base_length = chart_planner.build_url_length(chart_request=chart_request)
+    product_length = len(
+        "&series=price%3Aissueid%3A360000000&series=volume%3Aissueid%3A360000000"
+    )
+    url_planner = ChartPlanner(max_url_length=base_length + 2 * product_length)
+
+    # EXECUTE
+    chart_request_list = chart_planner.plan(
+        chart_request=chart_request,
+        product_list=product_list + product_list[:2],
+        kind_list=["price", "volume"],
+    )
+    url_request_list = url_planner.plan(
+        chart_request=chart_request,
+        product_list=product_list,
+        kind_list=["price", "volume"],
+    )
+
+    # CHECK
+    assert [len(request.series) for request in chart_request_list] == [6, 6, 6, 2]
+    assert chart_request_list[0].series[:2] == [
+        "price:issueid:360000000",
+        "volume:issueid:360000000",
+    ]
+    assert [request.requestid for request in chart_request_list] == [
+        "0",
+        "1",
+        "2",
+        "3",
+    ]
+    assert len(url_request_list) == 5
+    assert chart_request.series == []
+    assert ChartPlanner.parse_series_id("ohlc:vwdkey:AAPL.BATS,E") == (
+        "ohlc",
+        "vwdkey:AAPL.BATS,E",
+    )
+    assert ChartPlanner.parse_series_id("issueid:1") == ("object", "issueid:1")
+    with pytest.raises(ValueError):
+        chart_planner.plan(
+            chart_request=chart_request,
+            product_list=product_list,
+            kind_list=["bid"],
+        )
+
+
+@pytest.mark.quotecast
+def test_get_chart_by_product(chart_request):
+    with ChartSimulator() as simulator:
+        # SETUP
+        product_list = ["issueid:1"] + [
+            f"issueid:{product_id}" for product_id in simulator.product_id_list[:30]
+        ]
+        chart_fetcher = ChartFetcher(user_token=0, chart_url=simulator.url)
+
+        # EXECUTE
+        chart_map = dict(
+            chart_fetcher.get_chart_by_product(
+                chart_request=chart_request,
+                product_list=product_list,
+                kind_list=["price", "ohlc"],
+                chart_planner=ChartPlanner(max_series_count=20),
+            )
+        )
+
+    # CHECK
+    product = product_list[15]
+    assert simulator.request_count == 4
+    assert list(sorted(chart_map)) == sorted(product_list)
+    assert [product for product, chart in chart_map.items() if chart is None] == (
+        product_list[:10]
+    )
+    assert [series.id for series in chart_map[product].series] == [
+        f"price:{product}",
+        f"ohlc:{product}",
+    ]
+    assert chart_map[product].resolution == "P1D"
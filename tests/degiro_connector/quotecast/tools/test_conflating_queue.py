@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+from degiro_connector.quotecast.tools.conflating_queue import ConflatingQueue
+
+
+def build_metric_batch(*item_list) -> MetricBatch:
+    return MetricBatch(
+        product_id_list=[product_id for product_id, _, _ in item_list],
+        metric_type_list=[MetricType(metric_type) for _, metric_type, _ in item_list],
+        value_list=[value for _, _, value in item_list],
+    )
+
+
+@pytest.mark.quotecast
+def test_conflating_queue():
+    # SETUP
+    conflating_queue = ConflatingQueue(max_size=2)
+
+    # EXECUTE
+    conflating_queue.put(
+        metric_batch=build_metric_batch(
+            ("360015751", "LastPrice", 115.0),
+            ("360015751", "LastVolume", 100),
+        )
+    )
+    conflating_queue.put(
+        metric_batch=build_metric_batch(
+            ("360015751", "LastPrice", 116.0),
+            ("AAPL.BATS,E", "LastPrice", 190.5),
+        )
+    )
+    metric_batch = conflating_queue.get(timeout=0)
+    empty_batch = conflating_queue.get(timeout=0.01)
+
+    # CHECK
+    assert metric_batch.product_id_list == ["360015751", "AAPL.BATS,E"]
+    assert metric_batch.metric_type_list == [MetricType.LastPrice] * 2
+    assert metric_batch.value_list == [116.0, 190.5]
+    assert len(empty_batch) == 0
+    assert conflating_queue.put_count == 4
+    assert conflating_queue.conflated_count == 1
+    assert conflating_queue.dropped_count == 1
+
+
+@pytest.mark.quotecast
+def test_conflating_queue_close():
+    # SETUP
+    conflating_queue = ConflatingQueue()
+    result_list = []
+
+    def consume() -> None:
+        while True:
+            metric_batch = conflating_queue.get()
+            result_list.append(metric_batch)
+            if metric_batch is None:
+                break
+
+    consumer = threading.Thread(target=consume)
+
+    # EXECUTE
+    consumer.start()
+    conflating_queue.put(
+        metric_batch=build_metric_batch(("360015751", "LastPrice", 115.0))
+    )
+    conflating_queue.close()
+    consumer.join(timeout=5)
+
+    # CHECK
+    assert not consumer.is_alive()
+    assert result_list[-1] is None
+    assert sum(len(batch) for batch in result_list[:-1]) == 1
+    with pytest.raises(ValueError):
+        conflating_queue.put(metric_batch=MetricBatch())
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from degiro_connector.quotecast.tools.eviction_policy import EvictionPolicy
+
+
+@pytest.mark.quotecast
+def test_eviction_policy():
+    # SETUP
+    eviction_policy = EvictionPolicy(ttl=timedelta(minutes=5), max_product_count=2)
+    now = datetime(2024, 1, 5, 9, 0)
+
+    # EXECUTE
+    eviction_policy.touch(product_id_list=["A", "B"], now=now)
+    eviction_policy.touch(product_id_list=["C", "A"], now=now + timedelta(minutes=1))
+    overflow_list = eviction_policy.collect(now=now + timedelta(minutes=1))
+    eviction_policy.touch(product_id_list=["D"], now=now + timedelta(minutes=4))
+    expired_list = eviction_policy.collect(now=now + timedelta(minutes=6))
+
+    # CHECK
+    assert overflow_list == ["B"]
+    assert expired_list == ["C", "A"]
+    assert eviction_policy.product_count == 1
+    with pytest.raises(ValueError):
+        EvictionPolicy(max_product_count=0)
@@ -0,0 +1,265 @@
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+import pytest
+
+from degiro_connector.quotecast.models.chart import Interval
+from degiro_connector.quotecast.tools.chart_fetcher import ChartFetcher
+from degiro_connector.quotecast.tools.chart_simulator import ChartSimulator
+from degiro_connector.quotecast.tools.history_store import HistoryStore
+
+
+@pytest.mark.quotecast
+def test_history_store_gap(tmp_path):
+    # SETUP
+    now = datetime(2024, 1, 5, 15, 20)
+    later = now + timedelta(days=2)
+    start = datetime(2023, 12, 10)
+
+    # EXECUTE
+    with ChartSimulator(now=now) as simulator:
+        product_list = [
+            f"issueid:{product_id}" for product_id in simulator.product_id_list[:3]
+        ]
+        history_store = HistoryStore(
+            folder=tmp_path,
+            chart_fetcher=ChartFetcher(user_token=0, chart_url=simulator.url),
+        )
+        count_map = history_store.update(
+            product_list=product_list,
+            kind="ohlc",
+            resolution=Interval.P1D,
+            start=start,
+            now=now,
+        )
+        request_count = simulator.request_count
+    with ChartSimulator(now=later) as later_simulator:
+        history_store = HistoryStore(
+            folder=tmp_path,
+            chart_fetcher=ChartFetcher(user_token=0, chart_url=later_simulator.url),
+        )
+        gap_list = history_store.find_gap_list(
+            product=product_list[0],
+            kind="ohlc",
+            resolution=Interval.P1D,
+            start=start,
+            end=later,
+        )
+        later_count_map = history_store.update(
+            product_list=product_list,
+            kind="ohlc",
+            resolution=Interval.P1D,
+            start=start,
+            now=later,
+        )
+        up_to_date_count_map = history_store.update(
+            product_list=product_list,
+            kind="ohlc",
+            resolution=Interval.P1D,
+            start=start,
+            now=later,
+        )
+        later_request_count = later_simulator.request_count
+    df = history_store.load(
+        product=product_list[0],
+        kind="ohlc",
+        resolution=Interval.P1D,
+    )
+
+    # CHECK
+    assert request_count == 1
+    assert count_map == {product: 31 for product in product_list}
+    assert gap_list == [(datetime(2024, 1, 5), later)]
+    assert later_request_count == 1
+    assert later_count_map == {product: 2 for product in product_list}
+    assert up_to_date_count_map == {}
+    assert history_store.get_range_list(
+        product=product_list[0],
+        kind="ohlc",
+        resolution=Interval.P1D,
+    ) == [(datetime(2023, 12, 5), datetime(2024, 1, 7))]
+    assert df.height == 33
+    assert df.columns == ["timestamp", "open", "high", "low", "close"]
+    assert df["timestamp"].is_sorted()
+    assert df["timestamp"][-1] == datetime(2024, 1, 6)
+    assert history_store.build_path(
+        product=product_list[0],
+        kind="ohlc",
+        resolution=Interval.P1D,
+    ) == tmp_path / "P1D" / "ohlc" / (product_list[0].replace(":", "_") + ".parquet")
+
+
+@pytest.mark.quotecast
+def test_history_store_find_gap_list(tmp_path):
+    # SETUP
+    history_store = HistoryStore(
+        folder=tmp_path,
+        chart_fetcher=ChartFetcher(user_token=0),
+    )
+    for start, end in [(10, 20), (25, 26), (19, 22), (26, 26)]:
+        history_store.write(
+            product="issueid:1",
+            kind="price",
+            resolution=Interval.P1D,
+            df=pl.DataFrame(
+                {
+                    "timestamp": [datetime(2024, 1, start)],
+                    "price": [float(start)],
+                }
+            ),
+            start=datetime(2024, 1, start),
+            end=datetime(2024, 1, end),
+        )
+
+    # EXECUTE
+    gap_list = history_store.find_gap_list(
+        product="issueid:1",
+        kind="price",
+        resolution=Interval.P1D,
+        start=datetime(2024, 1, 1),
+        end=datetime(2024, 1, 31, 12),
+    )
+    reloaded_store = HistoryStore(
+        folder=tmp_path,
+        chart_fetcher=ChartFetcher(user_token=0),
+    )
+
+    # CHECK
+    assert gap_list == [
+        (datetime(2024, 1, 1), datetime(2024, 1, 10)),
+        (datetime(2024, 1, 22), datetime(2024, 1, 25)),
+        (datetime(2024, 1, 26), datetime(2024, 1, 31, 12)),
+    ]
+    assert reloaded_store.get_range_list(
+        product="issueid:1",
+        kind="price",
+        resolution=Interval.P1D,
+    ) == [
+        (datetime(2024, 1, 10), datetime(2024, 1, 22)),
+        (datetime(2024, 1, 25), datetime(2024, 1, 26)),
+    ]
+    assert HistoryStore.build_period(
+        start=datetime(2024, 1, 1),
+        now=datetime(2024, 1, 31),
+    ) == Interval.P1M
+    assert reloaded_store.load(
+        product="issueid:1",
+        kind="price",
+        resolution=Interval.P1D,
+    )["price"].to_list() == [10.0, 19.0, 25.0, 26.0]
+    with pytest.raises(ValueError):
+        reloaded_store.update(
+            product_list=["issueid:1"],
+            kind="object",
+            resolution=Interval.P1D,
+            start=datetime(2024, 1, 1),
+        )
+
+
+@pytest.mark.quotecast
+def test_history_store_range_check(tmp_path):
+    # SETUP
+    history_store = HistoryStore(
+        folder=tmp_path,
+        chart_fetcher=ChartFetcher(user_token=0),
+    )
+    df = pl.DataFrame(
+        {
+            "timestamp": [datetime(2024, 1, day) for day in [3, 4, 5]],
+            "price": [3.0, 4.0, 5.0],
+        }
+    )
+    aware = datetime(2024, 1, 5, tzinfo=timezone.utc)
+
+    # EXECUTE
+    open_end = HistoryStore.build_complete_end(
+        df=df,
+        resolution=Interval.P1D,
+        end=datetime(2024, 1, 5, 15, 20),
+    )
+    complete_end = HistoryStore.build_complete_end(
+        df=df,
+        resolution=Interval.P1D,
+        end=datetime(2024, 1, 6),
+    )
+    history_store.write(
+        product="issueid:1",
+        kind="price",
+        resolution=Interval.P1D,
+        df=df,
+        start=datetime(2024, 1, 3),
+        end=open_end,
+    )
+
+    # CHECK
+    assert open_end == datetime(2024, 1, 5)
+    assert complete_end == datetime(2024, 1, 6)
+    with pytest.raises(ValueError):
+        history_store.update(
+            product_list=["issueid:1"],
+            kind="price",
+            resolution=Interval.P1D,
+            start=datetime(2024, 1, 1),
+            now=aware,
+        )
+    with pytest.raises(ValueError):
+        history_store.find_gap_list(
+            product="issueid:1",
+            kind="price",
+            resolution=Interval.P1D,
+            start=aware - timedelta(days=3),
+            end=aware,
+        )
+    with pytest.raises(ValueError):
+        history_store.write(
+            product="issueid:1",
+            kind="price",
+            resolution=Interval.P1D,
+            df=df,
+            start=aware - timedelta(days=3),
+            end=aware,
+        )
+
+
+@pytest.mark.quotecast
+def test_history_store_schema(tmp_path):
+    # SETUP
+    history_store = HistoryStore(
+        folder=tmp_path,
+        chart_fetcher=ChartFetcher(user_token=0),
+    )
+
+    # EXECUTE
+    for price_list, start, end in [
+        ([100, 101], datetime(2024, 1, 3), datetime(2024, 1, 5)),
+        ([102.75], datetime(2024, 1, 5), datetime(2024, 1, 6)),
+    ]:
+        history_store.write(
+            product="issueid:1",
+            kind="price",
+            resolution=Interval.P1D,
+            df=pl.DataFrame(
+                {
+                    "timestamp": pl.datetime_range(
+                        start=start,
+                        end=end,
+                        interval="1d",
+                        closed="left",
+                        time_unit="ms",
+                        eager=True,
+                    ),
+                    "price": price_list,
+                }
+            ),
+            start=start,
+            end=end,
+        )
+    df = history_store.load(
+        product="issueid:1",
+        kind="price",
+        resolution=Interval.P1D,
+    )
+
+    # CHECK
+    assert df.schema == {"timestamp": pl.Datetime("us"), "price": pl.Float64}
+    assert df["price"].to_list() == [100.0, 101.0, 102.75]
@@ -0,0 +1,44 @@
+import pytest
+
+from degiro_connector.quotecast.tools.interner import Interner
+
+
+@pytest.mark.quotecast
+def test_interner():
+    # SETUP
+    interner = Interner(name_list=["360015751"])
+
+    # EXECUTE
+    code_list = [
+        interner.intern(name="AAPL.BATS,E"),
+        interner.intern(name="360015751"),
+        interner.intern(name="AAPL.BATS,E"),
+    ]
+
+    # CHECK
+    assert code_list == [1, 0, 1]
+    assert interner.name_list == ["360015751", "AAPL.BATS,E"]
+    assert interner.get_code(name="UNKNOWN") is None
+    assert "360015751" in interner
+    assert len(interner) == 2
+
+
+@pytest.mark.quotecast
+def test_interner_release():
+    # SETUP
+    interner = Interner(name_list=["360015751", "AAPL.BATS,E"])
+    interner.intern(name="360015751")
+
+    # EXECUTE
+    interner.release(name="360015751")
+    interner.release(name="AAPL.BATS,E")
+    release_count = interner.release_count
+    code = interner.intern(name="NEW")
+
+    # CHECK
+    assert release_count == 1
+    assert code == 1
+    assert interner.name_list == ["360015751", "NEW"]
+    assert len(interner) == 2
+    with pytest.raises(KeyError):
+        interner.release(name="AAPL.BATS,E")
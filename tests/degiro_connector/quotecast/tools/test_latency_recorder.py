@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.latency_recorder import (
+    LatencyHistogram,
+    LatencyRecorder,
+)
+from degiro_connector.quotecast.tools.ticker_session import TickerSession
+from degiro_connector.quotecast.tools.ticker_simulator import TickerSimulator
+from degiro_connector.quotecast.tools.ticker_to_df import TickerToDF
+
+
+@pytest.mark.quotecast
+def test_latency_histogram():
+    # SETUP
+    histogram = LatencyHistogram(precision_bits=7)
+    other_histogram = LatencyHistogram(precision_bits=7)
+
+    # EXECUTE
+    for value in range(1, 1001):
+        histogram.record(value=value * 1000)
+    other_histogram.record(value=5_000_000)
+    histogram.merge(histogram=other_histogram)
+    summary = histogram.build_summary()
+
+    # CHECK
+    assert histogram.count == 1001
+    assert histogram.min == 1000
+    assert histogram.max == 5_000_000
+    assert summary["p50_us"] == pytest.approx(500, rel=0.01)
+    assert summary["p99_us"] == pytest.approx(990, rel=0.01)
+    assert summary["max_us"] == 5000
+    assert histogram.get_value(index=histogram.get_index(value=127)) == 127
+    with pytest.raises(ValueError):
+        histogram.merge(histogram=LatencyHistogram(precision_bits=3))
+
+
+@pytest.mark.quotecast
+def test_latency_recorder(ticker_registration, ticker_update):
+    # SETUP
+    summary_map_list = []
+    latency_recorder = LatencyRecorder(
+        callback=summary_map_list.append,
+        callback_interval=timedelta(0),
+    )
+    ticker_to_df = TickerToDF(latency_recorder=latency_recorder)
+
+    # EXECUTE
+    ticker_to_df.parse(ticker=ticker_registration)
+    ticker_to_df.parse(ticker=ticker_update)
+    latency_recorder.record(stage="custom", duration_ns=42_000)
+    summary_map = latency_recorder.snapshot()
+
+    # CHECK
+    assert set(summary_map) == {"parse", "map", "build_df", "custom"}
+    assert len(summary_map_list) == 7
+    assert summary_map_list[0]["parse"]["count"] == 1
+    assert summary_map_list[-1]["custom"]["count"] == 1
+    assert summary_map_list[-1]["custom"]["p50_us"] == 42
+    assert summary_map_list[-1]["parse"]["count"] == 0
+    assert summary_map["custom"]["count"] == 0
+
+
+@pytest.mark.quotecast
+def test_latency_recorder_session():
+    with TickerSimulator(universe_size=10, tick_rate=1000, seed=0) as simulator:
+        # SETUP
+        latency_recorder = LatencyRecorder()
+        ticker_session = TickerSession(
+            user_token=0,
+            quotecast_url=simulator.url,
+            latency_recorder=latency_recorder,
+        )
+
+        # EXECUTE
+        ticker_session.subscribe(
+            ticker_request=TickerRequest(
+                request_type="subscription",
+                request_map={simulator.product_id_list[0]: ["LastPrice"]},
+            )
+        )
+        ticker_session.ticker_to_metric_list.parse_batch(
+            ticker=ticker_session.fetch_ticker()
+        )
+        summary_map = latency_recorder.snapshot(reset=True)
+
+        # CHECK
+        assert summary_map["network"]["count"] == 1
+        assert summary_map["decode"]["count"] == 1
+        assert summary_map["map"]["count"] == 1
+        assert summary_map["network"]["p50_us"] > 0
+        assert latency_recorder.snapshot()["network"]["count"] == 0
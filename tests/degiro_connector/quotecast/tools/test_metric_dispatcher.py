@@ -0,0 +1,78 @@
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.tools.metric_dispatcher import MetricDispatcher
+
+
+@pytest.mark.quotecast
+def test_metric_dispatcher(ticker_registration, ticker_update):
+    # SETUP
+    metric_dispatcher = MetricDispatcher()
+    all_list = []
+    product_list = []
+    price_list = []
+
+    def failing_callback(metric_batch):
+        raise ValueError("Consumer failure.")
+
+    metric_dispatcher.register(callback=all_list.append)
+    metric_dispatcher.register(
+        callback=product_list.append,
+        product_id_list=["AAPL.BATS,E"],
+    )
+    price_id = metric_dispatcher.register(
+        callback=price_list.append,
+        product_id_list=["360015751", "AAPL.BATS,E"],
+        metric_type_list=["LastPrice"],
+    )
+    failing_id = metric_dispatcher.register(callback=failing_callback)
+
+    # EXECUTE
+    metric_dispatcher.parse(ticker=ticker_registration)
+    error_count = metric_dispatcher.subscriber_map[failing_id].error_count
+    metric_dispatcher.unregister(subscriber_id=price_id)
+    receiver_count = metric_dispatcher.dispatch(
+        metric_batch=metric_dispatcher.ticker_to_metric_list.parse_batch(
+            ticker=ticker_update
+        )
+    )
+
+    # CHECK
+    assert error_count == 1
+    assert receiver_count == 2
+    assert [len(metric_batch) for metric_batch in all_list] == [7, 2]
+    assert len(product_list) == 1
+    assert set(product_list[0].product_id_list) == {"AAPL.BATS,E"}
+    assert len(price_list) == 1
+    assert price_list[0].metric_type_list == [MetricType.LastPrice] * 2
+    assert price_list[0].value_list == [115.85, 190.5]
+    assert metric_dispatcher.unregister(subscriber_id=price_id) is False
+
+
+@pytest.mark.quotecast
+def test_metric_dispatcher_release_route(monkeypatch, ticker_registration):
+    # SETUP
+    metric_dispatcher = MetricDispatcher()
+    bounded_dispatcher = MetricDispatcher()
+    ticker_release = ticker_registration.model_copy(
+        update={
+            "json_text": (
+                '[{"m":"a_rel","v":["AAPL.BATS,E.LastPrice",7]},'
+                '{"m":"a_rel","v":["360015751.LastDate",1]}]'
+            )
+        }
+    )
+    metric_dispatcher.register(callback=lambda metric_batch: None)
+    bounded_dispatcher.register(callback=lambda metric_batch: None)
+    monkeypatch.setattr(bounded_dispatcher, "ROUTE_MAP_SIZE", 3)
+
+    # EXECUTE
+    metric_dispatcher.parse(ticker=ticker_registration)
+    route_count = metric_dispatcher.route_count
+    metric_dispatcher.parse(ticker=ticker_release)
+    bounded_dispatcher.parse(ticker=ticker_registration)
+
+    # CHECK
+    assert route_count == 7
+    assert metric_dispatcher.route_count == 5
+    assert bounded_dispatcher.route_count <= 3
@@ -0,0 +1,116 @@
+import multiprocessing
+
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricBatch, MetricType
+from degiro_connector.quotecast.tools.metric_ring_buffer import (
+    MetricRingBufferReader,
+    MetricRingBufferWriter,
+)
+
+
+def read_remotely(name: str, connection) -> None:
+    with MetricRingBufferReader(name=name, from_start=True) as reader:
+        metric_batch = reader.read()
+        connection.send(
+            (
+                metric_batch.product_id_list,
+                metric_batch.metric_type_list,
+                metric_batch.value_list,
+            )
+        )
+
+
+@pytest.mark.quotecast
+def test_metric_ring_buffer(ticker_registration, ticker_update):
+    with MetricRingBufferWriter(capacity=8) as writer:
+        # SETUP
+        reader = MetricRingBufferReader(name=writer.name)
+        late_reader = MetricRingBufferReader(name=writer.name)
+
+        # EXECUTE
+        writer.parse(ticker=ticker_registration)
+        metric_batch = reader.read()
+        writer.parse(ticker=ticker_update)
+        update_batch = reader.read(max_count=1)
+        late_batch = late_reader.read()
+        reader.close()
+        late_reader.close()
+
+    # CHECK
+    assert writer.write_sequence == 9
+    assert metric_batch.value_list == [
+        "2024-01-05",
+        "15:20:01",
+        115.85,
+        100.0,
+        "2024-01-05",
+        "15:20:03",
+        190.5,
+    ]
+    assert metric_batch.metric_type_list[2] == MetricType.LastPrice
+    assert metric_batch.product_id_list[-1] == "AAPL.BATS,E"
+    assert update_batch.value_list == [116.0]
+    assert reader.overrun_count == 0
+    assert len(late_batch) == 8
+    assert late_reader.overrun_count == 1
+    assert late_batch.value_list[-1] == 250.0
+
+
+@pytest.mark.quotecast
+def test_metric_ring_buffer_too_long():
+    with MetricRingBufferWriter(capacity=8) as writer:
+        # SETUP
+        reader = MetricRingBufferReader(name=writer.name)
+        metric_batch = MetricBatch(
+            product_id_list=["1" * 33, "360015751", "360015751", "1" * 32],
+            metric_type_list=[
+                MetricType.LastPrice,
+                MetricType.LastTime,
+                MetricType.FullName,
+                MetricType.LastPrice,
+            ],
+            value_list=[1.0, "15:20:01", "x" * 25, 2.0],
+        )
+
+        # EXECUTE
+        write_sequence = writer.write(metric_batch=metric_batch)
+        read_batch = reader.read()
+        reader.close()
+
+    # CHECK
+    assert write_sequence == 2
+    assert writer.drop_count == 2
+    assert read_batch.product_id_list == ["360015751", "1" * 32]
+    assert read_batch.value_list == ["15:20:01", 2.0]
+
+
+@pytest.mark.quotecast
+def test_metric_ring_buffer_process():
+    with MetricRingBufferWriter(capacity=16) as writer:
+        # SETUP
+        parent_connection, child_connection = multiprocessing.Pipe()
+        writer.write(
+            metric_batch=MetricBatch(
+                product_id_list=["360015751", "360015751"],
+                metric_type_list=[MetricType.LastPrice, MetricType.LastTime],
+                value_list=[116.0, "15:20:01"],
+            )
+        )
+
+        # EXECUTE
+        process = multiprocessing.get_context("spawn").Process(
+            target=read_remotely,
+            args=(writer.name, child_connection),
+        )
+        process.start()
+        result = parent_connection.recv()
+        process.join(timeout=30)
+
+    # CHECK
+    assert process.exitcode == 0
+    assert result == (
+        ["360015751", "360015751"],
+        [MetricType.LastPrice, MetricType.LastTime],
+        [116.0, "15:20:01"],
+    )
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+import pytest
+
+from degiro_connector.quotecast.tools.metric_sink import MetricSink
+
+
+@pytest.mark.quotecast
+def test_metric_sink_parquet(tmp_path, ticker_registration, ticker_update):
+    # SETUP
+    metric_sink = MetricSink(
+        folder=tmp_path,
+        partition_by=["date", "product_id"],
+        flush_interval=None,
+    )
+
+    # EXECUTE
+    with metric_sink:
+        metric_sink.parse(ticker=ticker_registration)
+        pending_count = metric_sink.pending_count
+        metric_sink.flush(wait=True)
+        path_count = len(metric_sink.path_list)
+        metric_sink.parse(ticker=ticker_update)
+    df = (
+        pl.scan_parquet(tmp_path / "**" / "*.parquet")
+        .sort("response_datetime", "product_id", "metric_type")
+        .collect()
+    )
+
+    # CHECK
+    assert pending_count == 7
+    assert path_count == 2
+    assert metric_sink.row_count == 9
+    assert metric_sink.error_count == 0
+    assert metric_sink.path_list[0].parent.name == "360015751"
+    assert metric_sink.path_list[0].parent.parent.name == "2024-01-05"
+    assert df.height == 9
+    assert df.filter(pl.col("metric_type") == "LastPrice")[
+        "value_number"
+    ].to_list() == [115.85, 190.5, 116.0]
+    assert df.filter(pl.col("metric_type") == "LastTime")["value_text"].to_list() == [
+        "15:20:01",
+        "15:20:03",
+    ]
+    assert df["response_datetime"].dtype == pl.Datetime("us", "UTC")
+    assert df["response_datetime"].max() == datetime(
+        2024, 1, 5, 14, 20, 6, tzinfo=timezone.utc
+    )
+    assert set(df["request_duration_s"].to_list()) == {1.5, 2.0}
+
+
+@pytest.mark.quotecast
+def test_metric_sink_ipc(tmp_path, ticker_registration):
+    # SETUP
+    metric_sink = MetricSink(
+        folder=tmp_path,
+        file_format="ipc",
+        partition_by=[],
+        batch_size=5,
+        flush_interval=timedelta(seconds=60),
+    )
+
+    # EXECUTE
+    with metric_sink:
+        metric_sink.parse(ticker=ticker_registration)
+    df = pl.read_ipc(metric_sink.path_list[0])
+
+    # CHECK
+    assert len(metric_sink.path_list) == 1
+    assert df.columns == [
+        "product_id",
+        "metric_type",
+        "value_number",
+        "value_text",
+        "response_datetime",
+        "request_duration_s",
+    ]
+    assert df.height == 7
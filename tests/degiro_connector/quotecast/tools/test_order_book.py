@@ -0,0 +1,145 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from degiro_connector.quotecast.models.metric import (
+    METRIC_CODE_MAP,
+    MetricBatch,
+    MetricCodeBatch,
+    MetricType,
+)
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.eviction_policy import EvictionPolicy
+from degiro_connector.quotecast.tools.order_book import OrderBook
+
+
+@pytest.fixture
+def ticker_depth() -> Ticker:
+    json_text = (
+        '[{"m":"a_req","v":["360015751.A1Price",1]},'
+        '{"m":"a_req","v":["360015751.A1Volume",2]},'
+        '{"m":"a_req","v":["360015751.B1Price",3]},'
+        '{"m":"a_req","v":["360015751.B1Volume",4]},'
+        '{"m":"a_req","v":["360015751.B2Volume",5]},'
+        '{"m":"a_req","v":["360015751.LastPrice",6]},'
+        '{"m":"a_req","v":["AAPL.BATS,E.B1Price",7]},'
+        '{"m":"un","v":[1,101.0]},'
+        '{"m":"un","v":[2,300]},'
+        '{"m":"un","v":[3,99.0]},'
+        '{"m":"un","v":[4,100]},'
+        '{"m":"un","v":[5,200]},'
+        '{"m":"un","v":[6,100.5]},'
+        '{"m":"un","v":[7,190.5]},'
+        '{"m":"un","v":[1,102.0]}]'
+    )
+
+    return Ticker(
+        json_text=json_text,
+        response_datetime=datetime(2024, 1, 5, 15, 20, 4),
+        request_duration=timedelta(seconds=1),
+    )
+
+
+@pytest.mark.quotecast
+def test_order_book(ticker_depth):
+    # SETUP
+    order_book = OrderBook(capacity=1)
+
+    # EXECUTE
+    ask_price = order_book.ask_price
+    order_book.parse(ticker=ticker_depth)
+    snapshot = order_book.get_snapshot(product_id="360015751")
+    df = order_book.build_df(level_count=2)
+
+    # CHECK
+    assert ask_price.shape == (0, 10)
+    assert order_book.capacity == 2
+    assert order_book.product_id_list == ["360015751", "AAPL.BATS,E"]
+    assert order_book.ask_price[0, 0] == 102.0
+    assert order_book.bid_volume[0, :2].tolist() == [100.0, 200.0]
+    assert math.isnan(order_book.ask_price[0, 1])
+    assert np.shares_memory(snapshot, order_book.book)
+    assert order_book.spread()[0] == 3.0
+    assert order_book.mid()[0] == 100.5
+    assert order_book.microprice()[0] == (102.0 * 100 + 99.0 * 300) / 400
+    assert order_book.imbalance(level_count=2)[0] == 0.0
+    assert df["product_id"].to_list() == ["360015751", "AAPL.BATS,E"]
+    assert df["bid_price"].to_list() == [99.0, 190.5]
+    assert df["spread"].to_list() == [3.0, None]
+    assert df["imbalance"].to_list() == [0.0, None]
+
+
+@pytest.mark.quotecast
+def test_order_book_depth():
+    # SETUP
+    order_book = OrderBook(depth=5)
+
+    # EXECUTE
+    slot_map = OrderBook.build_slot_map()
+
+    # CHECK
+    assert len(slot_map) == 60
+    assert order_book.book.shape == (6, 0, 5)
+    with pytest.raises(ValueError):
+        OrderBook(depth=11)
+
+
+@pytest.mark.quotecast
+def test_order_book_duplicate():
+    # SETUP
+    order_book = OrderBook()
+    order_book.ticker_to_metric_list.register(
+        reference=1,
+        metric_name="360015751.A1Price",
+    )
+    value_list = [float(value) for value in range(1000)]
+    metric_code_batch = MetricCodeBatch(
+        product_code_list=[0] * len(value_list),
+        metric_code_list=[METRIC_CODE_MAP[MetricType.A1Price]] * len(value_list),
+        value_list=value_list,
+    )
+    metric_batch = MetricBatch(
+        product_id_list=["AAPL.BATS,E"] * len(value_list),
+        metric_type_list=[MetricType.B1Price] * len(value_list),
+        value_list=value_list[::-1],
+    )
+
+    # EXECUTE
+    code_count = order_book.update_code_batch(metric_code_batch=metric_code_batch)
+    count = order_book.update_batch(metric_batch=metric_batch)
+
+    # CHECK
+    assert code_count == count == 1000
+    assert order_book.ask_price[0, 0] == 999.0
+    assert order_book.bid_price[1, 0] == 0.0
+
+
+@pytest.mark.quotecast
+def test_order_book_eviction(ticker_depth):
+    # SETUP
+    order_book = OrderBook(eviction_policy=EvictionPolicy(ttl=timedelta(seconds=5)))
+    ticker_release = ticker_depth.model_copy(
+        update={"json_text": '[{"m":"a_rel","v":["AAPL.BATS,E.B1Price",7]}]'}
+    )
+    ticker_heartbeat = ticker_depth.model_copy(
+        update={
+            "json_text": '[{"m":"h"}]',
+            "response_datetime": ticker_depth.response_datetime + timedelta(seconds=6),
+        }
+    )
+
+    # EXECUTE
+    order_book.parse(ticker=ticker_depth)
+    order_book.parse(ticker=ticker_release)
+    product_id_list = list(order_book.product_id_list)
+    ask_price = order_book.ask_price[0, 0]
+    order_book.parse(ticker=ticker_heartbeat)
+
+    # CHECK
+    assert product_id_list == ["360015751"]
+    assert ask_price == 102.0
+    assert order_book.product_id_list == []
+    assert order_book.book.shape == (6, 0, 10)
+    assert order_book.eviction_policy.product_count == 0
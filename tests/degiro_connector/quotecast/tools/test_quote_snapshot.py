@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.tools.quote_snapshot import QuoteSnapshot
+from degiro_connector.quotecast.tools.ticker_simulator import TickerSimulator
+
+
+@pytest.mark.quotecast
+def test_quote_snapshot():
+    with TickerSimulator(universe_size=50, tick_rate=10, seed=0) as simulator:
+        # SETUP
+        product_id_list = simulator.product_id_list[:30]
+        quote_snapshot = QuoteSnapshot(
+            user_token=0,
+            shard_count=3,
+            timeout=timedelta(seconds=10),
+            quotecast_url=simulator.url,
+        )
+
+        # EXECUTE
+        df = quote_snapshot.fetch_sync(product_id_list=product_id_list[::-1])
+
+        # CHECK
+        assert df["product_id"].to_list() == product_id_list[::-1]
+        assert df["LastPrice"].null_count() == 0
+        assert "LastDatetimeUTC" in df.columns
+        assert df["request_duration_s"].null_count() == 0
+        assert quote_snapshot.missing_product_id_list == []
+
+
+@pytest.mark.quotecast
+def test_quote_snapshot_timeout():
+    with TickerSimulator(universe_size=5, latency=1.0, seed=0) as simulator:
+        # SETUP
+        quote_snapshot = QuoteSnapshot(
+            user_token=0,
+            shard_count=2,
+            metric_type_list=[MetricType.LastPrice],
+            timeout=timedelta(seconds=0.2),
+            quotecast_url=simulator.url,
+        )
+
+        # EXECUTE
+        df = quote_snapshot.fetch_sync(product_id_list=simulator.product_id_list)
+
+        # CHECK
+        assert df.columns == ["product_id"]
+        assert df["product_id"].to_list() == simulator.product_id_list
+        assert quote_snapshot.missing_product_id_list == simulator.product_id_list
+
+
+@pytest.mark.quotecast
+def test_quote_snapshot_rejected():
+    with TickerSimulator(universe_size=5, tick_rate=10, seed=0) as simulator:
+        # SETUP
+        product_id_list = ["1"] + simulator.product_id_list
+        quote_snapshot = QuoteSnapshot(
+            user_token=0,
+            shard_count=1,
+            metric_type_list=[MetricType.LastPrice],
+            timeout=timedelta(seconds=10),
+            quotecast_url=simulator.url,
+        )
+
+        # EXECUTE
+        start = time.monotonic()
+        df = quote_snapshot.fetch_sync(product_id_list=product_id_list)
+        duration = time.monotonic() - start
+
+        # CHECK
+        assert duration < 5
+        assert df["product_id"].to_list() == product_id_list
+        assert df["LastPrice"].null_count() == 1
+        assert df["LastPrice"][0] is None
+        assert quote_snapshot.missing_product_id_list == ["1"]
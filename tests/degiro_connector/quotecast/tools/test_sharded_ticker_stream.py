@@ -0,0 +1,228 @@
+import asyncio
+import re
+import time
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.sharded_ticker_stream import (
+    BalancedShardPolicy,
+    HashShardPolicy,
+    ShardedTickerStream,
+)
+from degiro_connector.quotecast.tools.ticker_stream import TickerStream
+
+
+def build_transport(session_count: int = 3) -> httpx.MockTransport:
+    """Each session echoes its subscriptions once, then expires.
+
+    No session is delivered after the first `session_count` ones.
+    """
+
+    session_map: dict[str, list[str]] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        session_id = request.url.path.rsplit("/", 1)[-1]
+
+        if session_id == "request_session" and len(session_map) >= session_count:
+            return httpx.Response(200, text="{}")
+        elif session_id == "request_session":
+            session_id = f"SESSION-{len(session_map)}"
+            session_map[session_id] = []
+            return httpx.Response(200, text=f'{{"sessionId":"{session_id}"}}')
+        elif request.method == "POST":
+            control_data = request.content.decode()
+            session_map[session_id].extend(re.findall(r"a_req\((.+?)\);", control_data))
+            return httpx.Response(200, text="")
+        elif session_map[session_id]:
+            metric_name_list = session_map[session_id]
+            session_map[session_id] = []
+            message_list = []
+            for reference, metric_name in enumerate(metric_name_list):
+                message_list.append(f'{{"m":"a_req","v":["{metric_name}",{reference}]}}')
+                message_list.append(f'{{"m":"un","v":[{reference},1.0]}}')
+            return httpx.Response(200, text="[" + ",".join(message_list) + "]")
+        else:
+            return httpx.Response(200, text='[{"m":"sr"}]')
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.quotecast
+def test_split_balanced():
+    # SETUP
+    stream = ShardedTickerStream(
+        user_token=0,
+        shard_count=2,
+        shard_policy=BalancedShardPolicy(),
+        client=httpx.AsyncClient(transport=build_transport()),
+    )
+    ticker_request = TickerRequest(
+        request_type="subscription",
+        request_map={
+            "A": ["LastPrice"],
+            "B": ["LastPrice", "LastVolume", "LastDate"],
+            "C": ["LastPrice", "LastVolume"],
+        },
+    )
+
+    # EXECUTE
+    shard_request_list = stream.split(ticker_request=ticker_request)
+    load_list = stream.load_list
+    for shard, shard_request in enumerate(shard_request_list):
+        stream.commit(shard=shard, ticker_request=shard_request)
+    unsubscription_list = stream.split(
+        ticker_request=TickerRequest(
+            request_type="unsubscription",
+            request_map={"B": ["LastPrice", "LastVolume", "LastDate"]},
+        )
+    )
+    stream.commit(shard=0, ticker_request=unsubscription_list[0])
+
+    # CHECK
+    assert list(shard_request_list[0].request_map) == ["B"]
+    assert list(shard_request_list[1].request_map) == ["C", "A"]
+    assert load_list == [0, 0]
+    assert unsubscription_list[1] is None
+    assert stream.load_list == [0, 3]
+    assert stream.product_shard_map == {"A": 1, "C": 1}
+
+
+@pytest.mark.quotecast
+def test_sharded_ticker_stream(monkeypatch):
+    # SETUP
+    monkeypatch.setattr(TickerStream, "RETRY_DELAY", timedelta(0))
+    ticker_request = TickerRequest(
+        request_type="subscription",
+        request_map={
+            str(product_id): ["LastPrice", "LastVolume"] for product_id in range(10)
+        },
+    )
+
+    async def consume():
+        client = httpx.AsyncClient(transport=build_transport())
+        product_id_set = set()
+
+        async with ShardedTickerStream(
+            user_token=0,
+            shard_count=3,
+            shard_policy=HashShardPolicy(),
+            client=client,
+        ) as stream:
+            assert await stream.subscribe(ticker_request=ticker_request)
+            async for metric_batch in stream:
+                product_id_set.update(metric_batch.product_id_list)
+
+        await client.aclose()
+
+        return product_id_set
+
+    # EXECUTE
+    product_id_set = asyncio.run(consume())
+
+    # CHECK
+    assert product_id_set == {str(product_id) for product_id in range(10)}
+
+
+@pytest.mark.quotecast
+def test_sharded_ticker_stream_rollback(monkeypatch):
+    # SETUP
+    monkeypatch.setattr(TickerStream, "RETRY_DELAY", timedelta(0))
+    session_list: list[str] = []
+    subscribed_list: list[str] = []
+    ticker_request = TickerRequest(
+        request_type="subscription",
+        request_map={
+            "A": ["LastPrice"],
+            "B": ["LastPrice", "LastVolume"],
+            "C": ["LastPrice"],
+        },
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        session_id = request.url.path.rsplit("/", 1)[-1]
+
+        if session_id == "request_session" and len(session_list) >= 2:
+            return httpx.Response(200, text="{}")
+        elif session_id == "request_session":
+            session_list.append(f"SESSION-{len(session_list)}")
+            return httpx.Response(200, text=f'{{"sessionId":"{session_list[-1]}"}}')
+        elif request.method == "POST" and "B.LastPrice" in request.content.decode():
+            return httpx.Response(500, text="")
+        elif request.method == "POST":
+            subscribed_list.append(session_id)
+            return httpx.Response(200, text="")
+        elif session_id in subscribed_list:
+            subscribed_list.remove(session_id)
+            return httpx.Response(200, text='[{"m":"d","v":["C.LastPrice",1]}]')
+        else:
+            return httpx.Response(200, text='[{"m":"sr"}]')
+
+    async def consume():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        reject_list = []
+
+        async with ShardedTickerStream(
+            user_token=0,
+            shard_count=2,
+            shard_policy=BalancedShardPolicy(),
+            client=client,
+        ) as stream:
+            success = await stream.subscribe(ticker_request=ticker_request)
+            subscribed_load_list = stream.load_list
+            async for _metric_batch in stream:
+                reject_list.extend(stream.last_reject_list)
+
+        await client.aclose()
+
+        return success, subscribed_load_list, reject_list, stream
+
+    # EXECUTE
+    success, subscribed_load_list, reject_list, stream = asyncio.run(consume())
+
+    # CHECK
+    assert success is False
+    assert subscribed_load_list == [0, 2]
+    assert reject_list == [("C", "LastPrice")]
+    assert stream.load_list == [0, 1]
+    assert stream.product_shard_map == {"A": 1}
+
+
+@pytest.mark.quotecast
+def test_close_bounded(monkeypatch):
+    # SETUP
+    released = asyncio.Event()
+
+    async def stubborn_anext(self):
+        # SWALLOWS THE CANCELLATIONS UNTIL RELEASED
+        while not released.is_set():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                pass
+        raise StopAsyncIteration
+
+    monkeypatch.setattr(TickerStream, "__anext__", stubborn_anext)
+    monkeypatch.setattr(ShardedTickerStream, "CANCEL_ATTEMPT_COUNT", 3)
+    monkeypatch.setattr(ShardedTickerStream, "CANCEL_INTERVAL", timedelta(seconds=0.05))
+
+    async def close():
+        client = httpx.AsyncClient(transport=build_transport())
+        stream = ShardedTickerStream(user_token=0, shard_count=2, client=client)
+        aiter(stream)
+        await asyncio.sleep(0)
+        start = time.monotonic()
+        await stream.close()
+        duration = time.monotonic() - start
+        released.set()
+        await client.aclose()
+
+        return duration
+
+    # EXECUTE
+    duration = asyncio.run(close())
+
+    # CHECK
+    assert duration < 1
@@ -0,0 +1,54 @@
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.subscription_tracker import SubscriptionTracker
+
+
+@pytest.mark.quotecast
+def test_diff():
+    # SETUP
+    subscription_tracker = SubscriptionTracker()
+    subscription_tracker.update(
+        ticker_request=TickerRequest(
+            request_type="subscription",
+            request_map={
+                "360015751": [MetricType.LastPrice, MetricType.LastVolume],
+                "AAPL.BATS,E": [MetricType.LastPrice],
+            },
+        )
+    )
+
+    # EXECUTE
+    subscription, unsubscription = subscription_tracker.diff(
+        request_map={
+            "360015751": ["LastPrice"],
+            "360017018": ["LastPrice"],
+        }
+    )
+
+    # CHECK
+    assert subscription_tracker.metric_count == 3
+    assert subscription.request_type == "subscription"
+    assert subscription.request_map == {"360017018": [MetricType.LastPrice]}
+    assert unsubscription.request_type == "unsubscription"
+    assert unsubscription.request_map == {
+        "360015751": [MetricType.LastVolume],
+        "AAPL.BATS,E": [MetricType.LastPrice],
+    }
+
+
+@pytest.mark.quotecast
+def test_diff_unchanged():
+    # SETUP
+    subscription_tracker = SubscriptionTracker()
+    request_map = {"360015751": ["LastPrice"]}
+    subscription_tracker.update(
+        ticker_request=TickerRequest(
+            request_type="subscription",
+            request_map=request_map,
+        )
+    )
+
+    # CHECK
+    assert subscription_tracker.diff(request_map=request_map) == (None, None)
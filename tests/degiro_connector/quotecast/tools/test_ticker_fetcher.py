@@ -0,0 +1,50 @@
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
+
+
+@pytest.mark.quotecast
+def test_build_ticker_request_payload():
+    # SETUP
+    ticker_request = TickerRequest(
+        request_type="unsubscription",
+        request_map={
+            "360017018": [MetricType.LastDate, "LastPrice"],
+        },
+    )
+
+    # EXECUTE
+    payload = TickerFetcher.build_ticker_request_payload(ticker_request=ticker_request)
+
+    # CHECK
+    assert payload == (
+        '{"controlData":"a_rel(360017018.LastDate);a_rel(360017018.LastPrice);"}'
+    )
+
+
+@pytest.mark.quotecast
+def test_split_ticker_request():
+    # SETUP
+    ticker_request = TickerRequest(
+        request_type="subscription",
+        request_map={
+            str(product_id): ["LastPrice", "LastVolume"] for product_id in range(100)
+        },
+    )
+
+    # EXECUTE
+    ticker_request_list = TickerFetcher.split_ticker_request(
+        ticker_request=ticker_request,
+        max_payload_size=256,
+    )
+    payload_list = [
+        TickerFetcher.build_ticker_request_payload(ticker_request=chunk)
+        for chunk in ticker_request_list
+    ]
+
+    # CHECK
+    assert len(ticker_request_list) > 1
+    assert all(len(payload) <= 256 for payload in payload_list)
+    assert "".join(payload_list).count("a_req(") == 200
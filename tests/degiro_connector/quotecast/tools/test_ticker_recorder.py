@@ -0,0 +1,42 @@
+import pytest
+
+from degiro_connector.quotecast.tools.ticker_recorder import (
+    TickerRecorder,
+    TickerReplayer,
+)
+from degiro_connector.quotecast.tools.ticker_to_df import TickerToDF
+
+
+@pytest.mark.quotecast
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_record_and_replay(
+    tmp_path,
+    compression,
+    ticker_registration,
+    ticker_update,
+    ticker_heartbeat,
+):
+    # SETUP
+    ticker_list = [ticker_registration, ticker_heartbeat, ticker_update]
+
+    # EXECUTE
+    with TickerRecorder(
+        folder=tmp_path,
+        compression=compression,
+        max_file_size=1,
+    ) as recorder:
+        for ticker in ticker_list:
+            recorder.write(ticker=ticker)
+
+    replayed_list = list(TickerReplayer(path=tmp_path).replay(speed=None))
+    ticker_to_df = TickerToDF()
+    for ticker in replayed_list:
+        ticker_to_df.parse(ticker=ticker)
+
+    # CHECK
+    assert recorder.record_count == 3
+    assert len(recorder.path_list) == 3
+    assert [ticker.model_dump() for ticker in replayed_list] == [
+        ticker.model_dump() for ticker in ticker_list
+    ]
+    assert ticker_to_df.last_df["LastPrice"].to_list() == [116.0, 190.5]
@@ -0,0 +1,130 @@
+import pytest
+
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.ticker_fetcher import TickerFetcher
+from degiro_connector.quotecast.tools.ticker_session import TickerSession
+
+
+@pytest.mark.quotecast
+def test_ticker_session_renew(mocker, ticker_registration, ticker_update):
+    # SETUP
+    session_id_list = ["SESSION-1", "SESSION-2"]
+    fetch_result_list = [ticker_registration, BrokenPipeError(), ticker_update]
+    subscription_list = []
+
+    def fetch_ticker(**kwargs):
+        result = fetch_result_list.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def subscribe(ticker_request, session_id, **kwargs):
+        subscription_list.append((session_id, ticker_request))
+        return True
+
+    mocker.patch.object(
+        TickerFetcher,
+        "get_session_id",
+        side_effect=lambda **kwargs: session_id_list.pop(0),
+    )
+    mocker.patch.object(TickerFetcher, "fetch_ticker", side_effect=fetch_ticker)
+    mocker.patch.object(TickerFetcher, "subscribe", side_effect=subscribe)
+
+    ticker_session = TickerSession(user_token=0)
+    ticker_to_metric_list = ticker_session.ticker_to_metric_list
+
+    # EXECUTE
+    ticker_session.subscribe(
+        ticker_request=TickerRequest(
+            request_type="subscription",
+            request_map={"360015751": ["LastPrice", "LastVolume"]},
+        )
+    )
+    ticker_to_metric_list.parse_batch(ticker=ticker_session.fetch_ticker())
+    reference_count = len(ticker_to_metric_list.reference_map)
+    ticker = ticker_session.fetch_ticker()
+
+    # CHECK
+    assert ticker is ticker_update
+    assert reference_count == 7
+    assert ticker_to_metric_list.reference_map == {}
+    assert ticker_session.session_id == "SESSION-2"
+    assert ticker_session.reconnect_count == 1
+    assert len(ticker_session.gap_list) == 1
+    assert [session_id for session_id, _ in subscription_list] == [
+        "SESSION-1",
+        "SESSION-2",
+    ]
+    assert subscription_list[1][1].request_map == {
+        "360015751": ["LastPrice", "LastVolume"]
+    }
+
+
+@pytest.mark.quotecast
+def test_ticker_session_renew_outage(mocker, ticker_update):
+    # SETUP
+    session_id_list = ["SESSION-1", None, "SESSION-2"]
+    fetch_result_list = [BrokenPipeError(), ticker_update]
+
+    def fetch_ticker(**kwargs):
+        result = fetch_result_list.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    mocker.patch.object(
+        TickerFetcher,
+        "get_session_id",
+        side_effect=lambda **kwargs: session_id_list.pop(0),
+    )
+    mocker.patch.object(TickerFetcher, "fetch_ticker", side_effect=fetch_ticker)
+    mocker.patch.object(TickerFetcher, "subscribe", return_value=True)
+
+    ticker_session = TickerSession(user_token=0)
+
+    # EXECUTE
+    ticker_session.connect()
+    failed_ticker = ticker_session.fetch_ticker()
+    ticker = ticker_session.fetch_ticker()
+
+    # CHECK
+    assert failed_ticker is None
+    assert ticker is ticker_update
+    assert ticker_session.session_id == "SESSION-2"
+    assert ticker_session.reconnect_count == 1
+    assert len(ticker_session.gap_list) == 1
+
+
+@pytest.mark.quotecast
+def test_ticker_session_subscribe_failed(mocker):
+    # SETUP
+    success_list = [True, None]
+    mocker.patch.object(TickerFetcher, "get_session_id", return_value="SESSION-1")
+    mocker.patch.object(
+        TickerFetcher,
+        "subscribe",
+        side_effect=lambda **kwargs: success_list.pop(0),
+    )
+
+    ticker_session = TickerSession(user_token=0)
+
+    # EXECUTE
+    success = ticker_session.subscribe(
+        ticker_request=TickerRequest(
+            request_type="subscription",
+            request_map={"360015751": ["LastPrice"]},
+        )
+    )
+    failed_success = ticker_session.subscribe(
+        ticker_request=TickerRequest(
+            request_type="subscription",
+            request_map={"360015752": ["LastPrice"]},
+        )
+    )
+
+    # CHECK
+    assert success is True
+    assert failed_success is None
+    assert ticker_session.subscription_tracker.build_ticker_request().request_map == {
+        "360015751": ["LastPrice"]
+    }
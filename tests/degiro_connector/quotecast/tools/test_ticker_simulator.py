@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.ticker_session import TickerSession
+from degiro_connector.quotecast.tools.ticker_simulator import TickerSimulator
+from degiro_connector.quotecast.tools.ticker_stream import TickerStream
+
+
+@pytest.mark.quotecast
+def test_ticker_simulator_session():
+    with TickerSimulator(universe_size=10, tick_rate=1000, seed=0) as simulator:
+        # SETUP
+        product_id = simulator.product_id_list[0]
+        ticker_session = TickerSession(user_token=0, quotecast_url=simulator.url)
+        ticker_to_metric_list = ticker_session.ticker_to_metric_list
+
+        # EXECUTE
+        ticker_session.subscribe(
+            ticker_request=TickerRequest(
+                request_type="subscription",
+                request_map={product_id: ["LastDate", "LastPrice", "LastVolume"]},
+            )
+        )
+        metric_batch = ticker_to_metric_list.parse_batch(
+            ticker=ticker_session.fetch_ticker()
+        )
+        simulator.expire(session_id=ticker_session.session_id)
+        renewed_batch = ticker_to_metric_list.parse_batch(
+            ticker=ticker_session.fetch_ticker()
+        )
+
+        # CHECK
+        assert len(metric_batch) >= 3
+        assert set(metric_batch.product_id_list) == {product_id}
+        assert ticker_session.reconnect_count == 1
+        assert len(ticker_to_metric_list.reference_map) == 3
+        assert len(renewed_batch) >= 3
+
+
+@pytest.mark.quotecast
+def test_ticker_simulator_late_subscribe():
+    with TickerSimulator(tick_rate=1000, seed=0) as simulator:
+        # SETUP
+        ticker_session = TickerSession(user_token=0, quotecast_url=simulator.url)
+        ticker_session.connect()
+        time.sleep(0.5)
+
+        # EXECUTE
+        ticker_session.subscribe(
+            ticker_request=TickerRequest(
+                request_type="subscription",
+                request_map={simulator.product_id_list[0]: ["LastPrice"]},
+            )
+        )
+        metric_batch = ticker_session.ticker_to_metric_list.parse_batch(
+            ticker=ticker_session.fetch_ticker()
+        )
+
+    # CHECK
+    assert 1 <= len(metric_batch) < 100
+
+
+@pytest.mark.quotecast
+def test_ticker_simulator_heartbeat():
+    with TickerSimulator(heartbeat_interval=0.05) as simulator:
+        # SETUP
+        ticker_session = TickerSession(user_token=0, quotecast_url=simulator.url)
+
+        # EXECUTE
+        ticker_session.connect()
+        ticker = ticker_session.fetch_ticker()
+
+        # CHECK
+        assert ticker.json_text == '[{"m":"h"}]'
+
+
+@pytest.mark.quotecast
+def test_ticker_simulator_stream():
+    async def consume(url: str, product_id: str) -> list:
+        async with TickerStream(user_token=0, quotecast_url=url) as stream:
+            await stream.subscribe(
+                ticker_request=TickerRequest(
+                    request_type="subscription",
+                    request_map={product_id: ["LastPrice"]},
+                )
+            )
+            metric_batch_list = []
+            async for metric_batch in stream:
+                metric_batch_list.append(metric_batch)
+                if len(metric_batch_list) == 3:
+                    break
+            return metric_batch_list
+
+    with TickerSimulator(tick_rate=200, seed=0) as simulator:
+        # EXECUTE
+        metric_batch_list = asyncio.run(
+            consume(url=simulator.url, product_id=simulator.product_id_list[-1])
+        )
+
+    # CHECK
+    assert len(metric_batch_list) == 3
+    assert all(
+        isinstance(value, float)
+        for metric_batch in metric_batch_list
+        for value in metric_batch.value_list
+    )
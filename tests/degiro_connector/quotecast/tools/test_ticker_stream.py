@@ -0,0 +1,139 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from degiro_connector.quotecast.models.metric import MetricType
+from degiro_connector.quotecast.models.ticker import TickerRequest
+from degiro_connector.quotecast.tools.ticker_stream import TickerStream
+
+
+def build_transport(
+    ticker_registration,
+    ticker_update,
+    ticker_heartbeat,
+) -> httpx.MockTransport:
+    payload_list = [
+        ticker_registration.json_text,
+        ticker_heartbeat.json_text,
+        ticker_update.json_text,
+        '[{"m":"sr"}]',
+    ]
+    control_data_list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/request_session"):
+            return httpx.Response(200, text='{"sessionId":"SESSION-ID"}')
+        elif request.method == "POST":
+            control_data_list.append(request.content.decode())
+            return httpx.Response(200, text="")
+        else:
+            return httpx.Response(200, text=payload_list.pop(0))
+
+    transport = httpx.MockTransport(handler)
+    transport.control_data_list = control_data_list
+
+    return transport
+
+
+@pytest.mark.quotecast
+def test_ticker_stream(
+    monkeypatch,
+    ticker_registration,
+    ticker_update,
+    ticker_heartbeat,
+):
+    # SETUP
+    monkeypatch.setattr(TickerStream, "RETRY_DELAY", timedelta(0))
+    transport = build_transport(
+        ticker_registration=ticker_registration,
+        ticker_update=ticker_update,
+        ticker_heartbeat=ticker_heartbeat,
+    )
+    ticker_request = TickerRequest(
+        request_type="subscription",
+        request_map={"360015751": [MetricType.LastPrice]},
+    )
+
+    async def consume():
+        client = httpx.AsyncClient(transport=transport)
+        metric_batch_list = []
+
+        async with TickerStream(user_token=0, client=client) as stream:
+            await stream.subscribe(ticker_request=ticker_request)
+            await stream.unsubscribe(ticker_request=ticker_request)
+            async for metric_batch in stream:
+                metric_batch_list.append(metric_batch)
+
+        await client.aclose()
+
+        return stream, metric_batch_list
+
+    # EXECUTE
+    stream, metric_batch_list = asyncio.run(consume())
+
+    # CHECK
+    assert stream.session_id is None
+    assert [len(metric_batch) for metric_batch in metric_batch_list] == [7, 2]
+    assert metric_batch_list[1].value_list == [116.0, 250]
+    assert transport.control_data_list == [
+        '{"controlData":"a_req(360015751.LastPrice);"}',
+        '{"controlData":"a_rel(360015751.LastPrice);"}',
+    ]
+
+
+@pytest.mark.quotecast
+def test_ticker_stream_retry(monkeypatch, ticker_registration, ticker_update):
+    # SETUP
+    monkeypatch.setattr(TickerStream, "RETRY_DELAY", timedelta(seconds=0.01))
+    payload_list = [
+        ticker_registration.json_text,
+        httpx.ConnectError("DOWN"),
+        httpx.ConnectError("DOWN"),
+        ticker_update.json_text,
+    ]
+    post_list = [httpx.Response(500, text=""), httpx.Response(200, text="")]
+    ticker_request = TickerRequest(
+        request_type="subscription",
+        request_map={"360015751": [MetricType.LastPrice]},
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/request_session"):
+            return httpx.Response(200, text='{"sessionId":"SESSION-ID"}')
+        elif request.method == "POST":
+            return post_list.pop(0)
+        elif payload_list:
+            payload = payload_list.pop(0)
+            if isinstance(payload, Exception):
+                raise payload
+            return httpx.Response(200, text=payload)
+        else:
+            raise httpx.ConnectError("DOWN")
+
+    async def consume():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        metric_batch_list = []
+
+        async with TickerStream(user_token=0, client=client) as stream:
+            failed_success = await stream.subscribe(ticker_request=ticker_request)
+            failed_request = stream.subscription_tracker.build_ticker_request()
+            success = await stream.subscribe(ticker_request=ticker_request)
+            async for metric_batch in stream:
+                metric_batch_list.append(metric_batch)
+
+        await client.aclose()
+
+        return failed_success, failed_request, success, metric_batch_list
+
+    # EXECUTE
+    failed_success, failed_request, success, metric_batch_list = asyncio.run(
+        consume()
+    )
+
+    # CHECK
+    assert failed_success is None
+    assert failed_request is None
+    assert success is True
+    assert [len(metric_batch) for metric_batch in metric_batch_list] == [7, 2]
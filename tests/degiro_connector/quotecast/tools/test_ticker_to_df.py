@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from degiro_connector.quotecast.tools.eviction_policy import EvictionPolicy
+from degiro_connector.quotecast.tools.ticker_to_df import (
+    TickerToDF,
+    TickerToDFIncremental,
+)
+
+
+@pytest.mark.quotecast
+def test_incremental_matches_full_rebuild(ticker_registration, ticker_update):
+    # SETUP
+    ticker_to_df = TickerToDF()
+    ticker_to_df_incremental = TickerToDFIncremental(capacity=1)
+
+    # EXECUTE
+    for ticker in [ticker_registration, ticker_update]:
+        df = ticker_to_df.parse(ticker=ticker)
+        ticker_to_df_incremental.parse(ticker=ticker)
+    df_incremental = ticker_to_df_incremental.build_df()
+
+    # CHECK
+    assert isinstance(df_incremental, pl.DataFrame)
+    assert ticker_to_df_incremental.product_count == 2
+    assert ticker_to_df_incremental.capacity == 2
+    assert df.equals(df_incremental)
+    assert df["request_duration_s"].dtype == pl.Float64
+    assert df["request_duration_s"].to_list() == [2.0, 1.5]
+    assert df["response_datetime_utc"].to_list() == [
+        datetime(2024, 1, 5, 14, 20, 6),
+        datetime(2024, 1, 5, 14, 20, 4),
+    ]
+    assert df_incremental["request_duration_s"].to_list() == [2.0, 1.5]
+    assert df_incremental["LastPrice"].to_list() == [116.0, 190.5]
+    assert df_incremental["LastVolume"].to_list() == [250, None]
+
+
+@pytest.mark.quotecast
+def test_incremental_heartbeat(ticker_heartbeat):
+    # SETUP
+    ticker_to_df_incremental = TickerToDFIncremental()
+
+    # EXECUTE
+    metric_batch = ticker_to_df_incremental.parse(ticker=ticker_heartbeat)
+
+    # CHECK
+    assert len(metric_batch) == 0
+    assert ticker_to_df_incremental.build_df() is None
+
+
+@pytest.mark.quotecast
+def test_release_evicts_product(ticker_registration, ticker_update):
+    # SETUP
+    ticker_to_df = TickerToDF()
+    ticker_to_df_incremental = TickerToDFIncremental(capacity=1)
+    ticker_release = ticker_update.model_copy(
+        update={
+            "json_text": (
+                '[{"m":"a_rel","v":["360015751.LastDate",1]},'
+                '{"m":"a_rel","v":["360015751.LastTime",2]},'
+                '{"m":"a_rel","v":["360015751.LastPrice",3]},'
+                '{"m":"a_rel","v":["360015751.LastVolume",4]}]'
+            )
+        }
+    )
+
+    # EXECUTE
+    for ticker in [ticker_registration, ticker_update, ticker_release]:
+        df = ticker_to_df.parse(ticker=ticker)
+        ticker_to_df_incremental.parse(ticker=ticker)
+    df_incremental = ticker_to_df_incremental.build_df()
+
+    # CHECK
+    assert df.equals(df_incremental)
+    assert df["product_id"].to_list() == ["AAPL.BATS,E"]
+    assert "LastVolume" not in df.columns
+    assert ticker_to_df.get_memory_usage()["metric_count"] == 3
+    assert ticker_to_df.get_memory_usage()["product_count"] == 1
+    assert ticker_to_df.get_memory_usage()["reference_count"] == 3
+    assert ticker_to_df_incremental.get_memory_usage() == {
+        "capacity": 2,
+        "code_count": 2,
+        "column_count": 3,
+        "interned_count": 2,
+        "product_count": 1,
+        "reference_count": 3,
+        "row_by_code_count": 0,
+    }
+
+
+@pytest.mark.quotecast
+def test_release_reuses_code(ticker_registration, ticker_update):
+    # SETUP
+    ticker_to_df_incremental = TickerToDFIncremental()
+    ticker_release = ticker_update.model_copy(
+        update={
+            "json_text": (
+                '[{"m":"a_rel","v":["360015751.LastDate",1]},'
+                '{"m":"a_rel","v":["360015751.LastTime",2]},'
+                '{"m":"a_rel","v":["360015751.LastPrice",3]},'
+                '{"m":"a_rel","v":["360015751.LastVolume",4]}]'
+            )
+        }
+    )
+    ticker_new = ticker_update.model_copy(
+        update={
+            "json_text": (
+                '[{"m":"a_req","v":["NEW.LastPrice",9]},'
+                '{"m":"un","v":[9,42.0]},'
+                '{"m":"un","v":[7,191.0]}]'
+            )
+        }
+    )
+
+    # EXECUTE
+    for ticker in [ticker_registration, ticker_update, ticker_release, ticker_new]:
+        ticker_to_df_incremental.parse(ticker=ticker)
+    df = ticker_to_df_incremental.build_df()
+    product_interner = ticker_to_df_incremental.ticker_to_metric_list.product_interner
+
+    # CHECK
+    assert product_interner.name_list == ["NEW", "AAPL.BATS,E"]
+    assert df["product_id"].to_list() == ["AAPL.BATS,E", "NEW"]
+    assert df["LastPrice"].to_list() == [191.0, 42.0]
+    assert ticker_to_df_incremental.get_memory_usage()["code_count"] == 2
+    ticker_to_df_incremental.ticker_to_metric_list.reset()
+    assert len(product_interner) == 0
+
+
+@pytest.mark.quotecast
+def test_eviction_policy_ttl(ticker_registration, ticker_update, ticker_heartbeat):
+    # SETUP
+    ticker_to_df = TickerToDF(
+        eviction_policy=EvictionPolicy(ttl=timedelta(seconds=5)),
+    )
+    ticker_to_df_incremental = TickerToDFIncremental(
+        eviction_policy=EvictionPolicy(ttl=timedelta(seconds=5)),
+    )
+
+    # EXECUTE
+    for ticker in [ticker_registration, ticker_update]:
+        ticker_to_df.parse(ticker=ticker)
+        ticker_to_df_incremental.parse(ticker=ticker)
+    ticker_to_df.parse(ticker=ticker_heartbeat)
+    ticker_to_df_incremental.parse(ticker=ticker_heartbeat)
+
+    # CHECK
+    assert ticker_to_df.stored_metric_list == []
+    assert ticker_to_df.get_memory_usage()["product_count"] == 0
+    assert ticker_to_df_incremental.product_count == 0
+    assert ticker_to_df_incremental.build_df() is None
+    assert ticker_to_df.ticker_to_metric_list.is_subscribed(product_id="360015751")
@@ -0,0 +1,144 @@
+import pytest
+
+from degiro_connector.quotecast.models.metric import METRIC_CODE_MAP, MetricType
+from degiro_connector.quotecast.models.ticker import Ticker
+from degiro_connector.quotecast.tools.interner import Interner
+from degiro_connector.quotecast.tools.ticker_to_metric_list import TickerToMetricList
+
+
+@pytest.mark.quotecast
+def test_parse_batch(ticker_registration, ticker_update):
+    # SETUP
+    ticker_to_metric_list = TickerToMetricList()
+
+    # EXECUTE
+    ticker_to_metric_list.parse_batch(ticker=ticker_registration)
+    metric_batch = ticker_to_metric_list.parse_batch(ticker=ticker_update)
+
+    # CHECK
+    assert len(metric_batch) == 2
+    assert metric_batch.product_id_list == ["360015751", "360015751"]
+    assert metric_batch.metric_type_list == [
+        MetricType.LastPrice,
+        MetricType.LastVolume,
+    ]
+    assert metric_batch.value_list == [116.0, 250]
+
+
+@pytest.mark.quotecast
+def test_parse_matches_message_list(ticker_registration):
+    # SETUP
+    ticker_to_metric_list_fast = TickerToMetricList()
+    ticker_to_metric_list_slow = TickerToMetricList()
+
+    # EXECUTE
+    metric_list_fast = ticker_to_metric_list_fast.parse(ticker=ticker_registration)
+    message_list = TickerToMetricList.from_ticker_to_message_list(
+        ticker=ticker_registration
+    )
+    metric_list_slow = ticker_to_metric_list_slow.from_message_list_to_metric_list(
+        message_list=message_list
+    )
+
+    # CHECK
+    assert metric_list_fast == metric_list_slow
+
+
+@pytest.mark.quotecast
+def test_parse_batch_rejected(ticker_registration):
+    # SETUP
+    ticker_to_metric_list = TickerToMetricList()
+    ticker = ticker_registration.model_copy(
+        update={
+            "json_text": (
+                '[{"m":"d","v":["UNKNOWN.LastPrice",8]},'
+                '{"m":"a_req","v":["360015751.LastPrice",1]},'
+                '{"m":"un","v":[1,10.5]}]'
+            )
+        }
+    )
+
+    # EXECUTE
+    metric_batch = ticker_to_metric_list.parse_batch(ticker=ticker)
+    metric_code_batch = TickerToMetricList().parse_code_batch(ticker=ticker)
+
+    # CHECK
+    assert isinstance(ticker, Ticker)
+    assert metric_batch.product_id_list == ["360015751"]
+    assert metric_batch.value_list == [10.5]
+    assert len(metric_code_batch) == 1
+    assert ticker_to_metric_list.last_reject_list == [("UNKNOWN", "LastPrice")]
+    with pytest.raises(AttributeError):
+        TickerToMetricList.from_ticker_to_message_list(ticker=ticker)
+    with pytest.raises(AttributeError):
+        TickerToMetricList().parse(ticker=ticker)
+
+
+@pytest.mark.quotecast
+def test_parse_batch_release(ticker_registration):
+    # SETUP
+    ticker_to_metric_list = TickerToMetricList()
+    ticker_release = ticker_registration.model_copy(
+        update={
+            "json_text": (
+                '[{"m":"a_rel","v":["AAPL.BATS,E.LastPrice",7]},'
+                '{"m":"a_rel","v":["360015751.LastDate",1]}]'
+            )
+        }
+    )
+
+    # EXECUTE
+    ticker_to_metric_list.parse_batch(ticker=ticker_registration)
+    ticker_to_metric_list.parse_batch(ticker=ticker_release)
+
+    # CHECK
+    assert ticker_to_metric_list.last_release_list == [
+        ("AAPL.BATS,E", MetricType.LastPrice),
+        ("360015751", MetricType.LastDate),
+    ]
+    assert ticker_to_metric_list.product_id_set == {"360015751", "AAPL.BATS,E"}
+    assert ticker_to_metric_list.get_memory_usage() == {
+        "code_count": 2,
+        "interned_count": 2,
+        "product_count": 2,
+        "reference_count": 5,
+    }
+    ticker_to_metric_list.reset()
+    assert not ticker_to_metric_list.is_subscribed(product_id="360015751")
+    assert ticker_to_metric_list.get_memory_usage()["product_count"] == 0
+
+
+@pytest.mark.quotecast
+def test_parse_code_batch(ticker_registration, ticker_update):
+    # SETUP
+    product_interner = Interner(name_list=["AAPL.BATS,E"])
+    ticker_to_metric_list = TickerToMetricList(product_interner=product_interner)
+
+    # EXECUTE
+    metric_code_batch = ticker_to_metric_list.parse_code_batch(
+        ticker=ticker_registration
+    )
+    update_code_batch = ticker_to_metric_list.parse_code_batch(ticker=ticker_update)
+    metric_batch = metric_code_batch.to_metric_batch(
+        product_id_list=product_interner.name_list
+    )
+
+    # CHECK
+    assert update_code_batch.product_code_list == [1, 1]
+    assert update_code_batch.metric_code_list == [
+        METRIC_CODE_MAP[MetricType.LastPrice],
+        METRIC_CODE_MAP[MetricType.LastVolume],
+    ]
+    assert update_code_batch.value_list == [116.0, 250]
+    assert metric_batch.product_id_list == ["360015751"] * 4 + ["AAPL.BATS,E"] * 3
+    assert metric_batch.metric_type_list[2] is MetricType.LastPrice
+    assert ticker_to_metric_list.reference_code_map[7] == (
+        0,
+        METRIC_CODE_MAP[MetricType.LastPrice],
+    )
+    assert all(
+        product_id is product_interner.name_list[1]
+        for product_id, _metric_type in list(
+            ticker_to_metric_list.reference_map.values()
+        )[:4]
+    )